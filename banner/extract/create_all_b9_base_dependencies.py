@@ -1,7 +1,7 @@
 import logging
 
 from db.database_properties import DatabaseEnvironment
-from db.oracle_database_tools import OracleDBConnectionPool
+from db.recorded_pool import get_connection_pool
 from files.b9_completed_procedures_file import create_source_code_manager, \
     create_package_specification_source_code_manager
 from files.b9_dependency_file import find_all_dependencies_manager
@@ -14,7 +14,7 @@ logging.basicConfig(
 
 if __name__ == "__main__":
     banner9_environment = DatabaseEnvironment.BANNER9
-    db_pool_banner9 = OracleDBConnectionPool(database_name=banner9_environment)
+    db_pool_banner9 = get_connection_pool(database_name=banner9_environment)
 
     find_missing_procedures_manager(db_pool=db_pool_banner9)
     create_source_code_manager(db_pool=db_pool_banner9, database_environment=banner9_environment)
@@ -1,11 +1,11 @@
 from db.database_properties import DatabaseEnvironment
-from db.oracle_database_tools import OracleDBConnectionPool
+from db.recorded_pool import get_connection_pool
 from files.b9_dependency_file import complete_dependency_file
 from files.object_data_file import create_object_base_manager, add_base_tables_manager, add_custom_sequences_manager, \
     add_custom_tables_manager, add_custom_triggers_manager
 
 if __name__ == "__main__":
-    db_pool_banner9 = OracleDBConnectionPool(database_name=DatabaseEnvironment.BANNER9)
+    db_pool_banner9 = get_connection_pool(database_name=DatabaseEnvironment.BANNER9)
 
     create_object_base_manager()
     complete_dependency_file()
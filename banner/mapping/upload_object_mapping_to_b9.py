@@ -1,6 +1,10 @@
 import csv
 from typing import List, Dict
 
+from db.database_properties import DatabaseEnvironment
+from db.datasource.mapping_datasource import insert_mapping_data
+from db.recorded_pool import get_connection_pool
+
 
 def upload_mapping_file(mapping_file_name: str) -> List[Dict[str, str]]:
     """
@@ -47,9 +51,12 @@ def upload_mapping_file(mapping_file_name: str) -> List[Dict[str, str]]:
 
 if __name__ == "__main__":
     mapping_input_file = "../banner9/mapping.csv"
-    db_config = '../../db_config.json'
-    # db_connection = get_db_connection(database_name=DatabaseEnvironment.BANNER9)
-    # mapping = upload_mapping_file(mapping_file_name=mapping_input_file)
-    # print(mapping)
-    # insert_mapping_data(rows_to_insert=mapping)
-    # db_connection.close()
+    banner9_environment = DatabaseEnvironment.BANNER9
+    db_pool_banner9 = get_connection_pool(database_name=banner9_environment)
+
+    mapping = upload_mapping_file(mapping_file_name=mapping_input_file)
+    upload_result = insert_mapping_data(db_pool=db_pool_banner9, rows_to_insert=mapping)
+    for rejected_row in upload_result["rejected"]:
+        print(f"Rejected {rejected_row['row']['B7_NOMBRE']}: {rejected_row['message']}")
+
+    db_pool_banner9.close_pool()
@@ -1,7 +1,7 @@
 import logging
 
 from db.database_properties import DatabaseEnvironment
-from db.oracle_database_tools import OracleDBConnectionPool
+from db.recorded_pool import get_connection_pool
 from files.b7_completed_procedures_file import create_source_code_manager
 from files.b7_dependency_file import find_all_dependencies_manager
 from files.b7_incomplete_procedures_file import find_missing_procedures_manager
@@ -12,7 +12,7 @@ logging.basicConfig(
 )
 
 if __name__ == "__main__":
-    db_pool_banner7 = OracleDBConnectionPool(DatabaseEnvironment.BANNER7)
+    db_pool_banner7 = get_connection_pool(database_name=DatabaseEnvironment.BANNER7)
 
     find_missing_procedures_manager(db_pool=db_pool_banner7)
     create_source_code_manager(db_pool=db_pool_banner7)
@@ -1,14 +1,14 @@
 from db.database_properties import DatabaseEnvironment
-from db.oracle_database_tools import OracleDBConnectionPool
+from db.recorded_pool import get_connection_pool
 from files.b7_object_data_file import create_object_base_manager, add_base_tables_manager, add_custom_sequences_manager, \
     add_custom_tables_manager, add_custom_triggers_manager
 
 if __name__ == "__main__":
     banner7_environment = DatabaseEnvironment.BANNER7
-    db_pool_banner7 = OracleDBConnectionPool(database_name=banner7_environment)
+    db_pool_banner7 = get_connection_pool(database_name=banner7_environment)
 
     banner9_environment = DatabaseEnvironment.BANNER9
-    db_pool_banner9 = OracleDBConnectionPool(database_name=banner9_environment)
+    db_pool_banner9 = get_connection_pool(database_name=banner9_environment)
 
     create_object_base_manager()
     add_base_tables_manager(db_pool=db_pool_banner7, database_environment=banner7_environment)
@@ -22,4 +22,5 @@ if __name__ == "__main__":
 
     add_custom_triggers_manager(db_pool=db_pool_banner7)
 
-    db_pool_banner7.close_all_pools()
+    db_pool_banner7.close_pool()
+    db_pool_banner9.close_pool()
@@ -0,0 +1,141 @@
+import json
+import logging
+import os
+import time
+
+from db.datasource.catalog_datasource import query_catalog_source_objects, query_catalog_procedures
+from db.oracle_database_tools import OracleDBConnectionPool
+
+CATALOG_SNAPSHOT_FILE_PATH = "../workfiles/{database_name}_catalog_snapshot.json"
+CATALOG_SNAPSHOT_MAX_AGE_SECONDS = 12 * 60 * 60
+
+_snapshots = {}  # One snapshot per database environment
+
+
+class CatalogSnapshot:
+    """
+    In-memory copy of the Oracle catalog data used to resolve dependencies: source object owners,
+    packages and package subprograms. Loaded in bulk from ALL_OBJECTS and ALL_PROCEDURES.
+    """
+
+    def __init__(self, source_objects: list | None = None, procedures: list | None = None,
+                 created: float | None = None):
+        self.created = created or time.time()
+        self._build_indexes(source_objects=source_objects or [], procedures=procedures or [])
+
+    def _build_indexes(self, source_objects: list, procedures: list):
+        self._source_object_rows = [tuple(row) for row in source_objects]
+        self._procedure_rows = [tuple(row) for row in procedures]
+
+        self.owners = set()
+        self.packages = set()
+        self._source_object_owners = {}  # NAME -> {OWNER}
+        for owner, object_name, object_type in self._source_object_rows:
+            self.owners.add(owner)
+            self._source_object_owners.setdefault(object_name, set()).add(owner)
+            if object_type == "PACKAGE":
+                self.packages.add(object_name)
+
+        self._procedure_object_owners = {}  # OBJECT_NAME -> first OWNER
+        self._subprogram_owners = {}  # (OBJECT_NAME, PROCEDURE_NAME) -> first OWNER
+        for owner, object_name, procedure_name in self._procedure_rows:
+            self._procedure_object_owners.setdefault(object_name, owner)
+            if procedure_name:
+                self._subprogram_owners.setdefault((object_name, procedure_name), owner)
+
+    @classmethod
+    def from_database(cls, db_pool: OracleDBConnectionPool) -> "CatalogSnapshot":
+        snapshot = cls()
+        snapshot.refresh(db_pool=db_pool)
+        return snapshot
+
+    def refresh(self, db_pool: OracleDBConnectionPool):
+        """Reload the whole snapshot from the database."""
+        logging.info(f"Starting: load catalog snapshot of {db_pool.database_name.value}")
+        source_objects = query_catalog_source_objects(db_pool=db_pool)
+        procedures = query_catalog_procedures(db_pool=db_pool)
+        self.created = time.time()
+        self._build_indexes(source_objects=source_objects, procedures=procedures)
+        logging.info(f"Ending: load catalog snapshot, {len(self._source_object_rows)} objects "
+                     f"and {len(self._procedure_rows)} procedures")
+
+    def save(self, file_path: str):
+        with open(file_path, mode='w', encoding='utf-8') as file:
+            json.dump({"created": self.created,
+                       "source_objects": self._source_object_rows,
+                       "procedures": self._procedure_rows}, file)
+
+    @classmethod
+    def from_file(cls, file_path: str) -> "CatalogSnapshot":
+        with open(file_path, mode='r', encoding='utf-8') as file:
+            data = json.load(file)
+        return cls(source_objects=data["source_objects"], procedures=data["procedures"], created=data["created"])
+
+    def get_owners(self) -> list[str]:
+        return sorted(self.owners)
+
+    def is_owner(self, name: str) -> bool:
+        return name in self.owners
+
+    def find_existing_packages(self, package_names) -> set[str]:
+        """The upper-cased names that are packages in ALL_OBJECTS."""
+        return {name.upper() for name in package_names} & self.packages
+
+    def get_public_package_object_owner(self, object_dict: dict) -> tuple | None:
+        """Same answer as functions_datasource.get_public_package_object_owner."""
+        object_name = object_dict["NAME"]
+        package_name = object_dict["PACKAGE"]
+        owner = self._subprogram_owners.get((package_name, object_name))
+        return (owner, package_name, object_name) if owner else None
+
+    def get_private_package_object_owner(self, object_dict: dict) -> tuple | None:
+        """Same answer as functions_datasource.get_private_package_object_owner."""
+        object_name = object_dict["NAME"]
+        package_name = object_dict["PACKAGE"]
+        owner = self._procedure_object_owners.get(package_name)
+        return (owner, package_name, object_name) if owner else None
+
+    def get_independent_object_owners(self, object_dict: dict) -> list:
+        """Same answer as functions_datasource.get_independent_object_owners."""
+        object_name = object_dict["NAME"]
+        return [(owner, object_name) for owner in sorted(self._source_object_owners.get(object_name, ()))]
+
+
+def get_catalog_snapshot_file_path(db_pool: OracleDBConnectionPool) -> str:
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    return os.path.join(script_dir, CATALOG_SNAPSHOT_FILE_PATH.format(database_name=db_pool.database_name.value))
+
+
+def get_catalog_snapshot(db_pool: OracleDBConnectionPool,
+                         max_age_seconds: int = CATALOG_SNAPSHOT_MAX_AGE_SECONDS) -> CatalogSnapshot:
+    """
+    Returns the catalog snapshot of the pool's database, loading it only once per process.
+
+    A snapshot saved on disk is reused while it is younger than max_age_seconds, otherwise the snapshot
+    is loaded from the database and saved.
+    """
+    snapshot = _snapshots.get(db_pool.database_name)
+    if snapshot is not None:
+        return snapshot
+
+    file_path = get_catalog_snapshot_file_path(db_pool)
+    if os.path.exists(file_path) and time.time() - os.path.getmtime(file_path) < max_age_seconds:
+        logging.info(f"Reading catalog snapshot from {file_path}")
+        snapshot = CatalogSnapshot.from_file(file_path)
+    else:
+        snapshot = CatalogSnapshot.from_database(db_pool=db_pool)
+        if os.path.isdir(os.path.dirname(file_path)):
+            snapshot.save(file_path)
+
+    _snapshots[db_pool.database_name] = snapshot
+    return snapshot
+
+
+def refresh_catalog_snapshot(db_pool: OracleDBConnectionPool) -> CatalogSnapshot:
+    """Reload the snapshot of the pool's database and overwrite the saved copy."""
+    snapshot = CatalogSnapshot.from_database(db_pool=db_pool)
+    file_path = get_catalog_snapshot_file_path(db_pool)
+    if os.path.isdir(os.path.dirname(file_path)):
+        snapshot.save(file_path)
+    _snapshots[db_pool.database_name] = snapshot
+    return snapshot
@@ -0,0 +1,75 @@
+from db.oracle_database_tools import OracleDBConnectionPool
+
+CATALOG_FETCH_ARRAY_SIZE = 5000
+DDL_TIME_QUERY_CHUNK_SIZE = 300
+
+# Object types stored in ALL_SOURCE
+SOURCE_OBJECT_TYPES = ("PACKAGE", "PACKAGE BODY", "PROCEDURE", "FUNCTION", "TYPE", "TYPE BODY", "TRIGGER",
+                       "JAVA SOURCE", "LIBRARY")
+
+
+def query_catalog_source_objects(db_pool: OracleDBConnectionPool) -> list:
+    """Retrieve owner, name and type of every object with source code"""
+    with db_pool.get_connection() as connection:
+        cursor = connection.cursor()
+        cursor.arraysize = CATALOG_FETCH_ARRAY_SIZE
+        query = """
+            SELECT owner, object_name, object_type
+            FROM all_objects
+            WHERE object_type IN ({})
+        """.format(", ".join([f":object_type_{i}" for i in range(len(SOURCE_OBJECT_TYPES))]))
+        params = {f"object_type_{i}": object_type for i, object_type in enumerate(SOURCE_OBJECT_TYPES)}
+        cursor.execute(query, params)
+        rows = cursor.fetchall()
+        cursor.close()
+        return rows
+
+
+def query_catalog_procedures(db_pool: OracleDBConnectionPool) -> list:
+    """Retrieve owner, object name and procedure name of every row of ALL_PROCEDURES"""
+    with db_pool.get_connection() as connection:
+        cursor = connection.cursor()
+        cursor.arraysize = CATALOG_FETCH_ARRAY_SIZE
+        query = """
+            SELECT owner, object_name, procedure_name
+            FROM all_procedures
+        """
+        cursor.execute(query)
+        rows = cursor.fetchall()
+        cursor.close()
+        return rows
+
+
+def query_last_ddl_times(db_pool: OracleDBConnectionPool, objects: list[tuple[str, str, str]],
+                         chunk_size: int = DDL_TIME_QUERY_CHUNK_SIZE) -> dict:
+    """
+    Retrieve LAST_DDL_TIME of the given objects from ALL_OBJECTS.
+
+    Args:
+        db_pool (OracleDBConnectionPool): Database connection pool.
+        objects (list[tuple[str, str, str]]): (OWNER, OBJECT_TYPE, OBJECT_NAME) of the objects.
+        chunk_size (int): Objects per query.
+
+    Returns:
+        dict: (OWNER, OBJECT_TYPE, OBJECT_NAME) -> LAST_DDL_TIME for the objects that exist.
+    """
+    unique_objects = list(dict.fromkeys(objects))
+    last_ddl_times = {}
+    with db_pool.get_connection() as connection:
+        cursor = connection.cursor()
+        cursor.arraysize = CATALOG_FETCH_ARRAY_SIZE
+        for start in range(0, len(unique_objects), chunk_size):
+            chunk = unique_objects[start:start + chunk_size]
+            query = """
+                SELECT owner, object_type, object_name, last_ddl_time
+                FROM all_objects
+                WHERE (owner, object_type, object_name) IN ({})
+            """.format(", ".join([f"(:owner_{i}, :type_{i}, :name_{i})" for i in range(len(chunk))]))
+            params = {}
+            for i, (owner, object_type, name) in enumerate(chunk):
+                params.update({f"owner_{i}": owner, f"type_{i}": object_type, f"name_{i}": name})
+            cursor.execute(query, params)
+            for owner, object_type, name, last_ddl_time in cursor:
+                last_ddl_times[(owner, object_type, name)] = last_ddl_time
+        cursor.close()
+    return last_ddl_times
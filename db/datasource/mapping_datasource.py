@@ -1,5 +1,4 @@
 import logging
-from datetime import datetime
 from typing import List, Dict
 
 import cx_Oracle
@@ -7,40 +6,6 @@ import cx_Oracle
 from db.oracle_database_tools import OracleDBConnectionPool
 
 
-def query_mapping_table_by_object_type(db_pool: OracleDBConnectionPool, mapping_object_type: str) -> list[dict]:
-    with db_pool.get_connection() as connection:
-        cursor = connection.cursor()
-        # Construct the query with a bind variable for each name
-        query = f"""
-        SELECT 
-            GZTBTMPEO_B7_TIPO,
-            GZTBTMPEO_B7_ESQUEMA,
-            GZTBTMPEO_B7_PAQUETE,
-            GZTBTMPEO_B7_NOMBRE,
-            GZTBTMPEO_B9_TIPO,
-            GZTBTMPEO_B9_ESQUEMA,
-            GZTBTMPEO_B9_PAQUETE,
-            GZTBTMPEO_B9_NOMBRE,
-            GZTBTMPEO_DESCRIPCION,
-            GZTBTMPEO_OBSERVACION,
-            GZTBTMPEO_ACTIVITY_DATE,
-            GZTBTMPEO_USER,
-            GZTBTMPEO_DATA_ORIGIN
-        FROM GZTBTMPEO
-        WHERE GZTBTMPEO_B7_TIPO = :object_type
-        """
-
-        cursor.execute(query, object_type=mapping_object_type)
-        rows = cursor.fetchall()
-        results = []
-        for row in rows:
-            if row:
-                # Map the result to a dictionary
-                columns = [col[0] for col in cursor.description]
-                results.append(dict(zip(columns, row)))
-        return results
-
-
 def query_mapping_table(db_pool: OracleDBConnectionPool) -> list[dict]:
     """
     Retrieve all fields from the GTTBTMPEO table for a list of GZTBTMPEO_B7_NOMBRE values.
@@ -72,12 +37,9 @@ def query_mapping_table(db_pool: OracleDBConnectionPool) -> list[dict]:
 
         cursor.execute(query)
         rows = cursor.fetchall()
-        results = []
-        for row in rows:
-            if row:
-                # Map the result to a dictionary
-                columns = [col[0] for col in cursor.description]
-                results.append(dict(zip(columns, row)))
+        # Map the results to dictionaries
+        columns = [col[0] for col in cursor.description]
+        results = [dict(zip(columns, row)) for row in rows if row]
         return results
 
 
@@ -113,12 +75,9 @@ def query_mapping_by_b7_names(db_pool: OracleDBConnectionPool, b7_names: []) ->
         bind_vars = {f"name{i}": name for i, name in enumerate(b7_names)}
         cursor.execute(query, bind_vars)
         rows = cursor.fetchall()
-        results = []
-        for row in rows:
-            if row:
-                # Map the result to a dictionary
-                columns = [col[0] for col in cursor.description]
-                results.append(dict(zip(columns, row)))
+        # Map the results to dictionaries
+        columns = [col[0] for col in cursor.description]
+        results = [dict(zip(columns, row)) for row in rows if row]
 
         return results
 
@@ -158,30 +117,9 @@ def query_mapping_by_b7_name(db_pool: OracleDBConnectionPool, b7_name: str) -> d
         return result
 
 
-def insert_mapping_data(db_pool: OracleDBConnectionPool, rows_to_insert: List[Dict[str, str]]):
-    """
-    Inserts data into the GZTBTMPEO table with additional default values.
-
-    Args:
-        :param rows_to_insert:
-        :param db_pool:
-    """
-    with db_pool.get_connection() as connection:
-        cursor = connection.cursor()
-
-    if not rows_to_insert:
-        logging.info("No valid rows to insert.")
-        return
-
-    # Define default values
-    default_description = "N/A"
-    default_observation = None
-    default_user = "WIKI-BOT"
-    default_data_origin = "MANUAL"
-    current_date = datetime.now().strftime("%d/%m/%y")
+MAPPING_INSERT_BATCH_SIZE = 500
 
-    # Prepare the insert query
-    insert_query = """
+MAPPING_INSERT_QUERY = """
     INSERT INTO GZTBTMPEO (
         GZTBTMPEO_B7_TIPO,
         GZTBTMPEO_B7_ESQUEMA,
@@ -197,62 +135,152 @@ def insert_mapping_data(db_pool: OracleDBConnectionPool, rows_to_insert: List[Di
         GZTBTMPEO_USER,
         GZTBTMPEO_DATA_ORIGIN
     ) VALUES (
-        '{B7_TIPO}',
-        '{B7_ESQUEMA}',
-        '{B7_PAQUETE}',
-        '{B7_NOMBRE}',
-        '{B9_TIPO}',
-        '{B9_ESQUEMA}',
-        '{B9_PAQUETE}',
-        '{B9_NOMBRE}',
-        '{DESCRIPCION}',
-        '{OBSERVACION}',
-        TO_DATE('{ACTIVITY_DATE}', 'DD/MM/YY'),
-        '{USER}',
-        '{DATA_ORIGIN}'
+        :B7_TIPO,
+        :B7_ESQUEMA,
+        :B7_PAQUETE,
+        :B7_NOMBRE,
+        :B9_TIPO,
+        :B9_ESQUEMA,
+        :B9_PAQUETE,
+        :B9_NOMBRE,
+        :DESCRIPCION,
+        :OBSERVACION,
+        TRUNC(SYSDATE),
+        :USER_NAME,
+        :DATA_ORIGIN
     )"""
 
-    # Add default values to each row and construct the final query with values
-    for row in rows_to_insert:
-        row.update({
-            "DESCRIPCION": default_description,
-            "OBSERVACION": default_observation,
-            "ACTIVITY_DATE": current_date,
-            "USER": default_user,
-            "DATA_ORIGIN": default_data_origin
-        })
-
-        # Replace 'none' with 'N/A' for all keys in the row
-        for key, value in row.items():
-            if value == 'none':
-                row[key] = 'N/A'
-
-        # Create a final query string by replacing placeholders with actual values
-        formatted_query = insert_query.format(
-            B7_TIPO=row['B7_TIPO'],
-            B7_ESQUEMA=row['B7_ESQUEMA'],
-            B7_PAQUETE=row['B7_PAQUETE'],
-            B7_NOMBRE=row['B7_NOMBRE'],
-            B9_TIPO=row['B9_TIPO'],
-            B9_ESQUEMA=row['B9_ESQUEMA'],
-            B9_PAQUETE=row['B9_PAQUETE'],
-            B9_NOMBRE=row['B9_NOMBRE'],
-            DESCRIPCION=row['DESCRIPCION'],
-            OBSERVACION=row['OBSERVACION'] if row['OBSERVACION'] is not None else 'NULL',
-            ACTIVITY_DATE=row['ACTIVITY_DATE'],
-            USER=row['USER'],
-            DATA_ORIGIN=row['DATA_ORIGIN']
-        )
-
-        print(f"Executing query: {formatted_query}")
-
-        # Insert the row into the database
-        try:
-            cursor.execute(formatted_query)
+# Same row as MAPPING_INSERT_QUERY, updating the Banner 9 side of an existing Banner 7 object
+MAPPING_MERGE_QUERY = """
+    MERGE INTO GZTBTMPEO target
+    USING (
+        SELECT
+            :B7_TIPO AS B7_TIPO,
+            :B7_ESQUEMA AS B7_ESQUEMA,
+            :B7_PAQUETE AS B7_PAQUETE,
+            :B7_NOMBRE AS B7_NOMBRE,
+            :B9_TIPO AS B9_TIPO,
+            :B9_ESQUEMA AS B9_ESQUEMA,
+            :B9_PAQUETE AS B9_PAQUETE,
+            :B9_NOMBRE AS B9_NOMBRE,
+            :DESCRIPCION AS DESCRIPCION,
+            :OBSERVACION AS OBSERVACION,
+            :USER_NAME AS USER_NAME,
+            :DATA_ORIGIN AS DATA_ORIGIN
+        FROM DUAL
+    ) source
+    ON (
+        -- An empty value is NULL, e.g. the package of a standalone object, and must match NULL
+        (target.GZTBTMPEO_B7_TIPO = source.B7_TIPO
+            OR (target.GZTBTMPEO_B7_TIPO IS NULL AND source.B7_TIPO IS NULL))
+        AND (target.GZTBTMPEO_B7_ESQUEMA = source.B7_ESQUEMA
+            OR (target.GZTBTMPEO_B7_ESQUEMA IS NULL AND source.B7_ESQUEMA IS NULL))
+        AND (target.GZTBTMPEO_B7_PAQUETE = source.B7_PAQUETE
+            OR (target.GZTBTMPEO_B7_PAQUETE IS NULL AND source.B7_PAQUETE IS NULL))
+        AND (target.GZTBTMPEO_B7_NOMBRE = source.B7_NOMBRE
+            OR (target.GZTBTMPEO_B7_NOMBRE IS NULL AND source.B7_NOMBRE IS NULL))
+    )
+    WHEN MATCHED THEN UPDATE SET
+        target.GZTBTMPEO_B9_TIPO = source.B9_TIPO,
+        target.GZTBTMPEO_B9_ESQUEMA = source.B9_ESQUEMA,
+        target.GZTBTMPEO_B9_PAQUETE = source.B9_PAQUETE,
+        target.GZTBTMPEO_B9_NOMBRE = source.B9_NOMBRE,
+        target.GZTBTMPEO_ACTIVITY_DATE = TRUNC(SYSDATE),
+        target.GZTBTMPEO_USER = source.USER_NAME,
+        target.GZTBTMPEO_DATA_ORIGIN = source.DATA_ORIGIN
+    WHEN NOT MATCHED THEN INSERT (
+        GZTBTMPEO_B7_TIPO,
+        GZTBTMPEO_B7_ESQUEMA,
+        GZTBTMPEO_B7_PAQUETE,
+        GZTBTMPEO_B7_NOMBRE,
+        GZTBTMPEO_B9_TIPO,
+        GZTBTMPEO_B9_ESQUEMA,
+        GZTBTMPEO_B9_PAQUETE,
+        GZTBTMPEO_B9_NOMBRE,
+        GZTBTMPEO_DESCRIPCION,
+        GZTBTMPEO_OBSERVACION,
+        GZTBTMPEO_ACTIVITY_DATE,
+        GZTBTMPEO_USER,
+        GZTBTMPEO_DATA_ORIGIN
+    ) VALUES (
+        source.B7_TIPO,
+        source.B7_ESQUEMA,
+        source.B7_PAQUETE,
+        source.B7_NOMBRE,
+        source.B9_TIPO,
+        source.B9_ESQUEMA,
+        source.B9_PAQUETE,
+        source.B9_NOMBRE,
+        source.DESCRIPCION,
+        source.OBSERVACION,
+        TRUNC(SYSDATE),
+        source.USER_NAME,
+        source.DATA_ORIGIN
+    )"""
+
+
+def _build_mapping_binds(row: Dict[str, str]) -> dict:
+    """Bind values of one mapping row, with the default description, user and origin."""
+    binds = {key: row[key] for key in ("B7_TIPO", "B7_ESQUEMA", "B7_PAQUETE", "B7_NOMBRE",
+                                       "B9_TIPO", "B9_ESQUEMA", "B9_PAQUETE", "B9_NOMBRE")}
+    binds.update({
+        "DESCRIPCION": "N/A",
+        "OBSERVACION": None,
+        "USER_NAME": "WIKI-BOT",
+        "DATA_ORIGIN": "MANUAL"
+    })
+
+    # Replace 'none' with 'N/A' for all keys in the row
+    return {key: 'N/A' if value == 'none' else value for key, value in binds.items()}
+
+
+def insert_mapping_data(db_pool: OracleDBConnectionPool, rows_to_insert: List[Dict[str, str]],
+                        merge: bool = False, batch_size: int = MAPPING_INSERT_BATCH_SIZE) -> dict:
+    """
+    Inserts data into the GZTBTMPEO table with additional default values, batch_size rows per
+    round-trip and one commit per batch. Rows rejected by the database are reported and skipped,
+    the rest of their batch is still saved.
+
+    Args:
+        db_pool (OracleDBConnectionPool): Database connection pool.
+        rows_to_insert (List[Dict[str, str]]): Rows with the B7_* and B9_* keys.
+        merge (bool): Update the Banner 9 columns of the rows whose Banner 7 object is already mapped
+            instead of inserting them again.
+        batch_size (int): Rows per executemany call.
+
+    Returns:
+        dict: "saved" count and "rejected" rows, each one with its "row", "error_code" and "message".
+    """
+    if not rows_to_insert:
+        logging.info("No valid rows to insert.")
+        return {"saved": 0, "rejected": []}
+
+    query = MAPPING_MERGE_QUERY if merge else MAPPING_INSERT_QUERY
+    saved = 0
+    rejected = []
+    with db_pool.get_connection() as connection:
+        cursor = connection.cursor()
+        for start in range(0, len(rows_to_insert), batch_size):
+            batch = rows_to_insert[start:start + batch_size]
+            try:
+                cursor.executemany(query, [_build_mapping_binds(row) for row in batch], batcherrors=True)
+            except cx_Oracle.DatabaseError as e:
+                # the whole batch failed, e.g. a bad statement or a lost session
+                logging.error(f"Error saving rows {start} to {start + len(batch) - 1}: {e}")
+                connection.rollback()
+                error, = e.args
+                rejected.extend({"row": row, "error_code": getattr(error, "code", None), "message": str(e)}
+                                for row in batch)
+                continue
+
+            batch_errors = cursor.getbatcherrors()
+            for error in batch_errors:
+                row = batch[error.offset]
+                logging.error(f"Rejected mapping row {row.get('B7_NOMBRE')}: {error.message}")
+                rejected.append({"row": row, "error_code": error.code, "message": error.message})
             connection.commit()
-            logging.info("Successfully inserted row.")
-        except cx_Oracle.DatabaseError as e:
-            logging.error(f"Error inserting row: {e}")
-            connection.rollback()
+            saved += len(batch) - len(batch_errors)
+        cursor.close()
 
-    logging.info(f"Successfully inserted {len(rows_to_insert)} rows.")
+    logging.info(f"Successfully {'merged' if merge else 'inserted'} {saved} rows, {len(rejected)} rejected.")
+    return {"saved": saved, "rejected": rejected}
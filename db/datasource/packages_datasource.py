@@ -1,8 +1,6 @@
-import logging
-from typing import List
-
 from db.database_properties import DatabaseEnvironment
 from db.oracle_database_tools import OracleDBConnectionPool
+from db.recorded_pool import get_connection_pool
 
 
 def get_package_records(package_owner: str, package_names: list[str],
@@ -168,34 +166,7 @@ def get_package_record(package_owner: str, package_name: str,
         return rows
 
 
-def find_if_packages_exist(db_pool: OracleDBConnectionPool, package_candidates: List[str]) -> list:
-    """Check which of the candidate names are existing packages in the database"""
-    if not package_candidates:
-        return []
-
-    try:
-        with db_pool.get_connection() as connection:
-            with connection.cursor() as cursor:
-                # Always include a comma, even for single items
-                if len(package_candidates) == 1:
-                    quoted_names = f"'{package_candidates[0].upper()}'"
-                else:
-                    quoted_names = ", ".join(f"'{name.upper()}'" for name in package_candidates)
-                query = f"""
-                    SELECT object_name
-                    FROM all_objects
-                    WHERE object_name IN ({quoted_names})
-                    AND object_type = 'PACKAGE'
-                    ORDER BY object_name
-                """  # Removed the semicolon at the end as it's not needed in cursor.execute
-                cursor.execute(query)
-                return cursor.fetchall()
-    except Exception as e:
-        logging.error(f"Error checking package existence: {e}")
-        return []
-
-
 if __name__ == "__main__":
-    db_pool_banner9 = OracleDBConnectionPool(database_name=DatabaseEnvironment.BANNER9)
+    db_pool_banner9 = get_connection_pool(database_name=DatabaseEnvironment.BANNER9)
     package_specs = get_package_specification(package_owner="UVM", db_pool=db_pool_banner9, package_name="TZPKFPLIA")
     package_body = get_package_body(package_owner="UVM", db_pool=db_pool_banner9, package_name="TZPKFPLIA")
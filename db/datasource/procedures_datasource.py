@@ -1,4 +1,10 @@
-from db.oracle_database_tools import OracleDBConnectionPool
+import logging
+
+from db.oracle_database_tools import OracleDBConnectionPool, run_concurrently, fetch_all_in_chunks
+
+SOURCE_QUERY_CHUNK_SIZE = 200
+SOURCE_FETCH_ARRAY_SIZE = 1000
+SOURCE_PREFETCH_ROWS = 1000
 
 
 def query_all_procedures_by_owner_and_package(db_pool: OracleDBConnectionPool, owner: str, package: str = None):
@@ -23,6 +29,65 @@ def query_all_procedures_by_owner_and_package(db_pool: OracleDBConnectionPool, o
         return procedures
 
 
+def query_all_procedures_by_owner_and_packages(db_pool: OracleDBConnectionPool, owner: str,
+                                               packages: list[str]) -> dict[str, list[str]]:
+    """
+    Query the ALL_PROCEDURES table once per chunk of packages to get the procedures of many packages of one owner.
+
+    Returns:
+        dict: package -> procedure names, in subprogram order. Packages without procedures are left out.
+    """
+    with db_pool.get_connection() as connection:
+        cursor = connection.cursor()
+        rows = fetch_all_in_chunks(cursor=cursor, query="""
+            SELECT OBJECT_NAME, PROCEDURE_NAME
+            FROM ALL_PROCEDURES
+            WHERE OWNER = :owner AND OBJECT_NAME IN ({in_list}) AND PROCEDURE_NAME is not null
+            ORDER BY OBJECT_NAME, SUBPROGRAM_ID
+        """, values=packages, params={'owner': owner})
+        cursor.close()
+
+    procedures_by_package = {}
+    for package, procedure in rows:
+        procedures_by_package.setdefault(package, []).append(procedure)
+    return procedures_by_package
+
+
+def query_missing_procedures_in_bulk(db_pool: OracleDBConnectionPool, rows: list) -> dict:
+    """
+    Finds the procedures of every row of an incomplete procedures file (Owner, Package, Procedure) without
+    one: the members of its package, or the standalone procedures of its owner when it has no package.
+    Packages are queried in chunks, grouped by owner.
+
+    Returns:
+        dict: (owner, package) -> procedure names
+    """
+    packages_by_owner = {}
+    owners_without_package = set()
+    for row in rows:
+        if row["Procedure"] and row["Procedure"].strip():
+            continue
+        owner = row["Owner"].strip()
+        package = row['Package'].strip() if row['Package'] else None
+        if package:
+            packages_by_owner.setdefault(owner, set()).add(package)
+        else:
+            owners_without_package.add(owner)
+
+    missing_procedures = {}
+    for owner, packages in packages_by_owner.items():
+        logging.info(f"Looking for the procedures of {len(packages)} packages of {owner}")
+        procedures_by_package = query_all_procedures_by_owner_and_packages(db_pool=db_pool, owner=owner,
+                                                                           packages=sorted(packages))
+        for package, procedures in procedures_by_package.items():
+            missing_procedures[(owner, package)] = procedures
+
+    for owner in owners_without_package:
+        missing_procedures[(owner, None)] = query_all_procedures_by_owner_and_package(db_pool=db_pool, owner=owner)
+
+    return missing_procedures
+
+
 def query_all_procedures_by_package(connection, package):
     """
     Query the ALL_PROCEDURES table to get procedures for the given owner and package.
@@ -114,3 +179,87 @@ def query_sources(db_pool: OracleDBConnectionPool, owner: str, package: str = No
         source_code = [row[0] for row in rows]
 
     return source_code
+
+
+def query_sources_bulk(db_pool: OracleDBConnectionPool, objects: list[tuple[str, str, str]],
+                       chunk_size: int = SOURCE_QUERY_CHUNK_SIZE,
+                       arraysize: int = SOURCE_FETCH_ARRAY_SIZE,
+                       prefetchrows: int = SOURCE_PREFETCH_ROWS,
+                       skip_blank_lines: bool = True):
+    """
+    Query the ALL_SOURCE table for many objects per round-trip.
+
+    Args:
+        db_pool (OracleDBConnectionPool): Database connection pool.
+        objects (list[tuple[str, str, str]]): (OWNER, TYPE, NAME) of the objects, TYPE as in ALL_SOURCE
+            ('PACKAGE BODY', 'PROCEDURE', 'FUNCTION', ...).
+        chunk_size (int): Objects per query.
+        arraysize (int): Rows fetched per round-trip.
+        prefetchrows (int): Rows returned with the execute call.
+        skip_blank_lines (bool): Leave out the lines with one character or less, as query_sources does.
+
+    Yields:
+        tuple: ((OWNER, TYPE, NAME), lines) for every object with source code, lines filtered and ordered
+        the same way as query_sources. Objects without source code are not yielded.
+    """
+    unique_objects = list(dict.fromkeys(objects))
+    with db_pool.get_connection() as connection:
+        for start in range(0, len(unique_objects), chunk_size):
+            chunk = unique_objects[start:start + chunk_size]
+            query = """
+                SELECT OWNER, TYPE, NAME, TEXT
+                FROM ALL_SOURCE
+                WHERE (OWNER, TYPE, NAME) IN ({})
+                  {}
+                ORDER BY OWNER, TYPE, NAME, LINE
+            """.format(", ".join([f"(:owner_{i}, :type_{i}, :name_{i})" for i in range(len(chunk))]),
+                       "AND length(trim(ALL_SOURCE.TEXT)) > 1" if skip_blank_lines else "")
+
+            params = {}
+            for i, (owner, object_type, name) in enumerate(chunk):
+                params.update({f"owner_{i}": owner, f"type_{i}": object_type, f"name_{i}": name})
+
+            # The cursor is closed even when the consumer stops early or raises between yields
+            with connection.cursor() as cursor:
+                cursor.arraysize = arraysize
+                cursor.prefetchrows = prefetchrows
+                cursor.execute(query, params)
+
+                current_key = None
+                current_lines = []
+                for owner, object_type, name, text in cursor:
+                    key = (owner, object_type, name)
+                    if key != current_key:
+                        if current_key is not None:
+                            yield current_key, current_lines
+                        current_key = key
+                        current_lines = []
+                    current_lines.append(text)
+                if current_key is not None:
+                    yield current_key, current_lines
+
+
+def query_sources_concurrently(db_pool: OracleDBConnectionPool, objects: list[tuple[str, str, str]],
+                               chunk_size: int = SOURCE_QUERY_CHUNK_SIZE,
+                               max_workers: int | None = None,
+                               skip_blank_lines: bool = True) -> dict:
+    """
+    Same as query_sources_bulk, with the chunks fetched in parallel on separate pooled sessions.
+
+    Returns:
+        dict: (OWNER, TYPE, NAME) -> lines for every object with source code.
+    """
+    unique_objects = list(dict.fromkeys(objects))
+    chunks = [unique_objects[start:start + chunk_size] for start in range(0, len(unique_objects), chunk_size)]
+    chunk_results = run_concurrently(
+        db_pool=db_pool,
+        task=lambda chunk: list(query_sources_bulk(db_pool=db_pool, objects=chunk, chunk_size=chunk_size,
+                                                   skip_blank_lines=skip_blank_lines)),
+        items=chunks,
+        max_workers=max_workers,
+        task_name="Source code fetch")
+
+    source_codes = {}
+    for chunk_result in chunk_results:
+        source_codes.update(chunk_result)
+    return source_codes
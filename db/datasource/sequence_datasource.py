@@ -1,4 +1,4 @@
-from db.oracle_database_tools import OracleDBConnectionPool
+from db.oracle_database_tools import OracleDBConnectionPool, fetch_all_in_chunks
 
 
 def fetch_attributes_for_sequences(db_pool: OracleDBConnectionPool, sequence_names):
@@ -8,7 +8,6 @@ def fetch_attributes_for_sequences(db_pool: OracleDBConnectionPool, sequence_nam
     with db_pool.get_connection() as connection:
         cursor = connection.cursor()
 
-        # Create a dynamic query to handle the list of sequence names
         query = """
             SELECT 
                 SEQUENCE_OWNER,
@@ -22,9 +21,9 @@ def fetch_attributes_for_sequences(db_pool: OracleDBConnectionPool, sequence_nam
                 LAST_NUMBER
             FROM 
                 ALL_SEQUENCES
-            WHERE SEQUENCE_NAME IN ({})
-        """.format(",".join([f"'{name}'" for name in sequence_names]))
-        cursor.execute(query)
+            WHERE SEQUENCE_NAME IN ({in_list})
+        """
+        rows = fetch_all_in_chunks(cursor=cursor, query=query, values=list(sequence_names))
 
         sequences = [{
             "sequence_owner": row[0],
@@ -36,7 +35,7 @@ def fetch_attributes_for_sequences(db_pool: OracleDBConnectionPool, sequence_nam
             "order_flag": row[6],
             "cache_size": row[7],
             "last_number": row[8]
-        } for row in cursor.fetchall()]
+        } for row in rows]
 
         cursor.close()
         return sequences
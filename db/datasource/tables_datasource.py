@@ -1,4 +1,8 @@
-from db.oracle_database_tools import OracleDBConnectionPool
+from db.datasource.triggers_datasource import fetch_triggers_for_tables
+from db.oracle_database_tools import OracleDBConnectionPool, fetch_all_in_chunks, open_long_column_cursor, \
+    run_concurrently
+
+TABLE_METADATA_CHUNK_SIZE = 200
 
 
 def fetch_table_columns_for_tables(db_pool: OracleDBConnectionPool, table_names: [str]):
@@ -12,13 +16,13 @@ def fetch_table_columns_for_tables(db_pool: OracleDBConnectionPool, table_names:
     with db_pool.get_connection() as connection:
         cursor = connection.cursor()
         table_names_upper = [name.upper() for name in table_names]
-        cursor.execute(f"""
+        results = fetch_all_in_chunks(cursor=cursor, query="""
             SELECT owner, table_name, column_name, data_type, data_length, data_precision, data_scale, nullable
             FROM ALL_TAB_COLUMNS
-            WHERE table_name IN ({','.join([':name' + str(i) for i in range(len(table_names))])})
+            WHERE table_name IN ({in_list})
             ORDER BY owner, table_name, column_id
-        """, {f'name{i}': name for i, name in enumerate(table_names_upper)})
-        results = cursor.fetchall()
+        """, values=table_names_upper)
+        cursor.close()
         return results
 
 
@@ -54,12 +58,11 @@ def fetch_table_attributes_for_tables(db_pool: OracleDBConnectionPool, table_nam
     with db_pool.get_connection() as connection:
         cursor = connection.cursor()
         table_names_upper = [name.upper() for name in table_names]
-        cursor.execute(f"""
+        results = fetch_all_in_chunks(cursor=cursor, query="""
             SELECT owner, table_name, pct_free, pct_used, ini_trans, max_trans, logging, tablespace_name
             FROM ALL_TABLES
-            WHERE table_name IN ({','.join([':name' + str(i) for i in range(len(table_names))])})
-        """, {f'name{i}': name for i, name in enumerate(table_names_upper)})
-        results = cursor.fetchall()
+            WHERE table_name IN ({in_list})
+        """, values=table_names_upper)
         cursor.close()
         return results
 
@@ -95,12 +98,11 @@ def fetch_column_comments_for_tables_grouped_by_schema_and_table_name(db_pool: O
     with db_pool.get_connection() as connection:
         cursor = connection.cursor()
         table_names_upper = [name.upper() for name in table_names]
-        cursor.execute(f"""
+        results = fetch_all_in_chunks(cursor=cursor, query="""
             SELECT owner, table_name, column_name, comments
             FROM ALL_COL_COMMENTS
-            WHERE table_name IN ({','.join([':name' + str(i) for i in range(len(table_names))])})
-        """, {f'name{i}': name for i, name in enumerate(table_names_upper)})
-        results = cursor.fetchall()
+            WHERE table_name IN ({in_list})
+        """, values=table_names_upper)
         cursor.close()
 
         grouped_comments = {}
@@ -125,7 +127,7 @@ def fetch_indexes_for_tables_grouped_by_schema_and_table_name(db_pool: OracleDBC
     with db_pool.get_connection() as connection:
         cursor = connection.cursor()
         table_names_upper = [name.upper() for name in table_names]
-        cursor.execute(f"""
+        results = fetch_all_in_chunks(cursor=cursor, query="""
             SELECT 
                 ai.owner,
                 ai.table_name,
@@ -148,13 +150,12 @@ def fetch_indexes_for_tables_grouped_by_schema_and_table_name(db_pool: OracleDBC
             AND 
                 ai.owner = uc.owner
             WHERE 
-                ai.table_name IN ({','.join([':name' + str(i) for i in range(len(table_names))])})
+                ai.table_name IN ({in_list})
             ORDER BY 
                 ai.owner, 
                 ai.table_name, 
-                ai.index_name;
-        """, {f'name{i}': name for i, name in enumerate(table_names_upper)})
-        results = cursor.fetchall()
+                ai.index_name
+        """, values=table_names_upper)
         cursor.close()
 
         grouped_indexes = {}
@@ -187,11 +188,12 @@ def fetch_full_indexes_for_tables_grouped_by_schema_and_table_name(db_pool: Orac
     :return: Dictionary grouped by schema and table name, containing index metadata with column details
     """
     with db_pool.get_connection() as connection:
-        cursor = connection.cursor()
+        # COLUMN_EXPRESSION is a LONG column
+        cursor = open_long_column_cursor(connection)
         table_names_upper = [name.upper() for name in table_names]
 
         # Combined query to fetch index, column, and expression details
-        query = f"""
+        query = """
             SELECT 
                 ai.owner AS schema_name,
                 ai.table_name,
@@ -225,7 +227,7 @@ def fetch_full_indexes_for_tables_grouped_by_schema_and_table_name(db_pool: Orac
                 AND ai.index_name = ac.index_name
                 AND ai.table_name = ac.table_name
             WHERE 
-                ai.table_name IN ({','.join([':name' + str(i) for i in range(len(table_names))])})
+                ai.table_name IN ({in_list})
             ORDER BY 
                 ai.owner, 
                 ai.table_name, 
@@ -233,8 +235,7 @@ def fetch_full_indexes_for_tables_grouped_by_schema_and_table_name(db_pool: Orac
                 aic.column_position
         """
 
-        cursor.execute(query, {f'name{i}': name for i, name in enumerate(table_names_upper)})
-        results = cursor.fetchall()
+        results = fetch_all_in_chunks(cursor=cursor, query=query, values=table_names_upper)
         cursor.close()
 
         # Build the structure
@@ -278,3 +279,32 @@ def fetch_full_indexes_for_tables_grouped_by_schema_and_table_name(db_pool: Orac
                 })
 
         return grouped_indexes
+
+
+# Queries that make up the metadata of a table, each grouped by schema and table name
+TABLE_METADATA_FACETS = {
+    "columns": fetch_table_columns_for_tables_grouped_by_schema_and_table_name,
+    "attributes": fetch_table_attributes_for_tables_grouped_by_schema_and_table_name,
+    "comments": fetch_column_comments_for_tables_grouped_by_schema_and_table_name,
+    "indexes": fetch_full_indexes_for_tables_grouped_by_schema_and_table_name,
+    "triggers": fetch_triggers_for_tables,
+}
+
+
+def iterate_table_metadata_facets(db_pool: OracleDBConnectionPool, table_names: [str],
+                                  max_workers: int | None = None):
+    """
+    Yields the metadata of the tables TABLE_METADATA_CHUNK_SIZE at a time, as facet name -> result grouped by
+    schema and table name. The columns, attributes, comments, indexes and triggers of a chunk are fetched
+    concurrently on separate sessions, up to max_workers queries at a time.
+    """
+    table_names = list(table_names)
+    for start in range(0, len(table_names), TABLE_METADATA_CHUNK_SIZE):
+        chunk = table_names[start:start + TABLE_METADATA_CHUNK_SIZE]
+        results = run_concurrently(
+            db_pool=db_pool,
+            task=lambda fetch_facet: fetch_facet(db_pool=db_pool, table_names=chunk),
+            items=list(TABLE_METADATA_FACETS.values()),
+            max_workers=max_workers,
+            task_name="Table metadata facet")
+        yield dict(zip(TABLE_METADATA_FACETS.keys(), results))
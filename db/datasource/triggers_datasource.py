@@ -1,5 +1,5 @@
 from db.database_properties import DatabaseObject, DatabaseEnvironment
-from db.oracle_database_tools import OracleDBConnectionPool
+from db.oracle_database_tools import OracleDBConnectionPool, iterate_in_chunks, open_long_column_cursor
 
 
 def fetch_triggers_elements_from_database(db_pool: OracleDBConnectionPool, trigger_names: [str]):
@@ -7,9 +7,10 @@ def fetch_triggers_elements_from_database(db_pool: OracleDBConnectionPool, trigg
     Query the ALL_TRIGGERS table to get details for the given list of trigger names.
     """
     with db_pool.get_connection() as connection:
-        cursor = connection.cursor()
+        # TRIGGER_BODY is a LONG column
+        cursor = open_long_column_cursor(connection)
 
-        # Create a dynamic query to handle the list of trigger names
+        # The list of trigger names is bound in fixed-size chunks
         query = """
         SELECT
             OWNER,
@@ -26,9 +27,9 @@ def fetch_triggers_elements_from_database(db_pool: OracleDBConnectionPool, trigg
             ALL_TRIGGERS
         WHERE
             BASE_OBJECT_TYPE = 'TABLE'
-            AND TRIGGER_NAME IN ({})
-        """.format(",".join([f"'{name}'" for name in trigger_names]))
-        cursor.execute(query)
+            AND TRIGGER_NAME IN ({in_list})
+        """
+        rows = iterate_in_chunks(cursor=cursor, query=query, values=list(trigger_names))
 
         trigger = [{
             "owner": row[0],
@@ -41,7 +42,7 @@ def fetch_triggers_elements_from_database(db_pool: OracleDBConnectionPool, trigg
             "status": row[7],
             "description": row[8],
             "trigger_body": row[9],
-        } for row in cursor.fetchall()]
+        } for row in rows]
 
         cursor.close()
         return trigger
@@ -64,10 +65,7 @@ def fetch_triggers_for_tables(db_pool: OracleDBConnectionPool, table_names: [str
 
     table_names_upper = [name.upper() for name in table_names]
 
-    # Dynamically create placeholders for the IN clause
-    placeholders = ','.join([f':name{i}' for i in range(len(table_names_upper))])
-
-    query = f"""
+    query = """
     SELECT
         OWNER,
         TABLE_NAME,
@@ -83,19 +81,16 @@ def fetch_triggers_for_tables(db_pool: OracleDBConnectionPool, table_names: [str
         ALL_TRIGGERS
     WHERE
         BASE_OBJECT_TYPE = 'TABLE'
-        AND TABLE_NAME IN ({placeholders})
+        AND TABLE_NAME IN ({in_list})
     """
 
     # Prepare a dictionary to group results
     grouped_data = {}
 
     with db_pool.get_connection() as connection:
-        cursor = connection.cursor()
-        # Convert tables list into Oracle's SQL-compatible format
-        bind_variables = {f'name{i}': name for i, name in enumerate(table_names_upper)}
-        cursor.execute(query, bind_variables)
-
-        for row in cursor:
+        # TRIGGER_BODY is a LONG column
+        cursor = open_long_column_cursor(connection)
+        for row in iterate_in_chunks(cursor=cursor, query=query, values=table_names_upper):
             owner = row[0]
             table_name = row[1]
 
@@ -1,5 +1,9 @@
 import json
+import logging
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
 
 import cx_Oracle
@@ -7,6 +11,165 @@ import cx_Oracle
 from db.database_properties import DatabaseEnvironment
 
 DB_CONFIG_FILE = "../config/db_config.json"
+IN_LIST_CHUNK_SIZE = 100  # Binds per IN list, well below Oracle's limit of 1000 expressions
+LONG_FETCH_ARRAY_SIZE = 100  # Rows per round-trip of queries with LONG or LOB columns, bounds their buffers
+
+# Pool settings used when the database entry of db_config.json has no "pool" section, or leaves a key out
+DEFAULT_POOL_CONFIG = {
+    "min": 1,  # Minimum number of sessions in the pool
+    "max": 5,  # Maximum number of sessions in the pool
+    "increment": 1,  # Number of sessions to add when the pool is exhausted
+    "stmtcachesize": 50,  # Statements cached per session
+    "ping_interval": 60,  # Seconds a session may be idle before it is checked on acquire
+    "wait_timeout": 0,  # Milliseconds to wait for a free session, 0 waits forever
+    "arraysize": 500,  # Default rows fetched per round-trip of every cursor
+    "prefetchrows": 500,  # Default rows returned with the execute call of every cursor
+    "session_init": []  # Statements run once on every new session, e.g. ALTER SESSION settings
+}
+
+
+class PoolMetrics:
+    """
+    Counters of one connection pool: how long callers waited for a session, how many sessions were in use
+    and how many statements and fetches went to the database. Thread safe.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.in_use = 0
+        self.reset()
+
+    def reset(self):
+        """Restarts the counters. Sessions in use stay counted."""
+        with self._lock:
+            self.acquires = 0
+            self.acquire_wait_total = 0.0
+            self.acquire_wait_max = 0.0
+            self.hold_time_total = 0.0
+            self.in_use_peak = self.in_use
+            self.executions = 0
+            self.fetches = 0
+            self.sessions_initialized = 0
+
+    def record_acquire(self, wait: float):
+        with self._lock:
+            self.acquires += 1
+            self.acquire_wait_total += wait
+            self.acquire_wait_max = max(self.acquire_wait_max, wait)
+            self.in_use += 1
+            self.in_use_peak = max(self.in_use_peak, self.in_use)
+
+    def record_release(self, hold_time: float):
+        with self._lock:
+            self.in_use -= 1
+            self.hold_time_total += hold_time
+
+    def record_execution(self):
+        with self._lock:
+            self.executions += 1
+
+    def record_fetch(self):
+        with self._lock:
+            self.fetches += 1
+
+    def record_session_initialized(self):
+        with self._lock:
+            self.sessions_initialized += 1
+
+    def as_dict(self) -> dict:
+        with self._lock:
+            return {
+                "acquires": self.acquires,
+                "acquire_wait_total": round(self.acquire_wait_total, 3),
+                "acquire_wait_avg": round(self.acquire_wait_total / self.acquires, 3) if self.acquires else 0.0,
+                "acquire_wait_max": round(self.acquire_wait_max, 3),
+                "hold_time_total": round(self.hold_time_total, 3),
+                "in_use": self.in_use,
+                "in_use_peak": self.in_use_peak,
+                "executions": self.executions,
+                "fetches": self.fetches,
+                "sessions_initialized": self.sessions_initialized
+            }
+
+
+def iterate_with_fetch_metrics(rows, arraysize: int, metrics: PoolMetrics):
+    """
+    Yields the rows of an iterated cursor, counting a fetch for every arraysize rows read, the round trips the
+    driver makes while iterating, and one for the last round trip that comes back short or empty.
+    """
+    batch_size = max(arraysize or 1, 1)
+    rows_iterator = iter(rows)
+    fetched_rows = 0
+    while True:
+        if fetched_rows % batch_size == 0:
+            metrics.record_fetch()
+        try:
+            row = next(rows_iterator)
+        except StopIteration:
+            return
+        fetched_rows += 1
+        yield row
+
+
+class _MeteredCursor:
+    """Cursor wrapper that counts executions and fetches, explicit or made while iterating, in the pool metrics."""
+
+    def __init__(self, cursor, metrics: PoolMetrics):
+        object.__setattr__(self, "_cursor", cursor)
+        object.__setattr__(self, "_metrics", metrics)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __setattr__(self, name, value):
+        setattr(self._cursor, name, value)
+
+    def __iter__(self):
+        return iterate_with_fetch_metrics(rows=self._cursor, arraysize=self._cursor.arraysize, metrics=self._metrics)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._cursor.close()
+
+    def execute(self, *args, **kwargs):
+        self._metrics.record_execution()
+        return self._cursor.execute(*args, **kwargs)
+
+    def executemany(self, *args, **kwargs):
+        self._metrics.record_execution()
+        return self._cursor.executemany(*args, **kwargs)
+
+    def fetchone(self):
+        self._metrics.record_fetch()
+        return self._cursor.fetchone()
+
+    def fetchmany(self, *args, **kwargs):
+        self._metrics.record_fetch()
+        return self._cursor.fetchmany(*args, **kwargs)
+
+    def fetchall(self):
+        self._metrics.record_fetch()
+        return self._cursor.fetchall()
+
+
+class _PooledConnection:
+    """Connection wrapper whose cursors get the pool's fetch defaults and report to the pool metrics."""
+
+    def __init__(self, connection, pool_config: dict, metrics: PoolMetrics):
+        self._connection = connection
+        self._pool_config = pool_config
+        self._metrics = metrics
+
+    def __getattr__(self, name):
+        return getattr(self._connection, name)
+
+    def cursor(self, *args, **kwargs):
+        cursor = self._connection.cursor(*args, **kwargs)
+        cursor.arraysize = self._pool_config["arraysize"]
+        cursor.prefetchrows = self._pool_config["prefetchrows"]
+        return _MeteredCursor(cursor=cursor, metrics=self._metrics)
 
 
 class OracleDBConnectionPool:
@@ -29,25 +192,62 @@ class OracleDBConnectionPool:
 
         configs = _load_config(config_file)
         database_config = _get_config_for_database(configs, database_name)
+        self.database_name = database_name
+        self.pool_config = _get_pool_config(database_config)
+        self.max_sessions = self.pool_config["max"]
+        self.metrics = PoolMetrics()
 
         # Create a connection pool
         self._connection_pool = cx_Oracle.SessionPool(
             user=database_config['username'],
             password=database_config['password'],
             dsn=f"{database_config['host']}:{database_config['port']}/{database_config['service_name']}",
-            min=1,  # Minimum number of connections in the pool
-            max=5,  # Maximum number of connections in the pool
-            increment=1  # Number of connections to add when the pool is exhausted
+            min=self.pool_config["min"],
+            max=self.pool_config["max"],
+            increment=self.pool_config["increment"],
+            threaded=True,  # Sessions are acquired from worker threads
+            getmode=cx_Oracle.SPOOL_ATTRVAL_WAIT if not self.pool_config["wait_timeout"]
+            else cx_Oracle.SPOOL_ATTRVAL_TIMEDWAIT,  # Wait for a free session instead of failing at once
+            wait_timeout=self.pool_config["wait_timeout"],
+            stmtcachesize=self.pool_config["stmtcachesize"],
+            ping_interval=self.pool_config["ping_interval"],
+            session_callback=self._initialize_session
         )
 
+    def _initialize_session(self, connection, requested_tag):
+        """Runs the configured session_init statements once on every new session."""
+        cursor = connection.cursor()
+        for statement in self.pool_config["session_init"]:
+            cursor.execute(statement)
+        cursor.close()
+        self.metrics.record_session_initialized()
+
     @contextmanager
     def get_connection(self):
         """Context manager for acquiring and releasing a connection."""
+        start = time.perf_counter()
         connection = self._connection_pool.acquire()
+        acquired = time.perf_counter()
+        self.metrics.record_acquire(wait=acquired - start)
         try:
-            yield connection
+            yield _PooledConnection(connection=connection, pool_config=self.pool_config, metrics=self.metrics)
         finally:
             self._connection_pool.release(connection)
+            self.metrics.record_release(hold_time=time.perf_counter() - acquired)
+
+    def get_metrics(self) -> dict:
+        """Pool metrics plus the sessions currently opened and busy in the session pool."""
+        metrics = self.metrics.as_dict()
+        if self._connection_pool is not None:
+            metrics.update({"opened": self._connection_pool.opened, "busy": self._connection_pool.busy,
+                            "max": self._connection_pool.max})
+        return metrics
+
+    def log_metrics(self, stage: str, reset: bool = True):
+        """Logs the metrics gathered during a stage, then starts counting again unless reset is False."""
+        logging.info(f"Pool metrics {self.database_name.value} after {stage}: {self.get_metrics()}")
+        if reset:
+            self.metrics.reset()
 
     def close_pool(self):
         """Close the connection pool."""
@@ -63,6 +263,126 @@ class OracleDBConnectionPool:
         cls._instances.clear()
 
 
+def run_concurrently(db_pool: OracleDBConnectionPool, task, items: list, max_workers: int | None = None,
+                     task_name: str = "task") -> list:
+    """
+    Runs task(item) for every item on worker threads, each task using its own pooled session.
+
+    Args:
+        db_pool (OracleDBConnectionPool): Pool the tasks acquire their connections from.
+        task (callable): Function called with one item.
+        items (list): Independent work items.
+        max_workers (int | None): Number of threads, capped by the pool size. Defaults to the pool size;
+            1 runs the tasks one after the other on the calling thread.
+        task_name (str): Name used in the latency log lines.
+
+    Returns:
+        list: The task results, in the order of the items.
+    """
+    items = list(items)
+    workers = min(max_workers or db_pool.max_sessions, db_pool.max_sessions, len(items))
+    latencies = []
+
+    def timed_task(item):
+        start = time.perf_counter()
+        result = task(item)
+        elapsed = time.perf_counter() - start
+        latencies.append(elapsed)
+        logging.info(f"{task_name} {len(latencies)}/{len(items)} took {elapsed:.3f}s")
+        return result
+
+    start = time.perf_counter()
+    if workers <= 1:
+        results = [timed_task(item) for item in items]
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(timed_task, items))
+    elapsed = time.perf_counter() - start
+
+    if latencies:
+        logging.info(f"{task_name}: {len(latencies)} tasks on {max(workers, 1)} sessions in {elapsed:.3f}s, "
+                     f"latency min {min(latencies):.3f}s avg {sum(latencies) / len(latencies):.3f}s "
+                     f"max {max(latencies):.3f}s")
+    return results
+
+
+def iterate_in_chunks(cursor, query: str, values: list, params: dict | None = None, bind_prefix: str = "name",
+                      chunk_size: int = IN_LIST_CHUNK_SIZE):
+    """
+    Executes a query with an IN list once per chunk of values and yields the rows batch by batch.
+
+    The query holds the IN list as {in_list}, replaced by chunk_size binds. Short chunks are padded with
+    NULL, which matches nothing, so every execution uses the same SQL text and the prepared statement is
+    reused. Duplicate values are sent once. Rows are read with fetchmany, so at most cursor.arraysize
+    rows are held by the driver at a time.
+
+    Args:
+        cursor: Cursor to execute the query with.
+        query (str): SQL text with an "IN ({in_list})" condition.
+        values (list): Values of the IN list, any number of them.
+        params (dict | None): Other bind variables of the query.
+        bind_prefix (str): Name of the IN list binds, numbered from 0.
+        chunk_size (int): Binds per execution.
+
+    Yields:
+        tuple: The rows of every chunk, in chunk order.
+    """
+    unique_values = list(dict.fromkeys(values))
+    if not unique_values:
+        return
+
+    cursor.prepare(query.replace("{in_list}", ", ".join(f":{bind_prefix}{i}" for i in range(chunk_size))))
+    for start in range(0, len(unique_values), chunk_size):
+        chunk = unique_values[start:start + chunk_size]
+        binds = dict(params or {})
+        binds.update({f"{bind_prefix}{i}": chunk[i] if i < len(chunk) else None for i in range(chunk_size)})
+        cursor.execute(None, binds)
+        while True:
+            rows = cursor.fetchmany()
+            if not rows:
+                break
+            yield from rows
+
+
+def fetch_all_in_chunks(cursor, query: str, values: list, params: dict | None = None, bind_prefix: str = "name",
+                        chunk_size: int = IN_LIST_CHUNK_SIZE) -> list:
+    """
+    Same as iterate_in_chunks, but returns all the rows in a list.
+
+    Returns:
+        list: The rows of every chunk, in chunk order.
+    """
+    return list(iterate_in_chunks(cursor=cursor, query=query, values=values, params=params,
+                                  bind_prefix=bind_prefix, chunk_size=chunk_size))
+
+
+def long_column_output_type_handler(cursor, name, default_type, size, precision, scale):
+    """
+    Output type handler that defines LONG, CLOB and NCLOB columns as LONG strings sized by the cursor's
+    array size. LOB values then come with the rest of the row instead of one extra round-trip per value,
+    and LONG columns keep array fetching. Other columns keep their default definition.
+    """
+    if default_type in (cx_Oracle.DB_TYPE_LONG, cx_Oracle.DB_TYPE_CLOB, cx_Oracle.DB_TYPE_NCLOB):
+        return cursor.var(cx_Oracle.DB_TYPE_LONG, arraysize=cursor.arraysize)
+    return None
+
+
+def open_long_column_cursor(connection, arraysize: int = LONG_FETCH_ARRAY_SIZE):
+    """
+    Opens a cursor for queries that return LONG or LOB columns, such as ALL_TRIGGERS.TRIGGER_BODY or
+    ALL_IND_EXPRESSIONS.COLUMN_EXPRESSION.
+
+    The array size is kept smaller than the pool default because every fetched LONG value is held in
+    memory until the next fetch. Iterate it with fetchmany, or with iterate_in_chunks, to keep memory
+    bounded per batch.
+    """
+    cursor = connection.cursor()
+    cursor.arraysize = arraysize
+    cursor.prefetchrows = arraysize
+    cursor.outputtypehandler = long_column_output_type_handler
+    return cursor
+
+
 def _load_config(config_file):
     """Load db configuration from a JSON file."""
     with open(config_file, 'r', encoding='utf-8') as file:
@@ -77,6 +397,16 @@ def _get_config_for_database(configs, database_name: DatabaseEnvironment):
     raise ValueError(f"Database '{database_name.name}' not found in configurations.")
 
 
+def _get_pool_config(database_config: dict) -> dict:
+    """Pool settings of a database: its "pool" section over DEFAULT_POOL_CONFIG."""
+    pool_config = dict(DEFAULT_POOL_CONFIG)
+    pool_config.update(database_config.get("pool", {}))
+    unknown_keys = set(pool_config) - set(DEFAULT_POOL_CONFIG)
+    if unknown_keys:
+        raise ValueError(f"Unknown pool settings: {', '.join(sorted(unknown_keys))}")
+    return pool_config
+
+
 def _build_connection_string(config):
     """Construct the Oracle connection string from configuration."""
     return f"{config['username']}/{config['password']}@{config['host']}:{config['port']}/{config['service_name']}"
@@ -0,0 +1,418 @@
+import atexit
+import base64
+import datetime
+import decimal
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from db.database_properties import DatabaseEnvironment
+from db.oracle_database_tools import OracleDBConnectionPool, PoolMetrics, DEFAULT_POOL_CONFIG, \
+    iterate_with_fetch_metrics
+
+RECORDED_CATALOG_FILE_PATH = "../workfiles/{database_name}_recorded_catalog.json"
+# Environment variables read by get_connection_pool, so every entry script can record or replay without changes
+POOL_MODE_VARIABLE = "LAUREATE_DB_POOL_MODE"
+REPLAY_LATENCY_VARIABLE = "LAUREATE_DB_REPLAY_LATENCY"
+
+_pools = {}  # (DatabaseEnvironment, mode) -> recording or replay pool
+
+
+def get_recorded_catalog_file_path(database_name: DatabaseEnvironment) -> str:
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    return os.path.join(script_dir, RECORDED_CATALOG_FILE_PATH.format(database_name=database_name.value))
+
+
+def _encode_value(value):
+    """
+    JSON form of a fetched or bound value. Dates, decimals and bytes are tagged so they are restored on replay,
+    LOBs are read first.
+
+    Raises:
+        TypeError: If the value has a type that can not be recorded.
+    """
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, datetime.datetime):
+        return {"$datetime": value.isoformat()}
+    if isinstance(value, datetime.date):
+        return {"$date": value.isoformat()}
+    if isinstance(value, decimal.Decimal):
+        return {"$decimal": str(value)}
+    if isinstance(value, (bytes, bytearray)):
+        return {"$bytes": base64.b64encode(value).decode("ascii")}
+    if isinstance(value, (list, tuple)):
+        return [_encode_value(item) for item in value]
+    if isinstance(value, dict):
+        return {name: _encode_value(item) for name, item in value.items()}
+    if callable(getattr(value, "read", None)):
+        # CLOB, NCLOB and BLOB locators
+        return _encode_value(value.read())
+    raise TypeError(f"Can not record a value of type {type(value).__name__}")
+
+
+def _decode_value(value):
+    if isinstance(value, dict):
+        if "$datetime" in value:
+            return datetime.datetime.fromisoformat(value["$datetime"])
+        if "$date" in value:
+            return datetime.date.fromisoformat(value["$date"])
+        if "$decimal" in value:
+            return decimal.Decimal(value["$decimal"])
+        if "$bytes" in value:
+            return base64.b64decode(value["$bytes"])
+        return {name: _decode_value(item) for name, item in value.items()}
+    if isinstance(value, list):
+        return [_decode_value(item) for item in value]
+    return value
+
+
+def _build_query_key(statement: str, binds) -> str:
+    """Identifies one execution: the SQL text with its whitespace collapsed plus the bind values."""
+    return json.dumps([" ".join(statement.split()), _encode_value(binds or [])], sort_keys=True)
+
+
+class RecordedCatalog:
+    """
+    Query results captured from a real database, keyed by SQL text and bind values, stored in a JSON file.
+    Thread safe.
+    """
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        self._lock = threading.Lock()
+        self._results = {}  # query key -> {"columns", "rows"}
+        if os.path.exists(file_path):
+            with open(file_path, mode='r', encoding='utf-8') as file:
+                self._results = json.load(file)
+
+    def record(self, statement: str, binds, description, rows: list):
+        """
+        Raises:
+            TypeError: If a bind or a fetched value can not be recorded, before anything is stored.
+        """
+        columns = [column[0] for column in description] if description else None
+        result = {"columns": columns, "rows": _encode_value(rows)}
+        query_key = _build_query_key(statement, binds)
+        with self._lock:
+            self._results[query_key] = result
+
+    def lookup(self, statement: str, binds) -> tuple[list | None, list]:
+        """
+        Returns the column names and rows recorded for one execution.
+
+        Raises:
+            ValueError: If the execution was not recorded.
+        """
+        with self._lock:
+            result = self._results.get(_build_query_key(statement, binds))
+        if result is None:
+            raise ValueError(f"No recorded result for query: {' '.join(statement.split())[:200]}")
+        return result["columns"], [tuple(_decode_value(row)) for row in result["rows"]]
+
+    def save(self):
+        with self._lock:
+            temporary_file_path = f"{self.file_path}.tmp"
+            with open(temporary_file_path, mode='w', encoding='utf-8') as file:
+                json.dump(self._results, file)
+            os.replace(temporary_file_path, self.file_path)
+        logging.info(f"Recorded catalog saved to {self.file_path}, {len(self._results)} queries")
+
+    def __len__(self):
+        return len(self._results)
+
+
+class _ResultCursor:
+    """Cursor that serves the rows of the last execution from memory with the DB-API fetch calls."""
+
+    def __init__(self):
+        self.arraysize = DEFAULT_POOL_CONFIG["arraysize"]
+        self.prefetchrows = DEFAULT_POOL_CONFIG["prefetchrows"]
+        self.outputtypehandler = None
+        self.description = None
+        self.rowcount = 0
+        self._statement = None
+        self._rows = []
+        self._position = 0
+
+    def _set_result(self, columns: list | None, rows: list):
+        self.description = [(column, None, None, None, None, None, None) for column in columns] if columns else None
+        self.rowcount = len(rows)
+        self._rows = rows
+        self._position = 0
+
+    @staticmethod
+    def _get_binds(args: tuple, kwargs: dict):
+        return args[0] if args else kwargs
+
+    def prepare(self, statement: str):
+        self._statement = statement
+
+    def fetchone(self):
+        if self._position >= len(self._rows):
+            return None
+        row = self._rows[self._position]
+        self._position += 1
+        return row
+
+    def fetchmany(self, num_rows: int | None = None):
+        end = self._position + (num_rows or self.arraysize)
+        rows = self._rows[self._position:end]
+        self._position += len(rows)
+        return rows
+
+    def fetchall(self):
+        rows = self._rows[self._position:]
+        self._position = len(self._rows)
+        return rows
+
+    def __iter__(self):
+        while self._position < len(self._rows):
+            row = self._rows[self._position]
+            self._position += 1
+            yield row
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        self._rows = []
+
+
+class _RecordingCursor(_ResultCursor):
+    """Runs every statement on a real cursor and records the rows it returns."""
+
+    def __init__(self, cursor, catalog: RecordedCatalog):
+        super().__init__()
+        self._cursor = cursor
+        self._catalog = catalog
+        self.arraysize = cursor.arraysize
+        self.prefetchrows = cursor.prefetchrows
+
+    def __setattr__(self, name, value):
+        # Fetch settings also apply to the real cursor
+        if name in ("arraysize", "prefetchrows", "outputtypehandler") and "_cursor" in self.__dict__:
+            setattr(self._cursor, name, value)
+        object.__setattr__(self, name, value)
+
+    def prepare(self, statement: str):
+        super().prepare(statement)
+        self._cursor.prepare(statement)
+
+    def execute(self, statement: str | None, *args, **kwargs):
+        statement = statement or self._statement
+        self._cursor.execute(statement, *args, **kwargs)
+        if self._cursor.description is None:
+            self._set_result(columns=None, rows=[])
+            return None
+        rows = self._cursor.fetchall()
+        self._catalog.record(statement=statement, binds=self._get_binds(args, kwargs),
+                             description=self._cursor.description, rows=rows)
+        self._set_result(columns=[column[0] for column in self._cursor.description], rows=rows)
+        return self
+
+    def executemany(self, *args, **kwargs):
+        return self._cursor.executemany(*args, **kwargs)
+
+    def getbatcherrors(self):
+        return self._cursor.getbatcherrors()
+
+    def close(self):
+        super().close()
+        self._cursor.close()
+
+
+class _ReplayCursor(_ResultCursor):
+    """Serves every statement from the recorded catalog, after the configured latency."""
+
+    def __init__(self, catalog: RecordedCatalog, latency_seconds: float, metrics: PoolMetrics):
+        super().__init__()
+        self._catalog = catalog
+        self._latency_seconds = latency_seconds
+        self._metrics = metrics
+
+    def execute(self, statement: str | None, *args, **kwargs):
+        statement = statement or self._statement
+        self._metrics.record_execution()
+        if self._latency_seconds:
+            time.sleep(self._latency_seconds)
+        columns, rows = self._catalog.lookup(statement=statement, binds=self._get_binds(args, kwargs))
+        self._set_result(columns=columns, rows=rows)
+        return self
+
+    def executemany(self, statement: str | None, parameters: list, **kwargs):
+        """Writes are not replayed: every row is reported as saved."""
+        self._metrics.record_execution()
+        self.rowcount = len(parameters)
+
+    def getbatcherrors(self):
+        return []
+
+    def __iter__(self):
+        # Counted as the live cursor counts the round trips of an iteration
+        return iterate_with_fetch_metrics(rows=super().__iter__(), arraysize=self.arraysize, metrics=self._metrics)
+
+    def fetchone(self):
+        self._metrics.record_fetch()
+        return super().fetchone()
+
+    def fetchmany(self, num_rows: int | None = None):
+        self._metrics.record_fetch()
+        return super().fetchmany(num_rows)
+
+    def fetchall(self):
+        self._metrics.record_fetch()
+        return super().fetchall()
+
+
+class _RecordingConnection:
+    def __init__(self, connection, catalog: RecordedCatalog):
+        self._connection = connection
+        self._catalog = catalog
+
+    def __getattr__(self, name):
+        return getattr(self._connection, name)
+
+    def cursor(self, *args, **kwargs):
+        return _RecordingCursor(cursor=self._connection.cursor(*args, **kwargs), catalog=self._catalog)
+
+
+class _ReplayConnection:
+    def __init__(self, catalog: RecordedCatalog, latency_seconds: float, metrics: PoolMetrics):
+        self._catalog = catalog
+        self._latency_seconds = latency_seconds
+        self._metrics = metrics
+
+    def cursor(self):
+        return _ReplayCursor(catalog=self._catalog, latency_seconds=self._latency_seconds, metrics=self._metrics)
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class RecordingConnectionPool:
+    """
+    Wraps a real connection pool and records the result of every query run through it, so the run can be
+    replayed later with ReplayConnectionPool. The catalog is written on save() and close_pool().
+    """
+
+    def __init__(self, db_pool: OracleDBConnectionPool, file_path: str | None = None):
+        self._db_pool = db_pool
+        self.catalog = RecordedCatalog(file_path=file_path or get_recorded_catalog_file_path(db_pool.database_name))
+
+    def __getattr__(self, name):
+        return getattr(self._db_pool, name)
+
+    @contextmanager
+    def get_connection(self):
+        with self._db_pool.get_connection() as connection:
+            yield _RecordingConnection(connection=connection, catalog=self.catalog)
+
+    def save(self):
+        self.catalog.save()
+
+    def close_pool(self):
+        self.save()
+        self._db_pool.close_pool()
+
+
+class ReplayConnectionPool:
+    """
+    Connection pool that answers every query from a recorded catalog, without a database. Used to measure
+    and regression test the extraction offline; latency_seconds is added to every execution to simulate
+    the network round-trip.
+    """
+
+    def __init__(self, database_name: DatabaseEnvironment, file_path: str | None = None, latency_seconds: float = 0.0,
+                 max_sessions: int = DEFAULT_POOL_CONFIG["max"]):
+        self.database_name = database_name
+        self.max_sessions = max_sessions
+        self.latency_seconds = latency_seconds
+        self.metrics = PoolMetrics()
+        file_path = file_path or get_recorded_catalog_file_path(database_name)
+        if not os.path.exists(file_path):
+            raise ValueError(f"Recorded catalog not found: {file_path}")
+        self.catalog = RecordedCatalog(file_path=file_path)
+
+    @contextmanager
+    def get_connection(self):
+        self.metrics.record_acquire(wait=0.0)
+        acquired = time.perf_counter()
+        try:
+            yield _ReplayConnection(catalog=self.catalog, latency_seconds=self.latency_seconds, metrics=self.metrics)
+        finally:
+            self.metrics.record_release(hold_time=time.perf_counter() - acquired)
+
+    def get_metrics(self) -> dict:
+        return self.metrics.as_dict()
+
+    def log_metrics(self, stage: str, reset: bool = True):
+        logging.info(f"Replay pool metrics {self.database_name.value} after {stage}: {self.get_metrics()}")
+        if reset:
+            self.metrics.reset()
+
+    def close_pool(self):
+        pass
+
+
+def create_connection_pool(database_name: DatabaseEnvironment, mode: str = "live", file_path: str | None = None,
+                           latency_seconds: float = 0.0):
+    """
+    Returns the connection pool of a database for the given mode.
+
+    Args:
+        database_name (DatabaseEnvironment): Database environment.
+        mode (str): "live" queries the database, "record" queries it and records the results, "replay"
+            serves the recorded results without a database.
+        file_path (str | None): Recorded catalog file. Defaults to workfiles/<database>_recorded_catalog.json.
+        latency_seconds (float): Delay added to every replayed execution.
+
+    Raises:
+        ValueError: If the mode is unknown.
+    """
+    if mode == "live":
+        return OracleDBConnectionPool(database_name=database_name)
+    if mode == "record":
+        return RecordingConnectionPool(db_pool=OracleDBConnectionPool(database_name=database_name),
+                                       file_path=file_path)
+    if mode == "replay":
+        return ReplayConnectionPool(database_name=database_name, file_path=file_path,
+                                    latency_seconds=latency_seconds)
+    raise ValueError(f"Unknown connection pool mode: {mode}")
+
+
+def get_connection_pool(database_name: DatabaseEnvironment):
+    """
+    Returns the connection pool the entry scripts use, in the mode given by the LAUREATE_DB_POOL_MODE
+    environment variable: "live" (default), "record" or "replay". Replayed executions wait
+    LAUREATE_DB_REPLAY_LATENCY seconds. One recording or replay pool is created per database, recordings are
+    also saved when the process exits.
+
+    Raises:
+        ValueError: If the mode is unknown or, on replay, the database has no recorded catalog.
+    """
+    mode = os.environ.get(POOL_MODE_VARIABLE, "live").lower()
+    if mode == "live":
+        return OracleDBConnectionPool(database_name=database_name)
+
+    db_pool = _pools.get((database_name, mode))
+    if db_pool is None:
+        db_pool = create_connection_pool(database_name=database_name, mode=mode,
+                                         latency_seconds=float(os.environ.get(REPLAY_LATENCY_VARIABLE, 0)))
+        if mode == "record":
+            atexit.register(db_pool.save)
+        _pools[(database_name, mode)] = db_pool
+        logging.info(f"Connection pool {database_name.value} in {mode} mode")
+    return db_pool
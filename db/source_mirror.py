@@ -0,0 +1,224 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+
+from db.datasource.catalog_datasource import query_last_ddl_times
+from db.datasource.procedures_datasource import query_sources_concurrently
+from db.oracle_database_tools import OracleDBConnectionPool
+
+SOURCE_MIRROR_FOLDER = "../workfiles/source_mirror"
+SOURCE_MIRROR_INDEX_FILE = "{database_name}_index.json"
+SOURCE_MIRROR_OBJECTS_FOLDER = "objects"
+
+_mirrors = {}  # One mirror per database environment
+
+
+def _is_source_line(text: str | None) -> bool:
+    """Same filter as length(trim(ALL_SOURCE.TEXT)) > 1, TRIM only removes blanks."""
+    return text is not None and len(text.strip(" ")) > 1
+
+
+class SourceMirror:
+    """
+    Local copy of ALL_SOURCE for one database environment.
+
+    The lines of every object are stored once per content, in a file named after their SHA-256. An index
+    maps each (OWNER, TYPE, NAME) to that hash and to the LAST_DDL_TIME the lines were fetched at, so a
+    refresh only downloads the objects whose DDL time changed.
+    """
+
+    def __init__(self, database_name: str, mirror_folder: str | None = None):
+        script_dir = os.path.dirname(os.path.abspath(__file__))
+        self.database_name = database_name
+        self.mirror_folder = mirror_folder or os.path.join(script_dir, SOURCE_MIRROR_FOLDER)
+        self.index_file_path = os.path.join(self.mirror_folder,
+                                            SOURCE_MIRROR_INDEX_FILE.format(database_name=database_name))
+        self.objects_folder = os.path.join(self.mirror_folder, SOURCE_MIRROR_OBJECTS_FOLDER)
+        self._index = self._read_index()  # "OWNER.TYPE.NAME" -> {"last_ddl_time", "hash"}
+        self._checked = set()  # Objects whose DDL time was already compared in this process
+        self.fetched = 0
+        self.reused = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _get_index_key(source_object: tuple[str, str, str]) -> str:
+        owner, object_type, name = source_object
+        return f"{owner}.{object_type}.{name}"
+
+    def _read_index(self) -> dict:
+        if not os.path.exists(self.index_file_path):
+            return {}
+        with open(self.index_file_path, mode='r', encoding='utf-8') as file:
+            return json.load(file)
+
+    def _write_index(self):
+        os.makedirs(self.mirror_folder, exist_ok=True)
+        temporary_file_path = f"{self.index_file_path}.tmp"
+        with open(temporary_file_path, mode='w', encoding='utf-8') as file:
+            json.dump(self._index, file, indent=1, sort_keys=True)
+        os.replace(temporary_file_path, self.index_file_path)
+
+    def _get_blob_path(self, content_hash: str) -> str:
+        return os.path.join(self.objects_folder, content_hash[:2], f"{content_hash}.json")
+
+    def _write_blob(self, lines: list) -> str:
+        content = json.dumps(lines).encode('utf-8')
+        content_hash = hashlib.sha256(content).hexdigest()
+        blob_path = self._get_blob_path(content_hash)
+        if not os.path.exists(blob_path):
+            os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+            with open(blob_path, mode='wb') as file:
+                file.write(content)
+        return content_hash
+
+    def _read_blob(self, content_hash: str) -> list | None:
+        blob_path = self._get_blob_path(content_hash)
+        if not os.path.exists(blob_path):
+            return None
+        with open(blob_path, mode='r', encoding='utf-8') as file:
+            return json.load(file)
+
+    def refresh(self, db_pool: OracleDBConnectionPool, source_objects: list[tuple[str, str, str]],
+                max_workers: int | None = None) -> int:
+        """
+        Brings the given objects up to date: asks ALL_OBJECTS for their LAST_DDL_TIME and downloads the
+        source code only of the objects that are new, changed or missing from the store. Every object is
+        compared once per process.
+
+        Returns:
+            int: The number of objects downloaded.
+        """
+        with self._lock:
+            return self._refresh(db_pool=db_pool, source_objects=source_objects, max_workers=max_workers)
+
+    def _refresh(self, db_pool: OracleDBConnectionPool, source_objects: list[tuple[str, str, str]],
+                 max_workers: int | None) -> int:
+        pending = [source_object for source_object in dict.fromkeys(source_objects)
+                   if source_object not in self._checked]
+        if not pending:
+            return 0
+
+        last_ddl_times = query_last_ddl_times(db_pool=db_pool, objects=pending)
+        stale = []
+        removed = 0
+        for source_object in pending:
+            index_key = self._get_index_key(source_object)
+            last_ddl_time = last_ddl_times.get(source_object)
+            if last_ddl_time is None:
+                # the object no longer exists
+                removed += self._index.pop(index_key, None) is not None
+                continue
+            entry = self._index.get(index_key)
+            if (entry and entry["last_ddl_time"] == last_ddl_time.isoformat()
+                    and os.path.exists(self._get_blob_path(entry["hash"]))):
+                self.reused += 1
+                continue
+            stale.append(source_object)
+
+        if stale:
+            logging.info(f"Source mirror {self.database_name}: downloading {len(stale)} changed objects")
+            source_codes = query_sources_concurrently(db_pool=db_pool, objects=stale, max_workers=max_workers,
+                                                      skip_blank_lines=False)
+            for source_object in stale:
+                self._index[self._get_index_key(source_object)] = {
+                    "last_ddl_time": last_ddl_times[source_object].isoformat(),
+                    "hash": self._write_blob(source_codes.get(source_object, []))
+                }
+            self.fetched += len(stale)
+
+        self._checked.update(pending)
+        if stale or removed:
+            self._write_index()
+        return len(stale)
+
+    def get_many(self, db_pool: OracleDBConnectionPool, source_objects: list[tuple[str, str, str]],
+                 max_workers: int | None = None) -> dict:
+        """
+        Returns the unfiltered source lines of the given objects, ordered by line, refreshing them first.
+
+        Returns:
+            dict: (OWNER, TYPE, NAME) -> lines for every object that exists.
+        """
+        self.refresh(db_pool=db_pool, source_objects=source_objects, max_workers=max_workers)
+        source_codes = {}
+        for source_object in source_objects:
+            entry = self._index.get(self._get_index_key(source_object))
+            if entry is None:
+                continue
+            lines = self._read_blob(entry["hash"])
+            if lines is not None:
+                source_codes[source_object] = lines
+        return source_codes
+
+    def get_stats(self) -> dict:
+        return {"objects": len(self._index), "fetched": self.fetched, "reused": self.reused}
+
+
+def get_source_mirror(db_pool: OracleDBConnectionPool) -> SourceMirror:
+    """Returns the source mirror of the pool's database, created once per process."""
+    mirror = _mirrors.get(db_pool.database_name)
+    if mirror is None:
+        mirror = SourceMirror(database_name=db_pool.database_name.value)
+        _mirrors[db_pool.database_name] = mirror
+    return mirror
+
+
+def query_sources_bulk(db_pool: OracleDBConnectionPool, objects: list[tuple[str, str, str]],
+                       max_workers: int | None = None) -> dict:
+    """
+    Same answer as procedures_datasource.query_sources_concurrently, served from the source mirror.
+
+    Returns:
+        dict: (OWNER, TYPE, NAME) -> lines for every object with source code.
+    """
+    source_codes = {}
+    mirrored_source_codes = get_source_mirror(db_pool).get_many(db_pool=db_pool, source_objects=objects,
+                                                                max_workers=max_workers)
+    for source_object, lines in mirrored_source_codes.items():
+        source_lines = [text for text in lines if _is_source_line(text)]
+        if source_lines:
+            source_codes[source_object] = source_lines
+    return source_codes
+
+
+def query_sources(db_pool: OracleDBConnectionPool, owner: str, package: str = None, procedure: str = None,
+                  function: str = None) -> list:
+    """Same answer as procedures_datasource.query_sources, served from the source mirror."""
+    if package:
+        source_object = (owner, "PACKAGE BODY", package)
+    elif procedure:
+        source_object = (owner, "PROCEDURE", procedure)
+    elif function:
+        source_object = (owner, "FUNCTION", function)
+    else:
+        return []
+    return query_sources_bulk(db_pool=db_pool, objects=[source_object]).get(source_object, [])
+
+
+def get_package_body(package_owner: str, package_name: str, db_pool: OracleDBConnectionPool) -> list:
+    """Same answer as packages_datasource.get_package_body, served from the source mirror."""
+    source_object = (package_owner, "PACKAGE BODY", package_name)
+    lines = get_source_mirror(db_pool).get_many(db_pool=db_pool, source_objects=[source_object]).get(source_object, [])
+    return [(text,) for text in lines]
+
+
+def get_package_specification(package_owner: str, package_name: str, db_pool: OracleDBConnectionPool) -> list:
+    """Same answer as packages_datasource.get_package_specification, served from the source mirror."""
+    source_object = (package_owner, "PACKAGE", package_name)
+    lines = get_source_mirror(db_pool).get_many(db_pool=db_pool, source_objects=[source_object]).get(source_object, [])
+    return [(text,) for text in lines]
+
+
+def get_package_records(package_owner: str, package_names: list[str], db_pool: OracleDBConnectionPool,
+                        max_workers: int | None = None) -> list:
+    """Same answer as packages_datasource.get_package_records, served from the source mirror."""
+    source_objects = [(package_owner, object_type, package_name)
+                      for package_name in package_names
+                      for object_type in ("PACKAGE", "PACKAGE BODY")]
+    source_codes = get_source_mirror(db_pool).get_many(db_pool=db_pool, source_objects=source_objects,
+                                                       max_workers=max_workers)
+    return [(owner, name, object_type, line, text)
+            for (owner, object_type, name), lines in source_codes.items()
+            for line, text in enumerate(lines, start=1)]
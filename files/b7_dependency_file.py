@@ -1,10 +1,14 @@
 import logging
 import os
+from contextlib import nullcontext
 
 from db.database_properties import DatabaseEnvironment
 from db.oracle_database_tools import OracleDBConnectionPool
 from files.b7_completed_procedures_file import update_missing_procedures_to_add_manager, create_source_code_manager
-from files.source_code_file import extract_all_dependencies_from_one_source_code_data, get_source_code_folder
+from files.dependency_file import DependencyIndex, run_dependency_worklist
+from files.scan_cache_file import ScanCache
+from files.source_code_file import get_source_code_folder, scan_source_code_files, \
+    complete_source_code_dependencies, resolve_scanned_package_candidates, SCAN_MAX_WORKERS, SCAN_CHUNK_SIZE
 from tools.common_tools import get_all_current_owners, split_table_name_into_package_and_table_name
 from tools.file_tools import write_csv_file, read_csv_file
 
@@ -27,183 +31,6 @@ def get_missing_dependencies_data() -> list[dict]:
     return read_csv_file(missing_dependencies_file_path)
 
 
-def _extract_unique_dependency_objects(dependency_data: list[dict]) -> list:
-    """
-    Reads a file with dependency information and extracts unique function dependency names.
-
-    Parameters:
-        file_path (str): The path to the dependencies file.
-
-    Returns:
-        list: A sorted list of unique function dependency names.
-    """
-    unique_existing_dependency_objects = []
-    unique_dependency_names = []
-
-    try:
-        for row in dependency_data:
-            if (_is_object_dependency_procedure_or_function(object=row,
-                                                            object_name="DEPENDENCY_TYPE")
-                    and _is_object_need_process(object=row, object_name="DEPENDENCY_NAME",
-                                                unique_names=unique_dependency_names)):
-                unique_dependency_names.append(row['DEPENDENCY_NAME'].strip().upper())
-                unique_existing_dependency_objects.append(
-                    {"STATUS": row["STATUS"],
-                     "DEPENDENCY_OWNER": row['DEPENDENCY_OWNER'],
-                     "DEPENDENCY_PACKAGE": row['DEPENDENCY_PACKAGE'],
-                     "DEPENDENCY_NAME": row['DEPENDENCY_NAME'].strip().upper()})
-        return unique_existing_dependency_objects
-
-    except KeyError as e:
-        print(f"Error: Missing expected column in file - {e}")
-        return []
-
-
-def _is_ok_object(object: dict, object_name: str = "STATUS") -> bool:
-    return object[object_name] == "OK"
-
-
-def _is_object_procedure_or_function_or_none(object: dict, object_name: str = "OBJECT_TYPE"):
-    return (object[object_name].strip() == 'FUNCTION'
-            or object[object_name].strip() == 'PROCEDURE' or (
-                    object[object_name].strip() == '' and object["STATUS"] == "MISSING"))
-
-
-def _is_object_dependency_procedure_or_function(object: dict, object_name: str = "DEPENDENCY_TYPE"):
-    return (object[object_name].strip() == 'FUNCTION'
-            or object[object_name].strip() == 'PROCEDURE')
-
-
-def _is_object_need_process(object: dict, object_name: str, unique_names: list[dict]):
-    return object[object_name].strip().upper() not in unique_names
-
-
-def _extract_object_with_missing_status(dependencies_data: list[dict]) -> list[dict]:
-    object_with_missing_status = []
-    try:
-        for row in dependencies_data:
-            if not _is_ok_object(row):
-                object_with_missing_status.append({
-                    "STATUS": row["STATUS"],
-                    "OBJECT_OWNER": row['OBJECT_OWNER'],
-                    "OBJECT_PACKAGE": row['OBJECT_PACKAGE'],
-                    "OBJECT_NAME": row['OBJECT_NAME'].strip().upper()}
-                )
-        return object_with_missing_status
-    except KeyError as e:
-        print(f"Error: Missing expected column in file - {e}")
-        return []
-
-
-def _extract_unique_existing_objects(dependency_data: list[dict]) -> list[dict]:
-    """
-    Reads a file with dependency information and extracts unique existing function names.
-
-    Parameters:
-        file_path (str): The path to the dependencies file.
-
-    Returns:
-        list: A sorted list of unique existing function names.
-    """
-    unique_existing_objects = []
-    unique_object_names = []
-
-    try:
-        for row in dependency_data:
-            if (_is_object_procedure_or_function_or_none(object=row, object_name="OBJECT_TYPE")
-                    and _is_object_need_process(object=row, object_name="OBJECT_NAME",
-                                                unique_names=unique_object_names)):
-                unique_object_names.append(row['OBJECT_NAME'].strip().upper())
-                unique_existing_objects.append(
-                    {"STATUS": row['STATUS'],
-                     "OBJECT_OWNER": row['OBJECT_OWNER'],
-                     "OBJECT_PACKAGE": row['OBJECT_PACKAGE'],
-                     "OBJECT_NAME": row['OBJECT_NAME'].strip().upper()})
-        return unique_existing_objects
-
-    except KeyError as e:
-        print(f"Error: Missing expected column in file - {e}")
-        return []
-
-
-def _find_delta_of_missing_dependencies(all_unique_objects: list[dict],
-                                        unique_dependency_objects: list[dict]) -> list[dict]:
-    """
-    Finds dependency objects that are not present in the all_objects list.
-
-    Args:
-        all_unique_objects (list[dict]): A list of dictionaries representing existing objects.
-        unique_dependency_objects (list[dict]): A list of dependency objects to check.
-
-    Returns:
-        list[dict]: A list of missing dependency objects.
-    """
-    missing_dependencies = []
-
-    for dep in unique_dependency_objects:
-        found = False  # Track if this dependency is found
-
-        for obj in all_unique_objects:
-            # Skip if the object name matches but its status is "MISSING"
-            if obj["OBJECT_NAME"] == dep["DEPENDENCY_NAME"] and obj["STATUS"] == "MISSING":
-                found = True
-                break
-
-            # Check if the object fully matches an existing object
-            if (obj["OBJECT_NAME"] == dep["DEPENDENCY_NAME"]
-                    # and obj["OBJECT_OWNER"] == dep["DEPENDENCY_OWNER"]
-                    and obj["OBJECT_PACKAGE"] == dep["DEPENDENCY_PACKAGE"]):
-                found = True
-                break  # No need to check further, as it already exists
-
-        # If no match was found, add to missing dependencies
-        if not found:
-            missing_dependencies.append({"OWNER": dep["DEPENDENCY_OWNER"],
-                                         "PACKAGE": dep["DEPENDENCY_PACKAGE"],
-                                         "NAME": dep["DEPENDENCY_NAME"]})
-
-    return missing_dependencies
-
-
-def _filter_missing_status_dependencies(all_dependency_objects, all_missing_objects):
-    # Normalize all_missing_objects and convert to a set for quick lookup
-    missing_set = {
-        (obj['OBJECT_NAME'], obj['OBJECT_OWNER'], "" if obj['OBJECT_PACKAGE'] == "NONE" else obj['OBJECT_PACKAGE'])
-        for obj in all_missing_objects
-    }
-
-    # Filter out dependencies that exist in all_missing_objects
-    filtered_dependencies = [
-        obj for obj in all_dependency_objects
-        if (obj['DEPENDENCY_NAME'], obj['DEPENDENCY_OWNER'], obj['DEPENDENCY_PACKAGE']) not in missing_set
-    ]
-
-    return filtered_dependencies
-
-
-def _find_missing_dependencies() -> list:
-    logging.info(f"Starting: find missing dependencies")
-
-    dependencies_data = read_csv_file(get_dependency_file_path())
-    # ALL OBJECTS IN DEPENDENCY DATA
-    all_unique_existing_objects = _extract_unique_existing_objects(dependencies_data)
-
-    # ALL DEPENDENCY OBJECTS IN DEPENDENCY DATA
-    all_dependency_objects = _extract_unique_dependency_objects(dependencies_data)
-
-    # OBJECTS WITH MISSING STATUS IN DEPENDENCY DATA
-    all_missing_objects = _extract_object_with_missing_status(dependencies_data)
-
-    # REMOVE OBJECTS WITH MISSING STATUS FROM ALL DEPENDENCY OBJECTS
-    valid_dependency_objects_with_ok_status = _filter_missing_status_dependencies(all_dependency_objects,
-                                                                                  all_missing_objects)
-
-    remaining_objects = _find_delta_of_missing_dependencies(all_unique_existing_objects,
-                                                            valid_dependency_objects_with_ok_status)
-    logging.info(f"These the still missing objects {remaining_objects}")
-    return remaining_objects
-
-
 def _write_dependencies_file(dependencies_data: list[dict]):
     """
     Writes dependency data to a CSV file, ensuring the correct headers are added.
@@ -218,27 +45,29 @@ def _write_dependencies_file(dependencies_data: list[dict]):
 
 
 def find_all_dependencies_manager(db_pool: OracleDBConnectionPool,
-                                  database_environment: DatabaseEnvironment = DatabaseEnvironment.BANNER7):
-    while True:
-        # Step 1: find and write all current dependencies
-        dependencies_data = _extract_missing_dependencies_from_source_files(db_pool=db_pool)
-        _write_dependencies_file(dependencies_data=dependencies_data)
-
-        # Step 2: find missing dependencies by drill down
-        remaining_objects = _find_missing_dependencies()
-        if not remaining_objects:
-            logging.info("No remaining objects. Exiting loop.")
-            break
-
-        logging.info(f"Remaining functions to process: {remaining_objects}")
-
-        # Step 3: Update the complete procedures file
+                                  database_environment: DatabaseEnvironment = DatabaseEnvironment.BANNER7,
+                                  max_workers: int | None = SCAN_MAX_WORKERS,
+                                  chunk_size: int = SCAN_CHUNK_SIZE):
+    def extract_new_dependencies(dependency_index: DependencyIndex) -> list[dict]:
+        # Step 1: find all current dependencies of the sources not processed yet
+        return _extract_missing_dependencies_from_source_files(db_pool=db_pool,
+                                                               max_workers=max_workers,
+                                                               chunk_size=chunk_size,
+                                                               dependency_index=dependency_index)
+
+    def process_remaining_objects(remaining_objects: list[dict]):
+        # Step 2: Update the complete procedures file
         update_missing_procedures_to_add_manager(objects=remaining_objects, db_pool=db_pool,
                                                  database_environment=DatabaseEnvironment.BANNER7)
 
-        # Step 4: Find the source code for missing objects
+        # Step 3: Find the source code for missing objects
         create_source_code_manager(db_pool=db_pool)
 
+    new_dependencies_data = run_dependency_worklist(dependency_data=get_dependencies_data(),
+                                                    extract_new_dependencies=extract_new_dependencies,
+                                                    process_remaining_objects=process_remaining_objects)
+    _write_dependencies_file(dependencies_data=new_dependencies_data)
+
 
 def resolve_dependency(owners: list, obj_name: str) -> dict:
     """
@@ -262,13 +91,14 @@ def resolve_dependency(owners: list, obj_name: str) -> dict:
     return {"owner": None, "package": dependency_prefix or None, "name": dependency_name}
 
 
-def _is_dependency_object_exist(data: list[dict], object_owner: str, object_package: str, object_name: str) -> bool:
+def _is_dependency_object_exist(dependency_index: DependencyIndex, object_owner: str, object_package: str,
+                                object_name: str) -> bool:
     """
-    Checks if an object exists in the given list of dictionaries based on OBJECT_OWNER, OBJECT_PACKAGE, and OBJECT_NAME.
+    Checks if an object exists in the dependency data based on OBJECT_OWNER, OBJECT_PACKAGE, and OBJECT_NAME.
     If OBJECT_OWNER is empty ('') or None, it is ignored in the comparison.
 
     Args:
-        data (list[dict]): The list of dictionaries representing the CSV data.
+        dependency_index (DependencyIndex): The index of the CSV data.
         object_owner (str): The OBJECT_OWNER value to search for (ignored if empty or None).
         object_package (str): The OBJECT_PACKAGE value to search for.
         object_name (str): The OBJECT_NAME value to search for.
@@ -276,23 +106,26 @@ def _is_dependency_object_exist(data: list[dict], object_owner: str, object_pack
     Returns:
         bool: True if the object exists, False otherwise.
     """
-    if not data:
-        return False
+    return dependency_index.contains_object(owner=object_owner, package=object_package, name=object_name)
 
-    return any(
-        (not object_owner or not row.get("OBJECT_OWNER") or row["OBJECT_OWNER"] == object_owner) and
-        row.get("OBJECT_PACKAGE") == object_package and
-        row.get("OBJECT_NAME") == object_name
-        for row in data
-    )
 
-
-def _extract_missing_dependencies_from_source_files(db_pool: OracleDBConnectionPool) -> list[dict]:
+def _extract_missing_dependencies_from_source_files(db_pool: OracleDBConnectionPool,
+                                                    max_workers: int | None = SCAN_MAX_WORKERS,
+                                                    chunk_size: int = SCAN_CHUNK_SIZE,
+                                                    use_scan_cache: bool = True,
+                                                    dependency_index: DependencyIndex | None = None) -> list[dict]:
     """
     Extract dependencies from all SQL files in a source folder.
 
+    The files are scanned in parallel worker processes; the database lookups (owners and package existence)
+    are done once, here, for the whole batch. Rows are returned in file name order.
+
     Args:
-        source_folder (str): Path to the folder containing SQL files.
+        db_pool (OracleDBConnectionPool): Database connection pool.
+        max_workers (int | None): Worker processes used for scanning, 1 disables the process pool.
+        chunk_size (int): Files sent to a worker at a time.
+        use_scan_cache (bool): Reuse the scan results of files whose contents did not change.
+        dependency_index (DependencyIndex | None): Objects already processed, read from dependencies.csv when None.
 
     Returns:
         list[dict]: A list of dictionaries, each representing a dependency.
@@ -302,36 +135,55 @@ def _extract_missing_dependencies_from_source_files(db_pool: OracleDBConnectionP
     script_dir = os.path.dirname(os.path.abspath(__file__))
     source_folder = os.path.join(script_dir, get_source_code_folder())
     current_owners = get_all_current_owners(db_pool=db_pool)
-    dependencies_data = get_dependencies_data()
-
-    for filename in os.listdir(source_folder):
-        logging.info("Reading this source code file: %s", filename)
+    if dependency_index is None:
+        dependency_index = DependencyIndex(get_dependencies_data())
 
+    pending_filenames = []
+    for filename in sorted(os.listdir(source_folder)):
         # Determine the object type (PROCEDURE/FUNCTION) and object name
         object_owner = filename.split('.')[0]
         object_package = filename.split('.')[1]
         object_name = filename.split('.')[2]  # Assuming the file name is the object name
 
-        if _is_dependency_object_exist(data=dependencies_data,
+        if _is_dependency_object_exist(dependency_index=dependency_index,
                                        object_owner=object_owner,
                                        object_package=object_package,
                                        object_name=object_name):
             continue
 
-        if filename.endswith(".sql"):
-            file_path = os.path.join(source_folder, filename)
+        if filename.endswith(".sql") or filename.endswith(".missing"):
+            pending_filenames.append(filename)
+
+    sql_filenames = [filename for filename in pending_filenames if filename.endswith(".sql")]
+    logging.info(f"Scanning {len(sql_filenames)} source code files")
+    with ScanCache() if use_scan_cache else nullcontext() as scan_cache:
+        scan_results = scan_source_code_files(file_paths=[os.path.join(source_folder, filename)
+                                                          for filename in sql_filenames],
+                                              max_workers=max_workers,
+                                              chunk_size=chunk_size,
+                                              scan_cache=scan_cache)
+    scan_results_by_filename = dict(zip(sql_filenames, scan_results))
+    existing_packages = resolve_scanned_package_candidates(scan_results)
+
+    for filename in pending_filenames:
+        logging.info("Reading this source code file: %s", filename)
 
-            # Read the source code from the SQL file
-            with open(file_path, mode='r', encoding='utf-8') as file:
-                source_code_lines = file.readlines()
+        object_owner = filename.split('.')[0]
+        object_package = filename.split('.')[1]
+        object_name = filename.split('.')[2]
 
-            if source_code_lines:
+        if filename.endswith(".sql"):
+            scan_result = scan_results_by_filename[filename]
+
+            if scan_result["first_line"] is not None:
 
-                first_row_of_source_code_lines = source_code_lines[0].strip().upper()
+                first_row_of_source_code_lines = scan_result["first_line"]
                 object_type = "PROCEDURE" if "PROCEDURE" in first_row_of_source_code_lines else "FUNCTION"
 
                 # Extract dependencies
-                dependencies_map = extract_all_dependencies_from_one_source_code_data(source_code_lines)
+                dependencies_map = complete_source_code_dependencies(
+                    scanned_dependencies=scan_result["dependencies"],
+                    existing_packages=existing_packages)
 
                 # Store dependencies in a list of dictionaries
                 for dep_type, dep_names in dependencies_map.items():
@@ -362,11 +214,7 @@ def _extract_missing_dependencies_from_source_files(db_pool: OracleDBConnectionP
                     "DEPENDENCY_PACKAGE": None,
                     "DEPENDENCY_NAME": None,
                 })
-        elif filename.endswith(".missing"):
-
-            object_owner = filename.split('.')[0]
-            object_package = filename.split('.')[1]
-            object_name = filename.split('.')[2]  # Assuming the file name is the object name
+        else:
             logging.info(f"skipping empty sql file: {filename}, adding as missing dependency ")
             dependencies.append({
                 "STATUS": "MISSING",
@@ -1,7 +1,7 @@
 import logging
 import os
 
-from db.datasource.procedures_datasource import query_all_procedures_by_owner_and_package
+from db.datasource.procedures_datasource import query_missing_procedures_in_bulk
 from db.oracle_database_tools import OracleDBConnectionPool
 from files.b7_completed_procedures_file import get_completed_procedures_file_path
 from tools.file_tools import read_csv_file, write_csv_file
@@ -37,6 +37,7 @@ def find_missing_procedures_manager(db_pool: OracleDBConnectionPool):
 def _process_missing_procedures(db_pool: OracleDBConnectionPool, rows):
     """Process the data, querying missing procedures where needed."""
     processed_data = [['Owner', 'Package', 'Procedure', 'Function']]
+    missing_procedures = query_missing_procedures_in_bulk(db_pool=db_pool, rows=rows)
 
     for row in rows:
         owner = row["Owner"].strip()
@@ -44,8 +45,7 @@ def _process_missing_procedures(db_pool: OracleDBConnectionPool, rows):
         procedure = row["Procedure"].strip() if row['Procedure'] else None
 
         if not procedure:
-            procedures = query_all_procedures_by_owner_and_package(db_pool=db_pool, owner=owner, package=package)
-            for proc in procedures:
+            for proc in missing_procedures.get((owner, package), []):
                 processed_data.append([owner, package, proc, ""])
         else:
             processed_data.append([owner, package, procedure, ""])
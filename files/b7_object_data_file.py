@@ -5,19 +5,17 @@ from enum import Enum
 
 from db.database_properties import DatabaseEnvironment, DatabaseObject, TableObject
 from db.datasource.sequence_datasource import fetch_attributes_for_sequences
-from db.datasource.tables_datasource import fetch_table_columns_for_tables_grouped_by_schema_and_table_name, \
-    fetch_table_attributes_for_tables_grouped_by_schema_and_table_name, \
-    fetch_column_comments_for_tables_grouped_by_schema_and_table_name, \
-    fetch_full_indexes_for_tables_grouped_by_schema_and_table_name
-from db.datasource.triggers_datasource import fetch_triggers_elements_from_database, fetch_triggers_for_tables
+from db.datasource.tables_datasource import iterate_table_metadata_facets
+from db.datasource.triggers_datasource import fetch_triggers_elements_from_database
 from db.oracle_database_tools import OracleDBConnectionPool
 from files.b7_dependency_file import get_dependencies_data
 from files.mapping_file import MappingFileTypes, \
     get_filtered_mapping_data_by_type_and_is_mapped_for_banner7, \
     get_filtered_mapping_data_by_type_and_is_mapped_for_banner9
+from files.object_data_backend import open_object_data_store, get_object_data_reader, read_object_data, \
+    write_object_data
 from files.tables_file import get_tables_by_environment
 from tools.business_rules_tools import is_custom_table
-from tools.file_tools import read_json_file, write_json_file
 from tools.migration_tools import migrate_b7_table_to_b9, migrate_b9_table_to_b9
 
 OBJECT_DATA_JSON = "../workfiles/b7_output/object_data.json"
@@ -41,7 +39,7 @@ class ObjectOriginType(Enum):
 def create_object_base_manager():
     dependencies_data = get_dependencies_data()
     object_data = _convert_dependencies_file_to_json_object(dependencies_data=dependencies_data)
-    write_json_file(json_data=object_data, output_filename=get_object_data_file_path())
+    write_object_data(json_data=object_data, file_path=get_object_data_file_path())
 
 
 def _convert_dependencies_file_to_json_object(dependencies_data: list[dict]) -> dict:
@@ -109,125 +107,24 @@ def _convert_dependencies_file_to_json_object(dependencies_data: list[dict]) ->
     return json_data
 
 
-def add_new_object_to_data_file(environment: DatabaseEnvironment, new_json_data: dict):
+def add_new_object_to_data_file(environment: DatabaseEnvironment, new_json_data: dict | list | str):
     """
     Append metadata JSON to the specified environment in the input JSON file.
 
     :param environment: Environment name to append the metadata to
-    :param new_json_data: JSON string to append
+    :param new_json_data: object, list of objects or JSON string to append
     """
-    object_data_file = get_object_data_file_path()
-
-    # Ensure file exists and has valid JSON
-    if os.path.exists(object_data_file) and os.path.getsize(object_data_file) > 0:
-        with open(object_data_file, "r", encoding='utf-8') as file:
-            try:
-                data = json.load(file)
-            except json.JSONDecodeError:
-                data = {"root": []}
-    else:
-        data = {"root": []}
-
-    new_metadata = new_json_data if isinstance(new_json_data, dict) else json.loads(new_json_data)
-
-    # Find or create environment entry
-    for env in data["root"]:
-        if env.get("environment").upper() == environment.name:
-            if "objects" not in env:
-                env["objects"] = []
-            env["objects"].extend(new_metadata if isinstance(new_metadata, list) else [new_metadata])
-            break
-    else:
-        # Environment doesn't exist, add it
-        data["root"].append({
-            "environment": environment.value,
-            "objects": new_metadata if isinstance(new_metadata, list) else [new_metadata]
-        })
-
-    # Write back to the file
-    with open(object_data_file, "w", encoding='utf-8') as file:
-        json.dump(data, file, indent=4)
-
-
-def add_or_update_object_data_file(environment: DatabaseEnvironment, new_json_data: dict):
-    """
-    Add new metadata or update an existing object within the specified environment.
-
-    :param environment: Environment name to append/update metadata
-    :param new_json_data: JSON string to append/update
-    """
-    object_data_file = get_migrated_object_data_file_path()
-
-    # Ensure file exists and has valid JSON
-    if os.path.exists(object_data_file) and os.path.getsize(object_data_file) > 0:
-        with open(object_data_file, "r", encoding='utf-8') as file:
-            try:
-                data = json.load(file)
-            except json.JSONDecodeError:
-                data = {"root": []}
-    else:
-        data = {"root": []}
-
-    new_metadata = new_json_data if isinstance(new_json_data, dict) else json.loads(new_json_data)
-    object_name = new_metadata.get("name")  # Assuming objects have a unique "name" field
-
-    for env in data["root"]:
-        if env.get("environment").upper() == environment.name:
-            if "objects" not in env:
-                env["objects"] = []
-
-            # Check if object already exists, update it
-            for obj in env["objects"]:
-                if obj.get("name") == object_name:
-                    obj.update(new_metadata)
-                    break
-            else:
-                env["objects"].append(new_metadata)  # If not found, add new object
-            break
-    else:
-        # Environment doesn't exist, add it with the new object
-        data["root"].append({
-            "environment": environment.value,
-            "objects": [new_metadata]
-        })
-
-    # Write back to the file
-    with open(object_data_file, "w", encoding='utf-8') as file:
-        json.dump(data, file, indent=4)
+    with open_object_data_store(get_object_data_file_path()) as object_data_store:
+        object_data_store.add(environment=environment, new_json_data=new_json_data)
 
 
 def extract_table_unique_dependencies_types_from_data_file(
         environment: DatabaseEnvironment,
         table_object_type: TableObject
 ) -> [str]:
-    input_file_name = get_object_data_file_path()
-    try:
-        with open(input_file_name, 'r') as file:
-            data = json.load(file)
-
-        # Ensure root exists and is a list
-        if 'root' not in data or not isinstance(data['root'], list):
-            raise ValueError("Invalid JSON structure: 'root' key not found or not a list.")
-
-        dependency_names = set()
-        # Iterate through root objects and filter by environment
-        for item in data['root']:
-            if item.get('environment').upper() == environment.name:
-                objects = item.get('objects', [])
-                for obj in objects:
-                    object_type = obj.get("type")
-                    if object_type in ["TABLE"]:
-                        dependencies = obj.get(table_object_type.value, {})
-                        if dependencies:
-                            for dependency in dependencies:
-                                dependency_names.add(dependency.get('name').upper())
-
-        return sorted(dependency_names)
-
-    except FileNotFoundError:
-        raise FileNotFoundError(f"The file '{input_file_name}' was not found.")
-    except json.JSONDecodeError:
-        raise ValueError(f"The file '{input_file_name}' is not a valid JSON file.")
+    object_data_reader = get_object_data_reader(get_object_data_file_path())
+    return sorted(object_data_reader.get_table_dependency_names(environment=environment,
+                                                               table_object_type=table_object_type))
 
 
 def extract_unique_dependencies_types_from_data_file(
@@ -247,39 +144,12 @@ def extract_unique_dependencies_types_from_data_file(
     Returns:
         list: A sorted list of unique dependency names.
     """
-    input_file_name = get_object_data_file_path()
-    try:
-        with open(input_file_name, 'r') as file:
-            data = json.load(file)
-
-        # Ensure root exists and is a list
-        if 'root' not in data or not isinstance(data['root'], list):
-            raise ValueError("Invalid JSON structure: 'root' key not found or not a list.")
-
-        dependency_names = set()
-        # Iterate through root objects and filter by environment
-        for item in data['root']:
-            if item.get('environment').upper() == environment.name:
-                objects = item.get('objects', [])
-                for obj in objects:
-                    object_type = obj.get("type")
-                    if object_type in ["PROCEDURE", "FUNCTION"]:
-                        dependencies = obj.get('dependencies', {})
-                        dependency_objects = dependencies.get(database_object_type.value, [])
-                        for dependency in dependency_objects:
-                            # Apply custom filter if the object type is TABLE
-                            if database_object_type.name.upper() == DatabaseObject.TABLE.name and is_custom:
-                                if dependency.get('custom') == is_custom:
-                                    dependency_names.add(dependency.get('name').upper())
-                            else:
-                                dependency_names.add(dependency.get('name').upper())
-
-        return dependency_names
-
-    except FileNotFoundError:
-        raise FileNotFoundError(f"The file '{input_file_name}' was not found.")
-    except json.JSONDecodeError:
-        raise ValueError(f"The file '{input_file_name}' is not a valid JSON file.")
+    object_data_reader = get_object_data_reader(get_object_data_file_path())
+    # Apply custom filter if the object type is TABLE
+    is_custom_filter = True if database_object_type == DatabaseObject.TABLE and is_custom else None
+    return object_data_reader.get_dependency_names(environment=environment,
+                                                  dependency_kind=database_object_type.value,
+                                                  is_custom=is_custom_filter)
 
 
 def extract_triggers_from_database(db_pool: OracleDBConnectionPool, unique_triggers: [str]):
@@ -372,57 +242,30 @@ def add_new_environment(new_environment: DatabaseEnvironment):
 
 def get_object_data_mapped_by_names_by_environment_and_type(database_environment: DatabaseEnvironment,
                                                             object_data_type: str = "table") -> dict:
-    object_data_dictionary = {}
-    object_data = get_migrated_object_data()  # Fetch JSON data
-
-    for one_root in object_data.get("root", []):  # Ensure "root" exists
-        if one_root.get("environment") == database_environment.value:
-            for one_object in one_root.get("objects", []):
-                if one_object.get("type") == object_data_type:
-                    name = one_object.get("name")
-                    if name:
-                        object_data_dictionary[name] = one_object
-
-    return object_data_dictionary
+    object_data_reader = get_object_data_reader(get_migrated_object_data_file_path())
+    return object_data_reader.get_objects_mapped_by_name(environment=database_environment,
+                                                        object_type=object_data_type)
 
 
 def get_object_data_mapped_by_names_by_environment(
         database_environment: DatabaseEnvironment) -> dict:
-    object_data_dictionary = {}
-    object_data = get_object_data()  # Fetch JSON data
-
-    for one_root in object_data.get("root", []):  # Ensure "root" exists
-        if one_root.get("environment") == database_environment.value:
-            for one_object in one_root.get("objects", []):
-                name = one_object.get("name")
-                if name:
-                    object_data_dictionary[name] = one_object
-
-    return object_data_dictionary
+    object_data_reader = get_object_data_reader(get_object_data_file_path())
+    return object_data_reader.get_objects_mapped_by_name(environment=database_environment)
 
 
 def get_object_data_names_by_environment(
         database_environment: DatabaseEnvironment = DatabaseEnvironment.BANNER7
 ) -> list[str]:
-    object_data_names = []
-    object_data = get_object_data()  # Fetch JSON data
-
-    for one_root in object_data.get("root", []):  # Ensure "root" exists
-        if one_root.get("environment") == database_environment.value:
-            for one_object in one_root.get("objects", []):  # Ensure "objects" exists
-                object_data_names.append(one_object.get("name", ""))  # Default to empty string if "name" is missing
-
-    return object_data_names
+    object_data_reader = get_object_data_reader(get_object_data_file_path())
+    return object_data_reader.get_names(environment=database_environment)
 
 
 def get_object_data() -> dict:
-    config_file = get_object_data_file_path()
-    return read_json_file(config_file)
+    return read_object_data(get_object_data_file_path())
 
 
 def get_migrated_object_data() -> dict:
-    config_file = get_migrated_object_data_file_path()
-    return read_json_file(config_file)
+    return read_object_data(get_migrated_object_data_file_path())
 
 
 def get_object_data_file_path() -> str:
@@ -458,52 +301,55 @@ def get_trigger_names_and_status(triggers: dict, schema: str, table_name: str):
     ]
 
 
-def extract_table_metadata_from_database(db_pool: OracleDBConnectionPool, table_names: [str]):
+def extract_table_metadata_from_database(db_pool: OracleDBConnectionPool,
+                                         table_names: [str],
+                                         max_workers: int | None = None) -> list[dict]:
     """
-    Generate a JSON file containing metadata for given tables across all accessible schemas.
+    Build the metadata of the given tables across all accessible schemas.
 
-    :param connection:
+    :param db_pool:
     :param table_names: List of table names (e.g., ["SZTBLAN", "ANOTHER_TABLE"])
-    :param output_file: The output file to save the generated JSON
+    :param max_workers: concurrent metadata queries, defaults to the pool size
+    :return: one metadata entry per table and schema
     """
-    # Fetch metadata
-    columns = fetch_table_columns_for_tables_grouped_by_schema_and_table_name(db_pool=db_pool, table_names=table_names)
-    attributes = fetch_table_attributes_for_tables_grouped_by_schema_and_table_name(db_pool=db_pool,
-                                                                                    table_names=table_names)
-    comments = fetch_column_comments_for_tables_grouped_by_schema_and_table_name(db_pool=db_pool,
-                                                                                 table_names=table_names)
-    indexes = fetch_full_indexes_for_tables_grouped_by_schema_and_table_name(db_pool=db_pool, table_names=table_names)
-    triggers = fetch_triggers_for_tables(db_pool=db_pool, table_names=table_names)
-    # sequences = fetch_sequences_names_for_tables(db_pool=db_pool, table_names=table_names)
+    return list(iterate_table_metadata_from_database(db_pool=db_pool, table_names=table_names,
+                                                     max_workers=max_workers))
 
-    # Construct JSON structure
-    table_metadata = []
+
+def iterate_table_metadata_from_database(db_pool: OracleDBConnectionPool,
+                                         table_names: [str],
+                                         max_workers: int | None = None):
+    """
+    Yields the metadata entry of every table as soon as its chunk is fetched (see iterate_table_metadata_facets).
+    """
+    for facets in iterate_table_metadata_facets(db_pool=db_pool, table_names=table_names, max_workers=max_workers):
+        yield from _build_table_metadata_entries(**facets)
+
+
+def _build_table_metadata_entries(columns: dict, attributes: dict, comments: dict, indexes: dict, triggers: dict):
     for schema in columns.keys():
         for table_name in columns[schema].keys():
-            raw_comments = comments[schema].get(table_name, {})
+            raw_comments = comments.get(schema, {}).get(table_name, {})
             transformed_comments = [
                 {"name": column_name, "comment": comment}
                 for column_name, comment in raw_comments.items()
             ]
-
-            table_entry = {
+            yield {
                 "name": table_name,
                 "type": "TABLE",
                 "owner": schema,
                 "custom": is_custom_table(table_name),
                 "columns": columns[schema].get(table_name, []),
-                "attributes": attributes[schema].get(table_name, {}),
+                "attributes": attributes.get(schema, {}).get(table_name, {}),
                 "comments": transformed_comments,
-                "indexes": indexes[schema].get(table_name, []),
+                "indexes": indexes.get(schema, {}).get(table_name, []),
                 "sequences": [],
                 "triggers": get_trigger_names_and_status(triggers=triggers, schema=schema, table_name=table_name)
             }
-            table_metadata.append(table_entry)
-
-    return json.dumps(table_metadata, indent=4)
 
 
-def add_base_tables_manager(db_pool: OracleDBConnectionPool, database_environment: DatabaseEnvironment):
+def add_base_tables_manager(db_pool: OracleDBConnectionPool, database_environment: DatabaseEnvironment,
+                            max_workers: int | None = None):
     logging.info("Starting: add base tables to object data")
     unique_tables = extract_unique_dependencies_types_from_data_file(
         database_object_type=DatabaseObject.TABLE,
@@ -511,13 +357,15 @@ def add_base_tables_manager(db_pool: OracleDBConnectionPool, database_environmen
         is_custom=False)
 
     if unique_tables:
-        json_attributes_from_tables = extract_table_metadata_from_database(db_pool=db_pool, table_names=unique_tables)
+        json_attributes_from_tables = extract_table_metadata_from_database(db_pool=db_pool, table_names=unique_tables,
+                                                                           max_workers=max_workers)
         add_new_object_to_data_file(environment=database_environment, new_json_data=
         json_attributes_from_tables)
         logging.info(f"Added {len(unique_tables)} base tables to object data")
 
     else:
         logging.info("No unique base tables found. Skipping db operations.")
+    db_pool.log_metrics(stage="add base tables to object data")
     logging.info("Ending: add base tables to object data")
 
 
@@ -538,11 +386,13 @@ def add_custom_sequences_manager(db_pool: OracleDBConnectionPool, database_envir
 
     else:
         logging.info("No unique sequences found. Skipping db operations.")
+    db_pool.log_metrics(stage="add custom sequences to object data")
     logging.info("Ending: add custom sequences to object data")
 
 
 def add_custom_tables_manager(db_pool: OracleDBConnectionPool,
-                              database_environment: DatabaseEnvironment):
+                              database_environment: DatabaseEnvironment,
+                              max_workers: int | None = None):
     logging.info("Starting: add custom tables to object data")
 
     unique_tables = extract_unique_dependencies_types_from_data_file(database_object_type=DatabaseObject.TABLE,
@@ -553,11 +403,13 @@ def add_custom_tables_manager(db_pool: OracleDBConnectionPool,
         unique_tables.update(additional_tables)
 
     if unique_tables:
-        json_attributes_from_tables = extract_table_metadata_from_database(db_pool=db_pool, table_names=unique_tables)
+        json_attributes_from_tables = extract_table_metadata_from_database(db_pool=db_pool, table_names=unique_tables,
+                                                                           max_workers=max_workers)
         add_new_object_to_data_file(database_environment, new_json_data=
         json_attributes_from_tables)
     else:
         logging.info("No unique custom tables found. Skipping db operations.")
+    db_pool.log_metrics(stage="add custom tables to object data")
     logging.info("Ending: add custom tables to object data")
 
 
@@ -576,40 +428,43 @@ def add_custom_triggers_manager(db_pool: OracleDBConnectionPool):
         json_attributes_from_triggers)
     else:
         print("No unique triggers found. Skipping db operations.")
+    db_pool.log_metrics(stage="add custom triggers to object data")
     logging.info("Ending: add custom tables to object data")
 
 
 def migrate_banner7_tables_manager(database_environment: DatabaseEnvironment):
     filtered_migration_data = get_filtered_mapping_data_by_type_and_is_mapped_for_banner7(
         mapping_object_types=MappingFileTypes.TABLE)
-    for one_migration_data in filtered_migration_data:
-        b7_table_name = one_migration_data.get("B7_NOMBRE", '')
-        b9_paquete = one_migration_data.get("B9_PAQUETE", '')
-        b9_nombre = one_migration_data.get("B9_NOMBRE")
-        b9_esquema = one_migration_data.get("B9_ESQUEMA")
+    object_data = get_object_data()
+    with open_object_data_store(get_migrated_object_data_file_path()) as object_data_store:
+        for one_migration_data in filtered_migration_data:
+            b7_table_name = one_migration_data.get("B7_NOMBRE", '')
+            b9_paquete = one_migration_data.get("B9_PAQUETE", '')
+            b9_nombre = one_migration_data.get("B9_NOMBRE")
+            b9_esquema = one_migration_data.get("B9_ESQUEMA")
 
-        object_data = get_object_data()
-        converted_table_data = migrate_b7_table_to_b9(json_data=object_data,
-                                                      b7_table_name=b7_table_name,
-                                                      b9_table_name=b9_nombre,
-                                                      b9_owner=b9_esquema)
+            converted_table_data = migrate_b7_table_to_b9(json_data=object_data,
+                                                          b7_table_name=b7_table_name,
+                                                          b9_table_name=b9_nombre,
+                                                          b9_owner=b9_esquema)
 
-        add_or_update_object_data_file(new_json_data=converted_table_data,
-                                       environment=database_environment)
+            object_data_store.upsert(new_json_data=converted_table_data,
+                                     environment=database_environment)
 
 
 def migrate_banner9_tables_manager(database_environment: DatabaseEnvironment):
     filtered_migration_data = get_filtered_mapping_data_by_type_and_is_mapped_for_banner9(
         mapping_object_types=MappingFileTypes.TABLE)
 
-    for one_migration_data in filtered_migration_data:
-        b9_nombre = one_migration_data.get("B9_NOMBRE")
-        b9_esquema = one_migration_data.get("B9_ESQUEMA")
+    object_data = get_object_data()
+    with open_object_data_store(get_migrated_object_data_file_path()) as object_data_store:
+        for one_migration_data in filtered_migration_data:
+            b9_nombre = one_migration_data.get("B9_NOMBRE")
+            b9_esquema = one_migration_data.get("B9_ESQUEMA")
 
-        object_data = get_object_data()
-        converted_table_data = migrate_b9_table_to_b9(json_data=object_data,
-                                                      b9_table_name=b9_nombre,
-                                                      b9_owner=b9_esquema)
+            converted_table_data = migrate_b9_table_to_b9(json_data=object_data,
+                                                          b9_table_name=b9_nombre,
+                                                          b9_owner=b9_esquema)
 
-        add_or_update_object_data_file(new_json_data=converted_table_data,
-                                       environment=database_environment)
+            object_data_store.upsert(new_json_data=converted_table_data,
+                                     environment=database_environment)
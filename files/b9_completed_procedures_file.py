@@ -2,13 +2,11 @@ import logging
 import os
 from typing import List, Dict
 
+from db.catalog_snapshot import get_catalog_snapshot
 from db.database_properties import DatabaseEnvironment
-from db.datasource.functions_datasource import get_public_package_object_owner, get_independent_object_owners, \
-    get_private_package_object_owner
-from db.datasource.procedures_datasource import query_sources
 from db.oracle_database_tools import OracleDBConnectionPool
+from db.source_mirror import query_sources_bulk
 from files.source_code_file import get_source_code_folder
-from tools.common_tools import get_all_current_owners, split_table_name_into_package_and_table_name
 from tools.file_tools import read_csv_file, write_csv_file
 from tools.package_tools import get_packages_as_list
 
@@ -72,22 +70,21 @@ def _find_missing_data_to_add(objects: list[dict],
     :param db_pool:
     """
     hidden_dependencies = []
+    catalog_snapshot = get_catalog_snapshot(db_pool=db_pool)
     for one_object in objects:
         logging.info(f"Processing function: {one_object}")
         if one_object["PACKAGE"]:
-            result = get_public_package_object_owner(object_dict=one_object, db_pool=db_pool)
+            result = catalog_snapshot.get_public_package_object_owner(object_dict=one_object)
 
             if result is None:
-                result = get_private_package_object_owner(object_dict=one_object, db_pool=db_pool)
+                result = catalog_snapshot.get_private_package_object_owner(object_dict=one_object)
 
             if result is None:
                 logging.info(f"Could not retrieve owner/package/procedure for {one_object}")
 
                 # check if package is really the owner
-                all_owners = get_all_current_owners(db_pool=db_pool)
-                # retrieve the "package" value
-                supposed_owner, object_name = split_table_name_into_package_and_table_name(obj_name=one_object)
-                if supposed_owner in all_owners:
+                supposed_owner, object_name = one_object["PACKAGE"], one_object["NAME"]
+                if catalog_snapshot.is_owner(supposed_owner):
                     hidden_dependencies.append([supposed_owner, None, object_name, None])
                     logging.info(f"Success! it was the owner {one_object}")
                 continue
@@ -102,7 +99,7 @@ def _find_missing_data_to_add(objects: list[dict],
                 hidden_dependencies.append(
                     {"Owner": owner, "Package": None, "Procedure": procedure, "Function": None})
             else:
-                result = get_independent_object_owners(one_object, database_environment)
+                result = catalog_snapshot.get_independent_object_owners(object_dict=one_object)
                 logging.info(f"non-packaged object: {result}")
                 if result is None:
                     logging.info(f"Could not retrieve owner/procedure for {one_object}")
@@ -249,20 +246,24 @@ def _write_extracted_data_to_source_code_files(extracted_data: dict, source_code
 
 
 def create_source_code_manager(db_pool: OracleDBConnectionPool,
-                               database_environment: DatabaseEnvironment):
+                               database_environment: DatabaseEnvironment,
+                               max_workers: int | None = None):
     """Read, process, and write extracted source code.
     :param database_environment:
     :param db_pool:
+    :param max_workers: concurrent source code queries, defaults to the pool size
     """
     logging.info("Starting: extract source code")
     script_dir = os.path.dirname(os.path.abspath(__file__))
     completed_procedures_csv_file_path = os.path.join(script_dir, get_completed_procedures_file_path())
     csv_data = read_csv_file(completed_procedures_csv_file_path)
     grouped_data = _group_list_of_objects_by_packages_from_csv_data(csv_data=csv_data)
-    mapped_extracted_data = _group_source_code_maped_by_package_and_name(db_pool=db_pool, data=grouped_data)
+    mapped_extracted_data = _group_source_code_maped_by_package_and_name(db_pool=db_pool, data=grouped_data,
+                                                                         max_workers=max_workers)
     grouped_data_by_filename = _create_data_process_by_filename(grouped_data, mapped_extracted_data)
     source_code_folder = os.path.join(script_dir, get_source_code_folder(database_environment))
     _write_extracted_data_to_source_code_files(grouped_data_by_filename, source_code_folder)
+    db_pool.log_metrics(stage="extract source code")
     logging.info("Ending: extract source code")
 
 
@@ -301,8 +302,42 @@ def _create_data_process_by_filename(grouped_data: List[dict], mapped_extracted_
     return {"source_codes": source_codes}
 
 
-def _group_source_code_maped_by_package_and_name(db_pool: OracleDBConnectionPool, data: dict) -> dict:
+def _get_source_code_key(owner: str, package: str | None, procedure: str | None, function: str | None) -> tuple | None:
+    """(OWNER, TYPE, NAME) of the ALL_SOURCE object holding the source code of a completed procedures row."""
+    if package:
+        return owner, "PACKAGE BODY", package
+    if procedure:
+        return owner, "PROCEDURE", procedure
+    if function:
+        return owner, "FUNCTION", function
+    return None
+
+
+def _fetch_source_codes(db_pool: OracleDBConnectionPool, data: dict, max_workers: int | None = None) -> dict:
+    """
+    Fetches the source code of every package and standalone object in the grouped data from the source
+    mirror, downloading the changed ones in bulk up to max_workers queries at a time.
+    """
+    source_code_keys = []
+    for package, rows in data.items():
+        if package:
+            source_code_keys.append(_get_source_code_key(rows[0]['Owner'].strip(), package, None, None))
+            continue
+        for row in rows:
+            procedure = row['Procedure'].strip() if row['Procedure'] else None
+            function = row['Function'].strip() if row['Function'] else None
+            source_code_key = _get_source_code_key(row['Owner'].strip(), None, procedure, function)
+            if source_code_key:
+                source_code_keys.append(source_code_key)
+
+    logging.info(f"Fetching the source code of {len(source_code_keys)} objects")
+    return query_sources_bulk(db_pool=db_pool, objects=source_code_keys, max_workers=max_workers)
+
+
+def _group_source_code_maped_by_package_and_name(db_pool: OracleDBConnectionPool, data: dict,
+                                                 max_workers: int | None = None) -> dict:
     object_map = {}  # New: Will store objects with (package, object_name) keys
+    source_codes = _fetch_source_codes(db_pool=db_pool, data=data, max_workers=max_workers)
 
     for package, rows in data.items():
         try:
@@ -311,11 +346,7 @@ def _group_source_code_maped_by_package_and_name(db_pool: OracleDBConnectionPool
                 owner = rows[0]['Owner'].strip()
                 logging.info(f"Processing package: Owner={owner}, Package={package}")
 
-                package_source_code = query_sources(
-                    owner=owner,
-                    package=package,
-                    db_pool=db_pool
-                )
+                package_source_code = source_codes.get(_get_source_code_key(owner, package, None, None), [])
 
                 # Get all objects from the package body
                 package_body_objects = _extract_all_package_body_objects_from_source_code_data(
@@ -353,12 +384,7 @@ def _group_source_code_maped_by_package_and_name(db_pool: OracleDBConnectionPool
                         f"Object={object_name}, Type={object_type}"
                     )
 
-                    source_code_lines = query_sources(
-                        owner=owner,
-                        procedure=procedure,
-                        function=function,
-                        db_pool=db_pool
-                    )
+                    source_code_lines = source_codes.get(_get_source_code_key(owner, None, procedure, function), [])
 
                     # Create object entry
                     obj = {
@@ -379,8 +405,10 @@ def _group_source_code_maped_by_package_and_name(db_pool: OracleDBConnectionPool
     return object_map  # Returns a dict with (package, object_name) keys
 
 
-def _process_source_code_extraction(db_pool: OracleDBConnectionPool, data: dict) -> dict:
+def _process_source_code_extraction(db_pool: OracleDBConnectionPool, data: dict,
+                                    max_workers: int | None = None) -> dict:
     source_codes = []
+    fetched_source_codes = _fetch_source_codes(db_pool=db_pool, data=data, max_workers=max_workers)
 
     for package, rows in data.items():
         try:
@@ -390,25 +418,19 @@ def _process_source_code_extraction(db_pool: OracleDBConnectionPool, data: dict)
 
             package_source_code = None
             if package:
-                package_source_code = query_sources(
-                    owner=owner,
-                    package=package,
-                    db_pool=db_pool
-                )
+                package_source_code = fetched_source_codes.get(_get_source_code_key(owner, package, None, None), [])
 
             for row in rows:
                 procedure = row['Procedure'].strip()
                 function = row['Function'].strip() if row['Function'] else None
                 source_code_lines = package_source_code
                 if not package:
+                    # standalone objects are grouped together, each one keeps its own owner
+                    owner = row['Owner'].strip()
                     logging.info(
                         f"Extracting individual source code: Owner={owner}, Procedure={procedure}, Function={function}")
-                    source_code_lines = query_sources(
-                        owner=owner,
-                        procedure=procedure,
-                        function=function,
-                        db_pool=db_pool
-                    )
+                    source_code_lines = fetched_source_codes.get(
+                        _get_source_code_key(owner, None, procedure, function), [])
 
                 specific_source_code = _process_source_code(source_code_lines, package, procedure, function)
 
@@ -534,8 +556,9 @@ def get_completed_procedures() -> list[dict]:
 
 
 def create_package_specification_source_code_manager(db_pool: OracleDBConnectionPool,
-                                                     database_environment: DatabaseEnvironment):
-    """Read, process, and write extracted source code."""
+                                                     database_environment: DatabaseEnvironment,
+                                                     max_workers: int | None = None):
+    """Read, process, and write extracted source code, up to max_workers queries at a time."""
     logging.info("Starting: extract package specification source code")
     script_dir = os.path.dirname(os.path.abspath(__file__))
     completed_procedures_csv_file_path = os.path.join(script_dir, get_completed_procedures_file_path())
@@ -549,7 +572,8 @@ def create_package_specification_source_code_manager(db_pool: OracleDBConnection
             package_names.add(package_name)
 
     ## Extract package specification code:
-    all_package_records = get_packages_as_list(package_owner="UVM", package_names=list(package_names), db_pool=db_pool)
+    all_package_records = get_packages_as_list(package_owner="UVM", package_names=sorted(package_names), db_pool=db_pool,
+                                               max_workers=max_workers)
 
     # Initialize the extracted_data dictionary
     extracted_data = {'source_codes': []}
@@ -580,6 +604,7 @@ def create_package_specification_source_code_manager(db_pool: OracleDBConnection
     source_code_folder = os.path.join(script_dir, get_source_code_folder(database_environment))
     _write_extracted_data_to_source_code_files(extracted_data, source_code_folder)
 
+    db_pool.log_metrics(stage="extract package specification source code")
     logging.info("Ending: extract source code")
 
 
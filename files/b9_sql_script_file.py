@@ -5,8 +5,8 @@ from enum import Enum
 from typing import Dict, Optional
 
 from db.database_properties import DatabaseEnvironment, DatabaseObject
-from db.datasource.packages_datasource import get_package_specification, get_package_body
-from db.oracle_database_tools import OracleDBConnectionPool
+from db.recorded_pool import get_connection_pool
+from db.source_mirror import get_source_mirror, get_package_specification, get_package_body
 from files.b7_sql_script_file import get_scripts_folder_path
 from files.object_addons_file import read_custom_data, GrantType, ObjectAddonType
 from files.object_data_file import ObjectDataTypes, \
@@ -1069,7 +1069,14 @@ def build_create_package_script_data(requested_environment: DatabaseEnvironment)
     object_data = get_migrated_object_data_mapped_by_names_by_environment_and_type(
         database_environment=requested_environment,
         object_data_type=ObjectDataTypes.PACKAGE.value)
-    db_pool_banner9 = OracleDBConnectionPool(database_name=DatabaseEnvironment.BANNER9)
+    db_pool_banner9 = get_connection_pool(database_name=DatabaseEnvironment.BANNER9)
+
+    # bring every package into the source mirror with one DDL time check
+    get_source_mirror(db_pool_banner9).refresh(
+        db_pool=db_pool_banner9,
+        source_objects=[(value.get("owner"), object_type, value.get("name"))
+                        for value in object_data.values()
+                        for object_type in ("PACKAGE", "PACKAGE BODY")])
 
     scripts = []
     source_folder_path = get_source_code_folder(database_environment=requested_environment)
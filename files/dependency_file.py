@@ -1,4 +1,7 @@
 import logging
+import time
+from collections import defaultdict
+from typing import Callable
 
 
 class DependencyFile:
@@ -9,6 +12,31 @@ class DependencyFile:
         )
 
 
+class DependencyIndex:
+    """
+    Hash index over dependency rows, keyed by (PACKAGE, NAME) with the owners found for each. Works on
+    dependencies.csv rows, looking at the OBJECT_* columns.
+    """
+
+    def __init__(self, dependency_data: list[dict] | None = None):
+        self._owners_by_package_and_name = defaultdict(set)  # (PACKAGE, NAME) -> {OWNER}
+        for row in dependency_data or []:
+            self.add(row)
+
+    def add(self, row: dict):
+        self._owners_by_package_and_name[(row.get("OBJECT_PACKAGE"), row.get("OBJECT_NAME"))].add(
+            row.get("OBJECT_OWNER"))
+
+    def contains_object(self, owner: str, package: str, name: str) -> bool:
+        """
+        Checks if an object exists by OBJECT_OWNER, OBJECT_PACKAGE and OBJECT_NAME.
+        An empty owner, given or stored, matches any owner.
+        """
+        owners = self._owners_by_package_and_name.get((package, name))
+        if not owners:
+            return False
+        return not owner or owner in owners or "" in owners or None in owners
+
 
 def is_ok_object(object: dict, object_name: str = "STATUS") -> bool:
     return object[object_name] == "OK"
@@ -25,108 +53,136 @@ def is_object_dependency_procedure_or_function(object: dict, object_name: str =
             or object[object_name].strip() == 'PROCEDURE')
 
 
-def is_object_need_process(object: dict, object_name: str, unique_names: list[dict]):
-    return object[object_name].strip().upper() not in unique_names
-
-
-def extract_object_with_missing_status(dependencies_data: list[dict]) -> list[dict]:
-    object_with_missing_status = []
-    try:
-        for row in dependencies_data:
-            if not is_ok_object(row):
-                object_with_missing_status.append({
-                    "STATUS": row["STATUS"],
-                    "OBJECT_OWNER": row['OBJECT_OWNER'],
-                    "OBJECT_PACKAGE": row['OBJECT_PACKAGE'],
-                    "OBJECT_NAME": row['OBJECT_NAME'].strip().upper()}
-                )
-        return object_with_missing_status
-    except KeyError as e:
-        print(f"Error: Missing expected column in file - {e}")
-        return []
+def _as_csv_row(row: dict) -> dict:
+    """Normalizes an in-memory row the way a round trip through dependencies.csv does (None -> '')."""
+    return {key: "" if value is None else value for key, value in row.items()}
 
 
-def extract_unique_existing_objects(dependency_data: list[dict]) -> list[dict]:
+class DependencyWorklist:
     """
-    Reads a file with dependency information and extracts unique existing function names.
+    Missing dependencies of the procedures and functions, computed incrementally over rows kept in memory:
+    the dependencies that are procedures or functions, leaving out the ones listed with a status other than
+    OK and the ones that already have a row of their own (same package, or listed as MISSING).
 
-    Parameters:
-        file_path (str): The path to the dependencies file.
-
-    Returns:
-        list: A sorted list of unique existing function names.
+    Rows are added as they are discovered. The objects still to resolve are kept in a pending queue that
+    only changes for the names touched by the new rows, and every object is handed out at most once.
     """
-    unique_existing_objects = []
-    unique_object_names = []
 
-    try:
+    def __init__(self, dependency_data: list[dict] | None = None):
+        self.rows = []
+        self.new_rows = []
+        self.dependency_index = DependencyIndex()
+        self._unique_objects = {}  # OBJECT_NAME -> (STATUS, OBJECT_PACKAGE), first procedure/function row
+        self._missing_status_keys = set()  # (NAME, OWNER, PACKAGE) of rows with a status other than OK
+        self._dependency_names = set()
+        self._pending = {}  # DEPENDENCY_NAME -> dependency object, in discovery order
+        self._dispatched = set()
+        for row in dependency_data or []:
+            self._add_row(_as_csv_row(row))
+
+    def add_new_rows(self, dependency_data: list[dict]):
         for row in dependency_data:
-            if (is_object_procedure_or_function_or_none(object=row, object_name="OBJECT_TYPE")
-                    and is_object_need_process(object=row, object_name="OBJECT_NAME",
-                                               unique_names=unique_object_names)):
-                unique_object_names.append(row['OBJECT_NAME'].strip().upper())
-                unique_existing_objects.append(
-                    {"STATUS": row['STATUS'],
-                     "OBJECT_OWNER": row['OBJECT_OWNER'],
-                     "OBJECT_PACKAGE": row['OBJECT_PACKAGE'],
-                     "OBJECT_NAME": row['OBJECT_NAME'].strip().upper()})
-        return unique_existing_objects
-
-    except KeyError as e:
-        print(f"Error: Missing expected column in file - {e}")
-        return []
-
-
-def find_delta_of_missing_dependencies(all_unique_objects: list[dict],
-                                       unique_dependency_objects: list[dict]) -> list[dict]:
+            csv_row = _as_csv_row(row)
+            self._add_row(csv_row)
+            self.new_rows.append(csv_row)
+
+    def _add_row(self, row: dict):
+        self.rows.append(row)
+        self.dependency_index.add(row)
+
+        object_name = row['OBJECT_NAME'].strip().upper()
+        if not is_ok_object(row):
+            missing_key = (object_name, row['OBJECT_OWNER'],
+                           "" if row['OBJECT_PACKAGE'] == "NONE" else row['OBJECT_PACKAGE'])
+            self._missing_status_keys.add(missing_key)
+            pending_dependency = self._pending.get(object_name)
+            if pending_dependency and self._get_dependency_key(pending_dependency) == missing_key:
+                del self._pending[object_name]
+
+        if (is_object_procedure_or_function_or_none(object=row, object_name="OBJECT_TYPE")
+                and object_name not in self._unique_objects):
+            self._unique_objects[object_name] = (row['STATUS'], row['OBJECT_PACKAGE'])
+            pending_dependency = self._pending.get(object_name)
+            if pending_dependency and self._is_resolved(pending_dependency):
+                del self._pending[object_name]
+
+        if is_object_dependency_procedure_or_function(object=row, object_name="DEPENDENCY_TYPE"):
+            dependency_name = row['DEPENDENCY_NAME'].strip().upper()
+            if dependency_name not in self._dependency_names:
+                self._dependency_names.add(dependency_name)
+                dependency = {"STATUS": row["STATUS"],
+                              "DEPENDENCY_OWNER": row['DEPENDENCY_OWNER'],
+                              "DEPENDENCY_PACKAGE": row['DEPENDENCY_PACKAGE'],
+                              "DEPENDENCY_NAME": dependency_name}
+                if (self._get_dependency_key(dependency) not in self._missing_status_keys
+                        and not self._is_resolved(dependency)):
+                    self._pending[dependency_name] = dependency
+
+    @staticmethod
+    def _get_dependency_key(dependency: dict) -> tuple:
+        return dependency['DEPENDENCY_NAME'], dependency['DEPENDENCY_OWNER'], dependency['DEPENDENCY_PACKAGE']
+
+    def _is_resolved(self, dependency: dict) -> bool:
+        unique_object = self._unique_objects.get(dependency["DEPENDENCY_NAME"])
+        if unique_object is None:
+            return False
+        status, package = unique_object
+        return status == "MISSING" or package == dependency["DEPENDENCY_PACKAGE"]
+
+    def get_remaining_objects(self) -> list[dict]:
+        """Dependencies still without a row of their own ({OWNER, PACKAGE, NAME}), except those already handed out."""
+        return [{"OWNER": dependency["DEPENDENCY_OWNER"],
+                 "PACKAGE": dependency["DEPENDENCY_PACKAGE"],
+                 "NAME": dependency["DEPENDENCY_NAME"]}
+                for dependency_name, dependency in self._pending.items()
+                if dependency_name not in self._dispatched]
+
+    def take_remaining_objects(self) -> list[dict]:
+        remaining_objects = self.get_remaining_objects()
+        self._dispatched.update(remaining_object["NAME"] for remaining_object in remaining_objects)
+        return remaining_objects
+
+
+def run_dependency_worklist(dependency_data: list[dict],
+                            extract_new_dependencies: Callable[[DependencyIndex], list[dict]],
+                            process_remaining_objects: Callable[[list[dict]], None]) -> list[dict]:
     """
-    Finds dependency objects that are not present in the all_objects list.
+    Finds the dependency closure: scans the sources not yet in the dependency data, hands the dependencies
+    that have no source yet to process_remaining_objects (which extracts their sources) and repeats
+    until no new object shows up.
 
     Args:
-        all_unique_objects (list[dict]): A list of dictionaries representing existing objects.
-        unique_dependency_objects (list[dict]): A list of dependency objects to check.
+        dependency_data (list[dict]): Rows already in dependencies.csv.
+        extract_new_dependencies: Returns the rows of the source files not present in the given index.
+        process_remaining_objects: Extracts the sources of the given {"OWNER", "PACKAGE", "NAME"} objects.
 
     Returns:
-        list[dict]: A list of missing dependency objects.
+        list[dict]: The new dependency rows, to be written once.
     """
-    missing_dependencies = []
-
-    for dep in unique_dependency_objects:
-        found = False  # Track if this dependency is found
-
-        for obj in all_unique_objects:
-            # Skip if the object name matches but its status is "MISSING"
-            if obj["OBJECT_NAME"] == dep["DEPENDENCY_NAME"] and obj["STATUS"] == "MISSING":
-                found = True
-                break
-
-            # Check if the object fully matches an existing object
-            if (obj["OBJECT_NAME"] == dep["DEPENDENCY_NAME"]
-                    # and obj["OBJECT_OWNER"] == dep["DEPENDENCY_OWNER"]
-                    and obj["OBJECT_PACKAGE"] == dep["DEPENDENCY_PACKAGE"]):
-                found = True
-                break  # No need to check further, as it already exists
-
-        # If no match was found, add to missing dependencies
-        if not found:
-            missing_dependencies.append({"OWNER": dep["DEPENDENCY_OWNER"],
-                                         "PACKAGE": dep["DEPENDENCY_PACKAGE"],
-                                         "NAME": dep["DEPENDENCY_NAME"]})
-
-    return missing_dependencies
-
-
-def filter_missing_status_dependencies(all_dependency_objects, all_missing_objects):
-    # Normalize all_missing_objects and convert to a set for quick lookup
-    missing_set = {
-        (obj['OBJECT_NAME'], obj['OBJECT_OWNER'], "" if obj['OBJECT_PACKAGE'] == "NONE" else obj['OBJECT_PACKAGE'])
-        for obj in all_missing_objects
-    }
-
-    # Filter out dependencies that exist in all_missing_objects
-    filtered_dependencies = [
-        obj for obj in all_dependency_objects
-        if (obj['DEPENDENCY_NAME'], obj['DEPENDENCY_OWNER'], obj['DEPENDENCY_PACKAGE']) not in missing_set
-    ]
-
-    return filtered_dependencies
\ No newline at end of file
+    logging.info("Starting: dependency worklist")
+    start_time = time.perf_counter()
+    worklist = DependencyWorklist(dependency_data)
+    iterations = 0
+    discovered_objects = 0
+    scanned_objects = 0
+
+    while True:
+        iterations += 1
+        new_dependencies = extract_new_dependencies(worklist.dependency_index)
+        worklist.add_new_rows(new_dependencies)
+        scanned_objects += len({(row["OBJECT_OWNER"], row["OBJECT_PACKAGE"], row["OBJECT_NAME"])
+                                for row in new_dependencies})
+
+        remaining_objects = worklist.take_remaining_objects()
+        if not remaining_objects:
+            logging.info("No remaining objects. Exiting loop.")
+            break
+
+        logging.info(f"Iteration {iterations}, remaining functions to process: {remaining_objects}")
+        discovered_objects += len(remaining_objects)
+        process_remaining_objects(remaining_objects)
+
+    logging.info(f"Ending: dependency worklist, {iterations} iterations, {scanned_objects} objects scanned, "
+                 f"{discovered_objects} objects discovered, {len(worklist.new_rows)} new rows, "
+                 f"{time.perf_counter() - start_time:.2f}s")
+    return worklist.new_rows
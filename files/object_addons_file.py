@@ -1,8 +1,10 @@
+import copy
 import os
+import re
 from enum import Enum
 from typing import Optional
 
-from tools.common_tools import refactor_tagged_text, extract_object_structure
+from tools.common_tools import extract_object_structure
 from tools.file_tools import read_json_file
 
 
@@ -28,10 +30,7 @@ class GrantType(Enum):
 
 OBJECT_ADDONS_DATA_JSON = "../config/object_addons.json"
 
-
-def get_object_addons_data() -> dict:
-    config_file = get_object_addons_file_path()
-    return read_json_file(config_file)
+_registry = {}  # file path -> ((mtime, size), ObjectAddonRegistry)
 
 
 def get_object_addons_file_path() -> str:
@@ -39,167 +38,216 @@ def get_object_addons_file_path() -> str:
     return os.path.join(script_dir, OBJECT_ADDONS_DATA_JSON)
 
 
-def _get_custom_comments(json_data, b9_table_name: str):
-    comments = []
-    fields = json_data["root"]["comments"]
-    for field in fields:
-        # Replace "{table}" in the field name with the table_name
-        field_name = field["name"].replace("{table}", b9_table_name)
-        # Add the comment to the comments dictionary
-        comments.append({
-            "name": field_name, "comment": field["comment"]
-        })
-    # Return the comments structure
-    return {"comments": comments}
-
-
-def _get_custom_table_columns(json_data: dict, b9_table_name: str) -> dict:
-    fields = json_data["root"]["columns"]
-
-    columns = [
-        {
-            "name": field["name"].replace("{table}", b9_table_name),
-            "type": field["type"],
-            "length": field["length"],
-            "precision": field["precision"] if field["precision"] is not None else None,
-            "scale": field["scale"] if field["scale"] is not None else None,
-            "nullable": field["nullable"]
-        }
-        for field in fields
-    ]
-
-    return {"columns": columns}
-
+class _Template:
+    """
+    An addon template split once into its literal text and its {tag} placeholders, so rendering is a
+    single join instead of one str.replace per tag. Placeholders that are not among the tags are kept as text.
+    """
+    __slots__ = ("_parts",)
 
-def _get_custom_sequences(json_data: dict, b9_table_name: str):
-    fields = json_data["root"]["sequences"]
-    extracted_table_info = extract_object_structure(object_name=b9_table_name)
-    prefix = extracted_table_info.get("prefix")
-    base = extracted_table_info.get("base")
-    sequence_name = f"{prefix}SE{base}"
+    def __init__(self, text: str, tags: tuple[str, ...]):
+        pattern = "(" + "|".join(re.escape("{" + tag + "}") for tag in tags) + ")"
+        self._parts = tuple((True, part[1:-1]) if index % 2 else (False, part)
+                            for index, part in enumerate(re.split(pattern, text)) if part)
 
-    sequence = [{
-        "name": sequence_name,
-        "increment_by": field["increment_by"],
-        "start_with": field["start_with"],
-        "max_value": field["max_value"],
-        "cycle": field["cycle"],
-        "cache": field["cache"],
-    } for field in fields]
+    def render(self, **values: str) -> str:
+        return "".join(values[part] if is_tag else part for is_tag, part in self._parts)
 
-    return sequence
 
+class ObjectAddonRegistry:
+    """
+    The object addons configuration ({"root": {...}}) with every template compiled once. Rendered addons are
+    memoized per (addon type, grant type, owner, object) and returned as copies, so callers can change them.
+    """
 
-def get_custom_indexes() -> dict:
-    addons_data = get_object_addons_data()
-    return _get_custom_indexes(addons_data)
-
-
-def _get_custom_indexes(json_data: dict):
-    indexes = json_data["root"]["indexes"]
-    transformed_indexes = []
-
-    for index in indexes:
-        transformed_index = {
-            "name": index["name"],
-            "uniqueness": index["uniqueness"],
-            "constraint_type": index["constraint_type"],
-            "tablespace": "DEVELOPMENT",
-            "columns": [
-                {
-                    "column_name": column["column_name"],
-                    "column_position": column["column_position"],
-                    "descend": column["descend"],
-                    "index_type": column["index_type"],
-                    "column_expression": column["column_expression"]
-                }
-                for column in index["columns"]
-            ]
+    def __init__(self, json_data: dict):
+        root = json_data["root"]
+        self._data = root
+        self._results = {}  # (ObjectAddonType, GrantType, owner, object name) -> rendered addon
+        self._comment_names = [_Template(field["name"], ("table",)) for field in root.get("comments", [])]
+        self._column_names = [_Template(field["name"], ("table",)) for field in root.get("columns", [])]
+        # section -> key (synonym action or grant type) -> template; a section without a template only fails
+        # when that template is rendered
+        self._templates = {
+            "synonym": {action: _Template(template, ("object",))
+                        for action, template in root.get("synonym", {}).items()},
+            "setup_synonym": {action: _Template(template, ("object", "owner"))
+                              for action, template in root.get("setup_synonym", {}).items()},
+            "grants": self._compile_scripts(root, "grants", ("owner", "prefix", "base", "schema")),
+            "setup_grants": self._compile_scripts(root, "setup_grants", ("owner", "name", "schema")),
+            "revokes": self._compile_scripts(root, "revokes", ("owner", "prefix", "base", "schema")),
         }
-        transformed_indexes.append(transformed_index)
-
-    return {"indexes": transformed_indexes}
-
-
-def _get_custom_setup_grants(json_data: dict, object_owner: str, object_name: str, grant_type: GrantType):
-    # Navigate to the grant type within the JSON structure
-    fields = json_data["root"]["setup_grants"][grant_type.value]
-    script_template = fields["scripts"]
-    schemas = fields["schema"]
-
-    grants = [
-        script_template.replace("{owner}", object_owner)
-        .replace("{name}", object_name)
-        .replace("{schema}", schema)
-        for schema in schemas
-        if object_owner.lower() != schema.lower()
-    ]
-
-    return {"grants": grants}
-
-
-def _get_custom_grants(json_data: dict, object_owner: str, object_name: str, grant_type: GrantType):
-    # Navigate to the grant type within the JSON structure
-    fields = json_data["root"]["grants"][grant_type.value]
-    script_template = fields["scripts"]
-    schemas = fields["schema"]
-
-    extracted_table_info = extract_object_structure(object_name=object_name)
-    prefix = extracted_table_info.get("prefix")
-    base = extracted_table_info.get("base")
-    owner = object_owner
-
-    grants = [
-        script_template.replace("{owner}", owner).replace("{prefix}", prefix).replace("{base}", base).replace(
-            "{schema}", schema)
-        for schema in schemas
-    ]
-
-    return {"grants": grants}
-
-
-def _get_custom_revokes(json_data: dict, object_owner: str, object_name: str, grant_type: GrantType):
-    # Navigate to the grant type within the JSON structure
-    fields = json_data["root"]["revokes"][grant_type.value]
-    script_template = fields["scripts"]  # The inner block template
-    schemas = fields["schema"]
-
-    extracted_table_info = extract_object_structure(object_name=object_name)
-    prefix = extracted_table_info.get("prefix")
-    base = extracted_table_info.get("base")
-    owner = object_owner
-
-    # Generate all inner blocks for each schema
-    inner_blocks = []
-    for schema in schemas:
-        inner_block = script_template.replace("{owner}", owner) \
-            .replace("{prefix}", prefix) \
-            .replace("{base}", base) \
-            .replace("{schema}", schema)
-        inner_blocks.append(inner_block)
-
-    # Combine all inner blocks with newlines and wrap in outer BEGIN/END
-    combined_script = "BEGIN\n" + "\n".join(inner_blocks) + "\nEND;"
-
-    return {"revokes": combined_script}
-
-
-def _get_custom_synonym(json_data: dict, b9_table_name: str) -> str:
-    return json_data["root"]["synonym"]["create"].replace("{object}", b9_table_name)
-
-
-def _get_custom_setup_synonym(json_data: dict, b9_owner_name: str, b9_table_name: str) -> str:
-    return json_data["root"]["setup_synonym"]["create"].replace("{object}", b9_table_name).replace("{owner}",
-                                                                                                   b9_owner_name)
+        self._triggers = [(_Template(field["name"], ("prefix", "base")),
+                           _Template(field["table"], ("owner", "table")),
+                           _Template(field["body"], ("prefix", "base", "table", "owner")))
+                          for field in root.get("triggers", [])]
+
+    @staticmethod
+    def _compile_scripts(root: dict, section: str, tags: tuple[str, ...]) -> dict:
+        return {grant_type: _Template(fields["scripts"], tags)
+                for grant_type, fields in root.get(section, {}).items() if "scripts" in fields}
+
+    def _get_template(self, section: str, key: str) -> _Template:
+        """
+        Raises:
+            ValueError: If the section of object_addons.json has no template for the key.
+        """
+        template = self._templates[section].get(key)
+        if template is None:
+            raise ValueError(f"No '{key}' script under '{section}' in {OBJECT_ADDONS_DATA_JSON}")
+        return template
+
+    def _get_custom_comments(self, b9_table_name: str) -> dict:
+        comments = [{"name": name.render(table=b9_table_name), "comment": field["comment"]}
+                    for name, field in zip(self._comment_names, self._data["comments"])]
+        return {"comments": comments}
+
+    def _get_custom_table_columns(self, b9_table_name: str) -> dict:
+        columns = [
+            {
+                "name": name.render(table=b9_table_name),
+                "type": field["type"],
+                "length": field["length"],
+                "precision": field["precision"],
+                "scale": field["scale"],
+                "nullable": field["nullable"]
+            }
+            for name, field in zip(self._column_names, self._data["columns"])
+        ]
+        return {"columns": columns}
+
+    def _get_custom_sequences(self, b9_table_name: str) -> list:
+        extracted_table_info = extract_object_structure(object_name=b9_table_name)
+        sequence_name = f"{extracted_table_info.get('prefix')}SE{extracted_table_info.get('base')}"
+        return [{
+            "name": sequence_name,
+            "increment_by": field["increment_by"],
+            "start_with": field["start_with"],
+            "max_value": field["max_value"],
+            "cycle": field["cycle"],
+            "cache": field["cache"],
+        } for field in self._data["sequences"]]
+
+    def _get_custom_indexes(self) -> dict:
+        transformed_indexes = []
+        for index in self._data["indexes"]:
+            transformed_indexes.append({
+                "name": index["name"],
+                "uniqueness": index["uniqueness"],
+                "constraint_type": index["constraint_type"],
+                "tablespace": "DEVELOPMENT",
+                "columns": [
+                    {
+                        "column_name": column["column_name"],
+                        "column_position": column["column_position"],
+                        "descend": column["descend"],
+                        "index_type": column["index_type"],
+                        "column_expression": column["column_expression"]
+                    }
+                    for column in index["columns"]
+                ]
+            })
+        return {"indexes": transformed_indexes}
+
+    def _get_custom_setup_grants(self, object_owner: str, object_name: str, grant_type: GrantType) -> dict:
+        script_template = self._get_template("setup_grants", grant_type.value)
+        grants = [script_template.render(owner=object_owner, name=object_name, schema=schema)
+                  for schema in self._data["setup_grants"][grant_type.value]["schema"]
+                  if object_owner.lower() != schema.lower()]
+        return {"grants": grants}
+
+    def _render_schema_scripts(self, section: str, object_owner: str, object_name: str,
+                               grant_type: GrantType) -> list[str]:
+        script_template = self._get_template(section, grant_type.value)
+        extracted_table_info = extract_object_structure(object_name=object_name)
+        prefix = extracted_table_info.get("prefix")
+        base = extracted_table_info.get("base")
+        return [script_template.render(owner=object_owner, prefix=prefix, base=base, schema=schema)
+                for schema in self._data[section][grant_type.value]["schema"]]
+
+    def _get_custom_grants(self, object_owner: str, object_name: str, grant_type: GrantType) -> dict:
+        return {"grants": self._render_schema_scripts(section="grants", object_owner=object_owner,
+                                                      object_name=object_name, grant_type=grant_type)}
+
+    def _get_custom_revokes(self, object_owner: str, object_name: str, grant_type: GrantType) -> dict:
+        inner_blocks = self._render_schema_scripts(section="revokes", object_owner=object_owner,
+                                                   object_name=object_name, grant_type=grant_type)
+        # Combine all inner blocks with newlines and wrap in outer BEGIN/END
+        return {"revokes": "BEGIN\n" + "\n".join(inner_blocks) + "\nEND;"}
+
+    def _get_custom_triggers(self, b9_table_name: str) -> list:
+        table_info = extract_object_structure(object_name=b9_table_name)
+        prefix = table_info.get("prefix")
+        base = table_info.get("base")
+        return [
+            {
+                "name": name.render(prefix=prefix, base=base),
+                "table": table.render(owner="UVM", table=b9_table_name),
+                "event": field["event"],
+                "body": body.render(prefix=prefix, base=base, table=b9_table_name, owner="UVM"),
+            }
+            for (name, table, body), field in zip(self._triggers, self._data["triggers"])
+        ]
+
+    def _render(self, object_addon_type: ObjectAddonType, b9_object_name: str, b9_object_owner: Optional[str],
+                grant_type: Optional[GrantType]):
+        # Route to the appropriate renderer based on the addon type
+        if object_addon_type == ObjectAddonType.COLUMNS:
+            return self._get_custom_table_columns(b9_table_name=b9_object_name)
+        elif object_addon_type == ObjectAddonType.COMMENTS:
+            return self._get_custom_comments(b9_table_name=b9_object_name)
+        elif object_addon_type == ObjectAddonType.INDEXES:
+            return self._get_custom_indexes()
+        elif object_addon_type == ObjectAddonType.SEQUENCES:
+            return self._get_custom_sequences(b9_table_name=b9_object_name)
+        elif object_addon_type == ObjectAddonType.TRIGGERS:
+            return self._get_custom_triggers(b9_table_name=b9_object_name)
+        elif object_addon_type == ObjectAddonType.GRANTS:
+            return self._get_custom_grants(object_name=b9_object_name, grant_type=grant_type,
+                                           object_owner=b9_object_owner)
+        elif object_addon_type == ObjectAddonType.SETUP_GRANTS:
+            return self._get_custom_setup_grants(object_name=b9_object_name, grant_type=grant_type,
+                                                 object_owner=b9_object_owner)
+        elif object_addon_type == ObjectAddonType.REVOKES:
+            return self._get_custom_revokes(object_name=b9_object_name, grant_type=grant_type,
+                                            object_owner=b9_object_owner)
+        elif object_addon_type == ObjectAddonType.SYNONYMS:
+            return self._get_template("synonym", "create").render(object=b9_object_name)
+        elif object_addon_type == ObjectAddonType.SETUP_SYNONYMS:
+            return self._get_template("setup_synonym", "create").render(object=b9_object_name, owner=b9_object_owner)
+        elif object_addon_type == ObjectAddonType.DROP_SYNONYMS:
+            return self._get_template("synonym", "drop").render(object=b9_object_name)
+        else:
+            raise ValueError(f"Unsupported addon type: {object_addon_type}")
+
+    def get(self, object_addon_type: ObjectAddonType, b9_object_name: str, b9_object_owner: Optional[str] = None,
+            grant_type: Optional[GrantType] = None):
+        key = (object_addon_type, grant_type, b9_object_owner, b9_object_name)
+        result = self._results.get(key)
+        if result is None:
+            result = self._render(object_addon_type=object_addon_type, b9_object_name=b9_object_name,
+                                  b9_object_owner=b9_object_owner, grant_type=grant_type)
+            self._results[key] = result
+        return copy.deepcopy(result)
+
+
+def get_object_addon_registry() -> ObjectAddonRegistry:
+    """Returns the registry of the object addons file, loaded once and reloaded only when the file changes."""
+    config_file = get_object_addons_file_path()
+    file_stat = os.stat(config_file)
+    file_stamp = (file_stat.st_mtime_ns, file_stat.st_size)
 
+    cached = _registry.get(config_file)
+    if cached is not None and cached[0] == file_stamp:
+        return cached[1]
 
-def _get_custom_drop_setup_synonym(json_data: dict, b9_owner_name: str, b9_table_name: str) -> str:
-    return json_data["root"]["setup_synonym"]["drop"].replace("{object}", b9_table_name).replace("{owner}",
-                                                                                                 b9_owner_name)
+    registry = ObjectAddonRegistry(read_json_file(config_file))
+    _registry[config_file] = (file_stamp, registry)
+    return registry
 
 
-def _get_custom_drop_synonym(json_data: dict, b9_table_name: str) -> str:
-    return json_data["root"]["synonym"]["drop"].replace("{object}", b9_table_name)
+def get_custom_indexes() -> dict:
+    return get_object_addon_registry().get(object_addon_type=ObjectAddonType.INDEXES, b9_object_name="")
 
 
 def get_custom_grants_multiple_objects(
@@ -225,64 +273,11 @@ def get_custom_grants_multiple_objects(
     return {"grants": all_grants}
 
 
-def _get_custom_triggers(json_data: dict, b9_table_name: str):
-    fields = json_data["root"]["triggers"]
-    table_info = extract_object_structure(object_name=b9_table_name)
-    prefix = table_info.get("prefix")
-    base = table_info.get("base")
-
-    triggers = [
-        {
-            "name": refactor_tagged_text(original_text=field["name"],
-                                         tags=["{prefix}", "{base}"],
-                                         replacement_text=[prefix, base]),
-            "table": refactor_tagged_text(original_text=field["table"],
-                                          tags=["{owner}", "{table}"],
-                                          replacement_text=["UVM", b9_table_name]),
-            "event": field["event"],
-            "body": refactor_tagged_text(original_text=field["body"],
-                                         tags=["{prefix}", "{base}", "{table}", "{owner}"],
-                                         replacement_text=[prefix, base, b9_table_name, "UVM"]),
-        }
-        for field in fields
-    ]
-    return triggers
-
-
 def read_custom_data(object_addon_type: ObjectAddonType, b9_object_name: str, b9_object_owner: Optional[str] = None,
                      grant_type: Optional[GrantType] = None
                      ):
     """
-    Generalized function to read custom table data based on addon type.
+    Generalized function to read custom table data based on addon type, served from the addon registry.
     """
-    json_custom_data = get_object_addons_data()
-
-    # Route to the appropriate function based on the addon type
-    if object_addon_type == ObjectAddonType.COLUMNS:
-        return _get_custom_table_columns(json_data=json_custom_data, b9_table_name=b9_object_name)
-    elif object_addon_type == ObjectAddonType.COMMENTS:
-        return _get_custom_comments(json_data=json_custom_data, b9_table_name=b9_object_name)
-    elif object_addon_type == ObjectAddonType.INDEXES:
-        return _get_custom_indexes(json_data=json_custom_data)
-    elif object_addon_type == ObjectAddonType.SEQUENCES:
-        return _get_custom_sequences(json_data=json_custom_data, b9_table_name=b9_object_name)
-    elif object_addon_type == ObjectAddonType.TRIGGERS:
-        return _get_custom_triggers(json_data=json_custom_data, b9_table_name=b9_object_name)
-    elif object_addon_type == ObjectAddonType.GRANTS:
-        return _get_custom_grants(json_data=json_custom_data, object_name=b9_object_name, grant_type=grant_type,
-                                  object_owner=b9_object_owner)
-    elif object_addon_type == ObjectAddonType.SETUP_GRANTS:
-        return _get_custom_setup_grants(json_data=json_custom_data, object_name=b9_object_name, grant_type=grant_type,
-                                        object_owner=b9_object_owner)
-    elif object_addon_type == ObjectAddonType.REVOKES:
-        return _get_custom_revokes(json_data=json_custom_data, object_name=b9_object_name, grant_type=grant_type,
-                                   object_owner=b9_object_owner)
-    elif object_addon_type == ObjectAddonType.SYNONYMS:
-        return _get_custom_synonym(json_data=json_custom_data, b9_table_name=b9_object_name)
-    elif object_addon_type == ObjectAddonType.SETUP_SYNONYMS:
-        return _get_custom_setup_synonym(json_data=json_custom_data, b9_table_name=b9_object_name,
-                                         b9_owner_name=b9_object_owner)
-    elif object_addon_type == ObjectAddonType.DROP_SYNONYMS:
-        return _get_custom_drop_synonym(json_data=json_custom_data, b9_table_name=b9_object_name)
-    else:
-        raise ValueError(f"Unsupported addon type: {object_addon_type}")
+    return get_object_addon_registry().get(object_addon_type=object_addon_type, b9_object_name=b9_object_name,
+                                           b9_object_owner=b9_object_owner, grant_type=grant_type)
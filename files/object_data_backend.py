@@ -0,0 +1,85 @@
+import logging
+import os
+import threading
+
+from files.object_data_sqlite_store import SQLiteObjectDataStore
+from files.object_data_store import ObjectDataIndex, ObjectDataStore, get_object_data_index
+from tools.file_tools import read_json_file, write_json_file
+from tools.object_model_tools import encode_model
+
+OBJECT_DATA_BACKEND_VARIABLE = "LAUREATE_OBJECT_DATA_BACKEND"
+OBJECT_DATA_BACKENDS = ("json", "sqlite")
+
+_readers = {}  # (SQLite file path, thread id) -> SQLiteObjectDataStore
+
+
+def get_object_data_backend() -> str:
+    """
+    The object data backend given by the LAUREATE_OBJECT_DATA_BACKEND environment variable: "json" (default)
+    keeps each object data file as it is, "sqlite" keeps it in a SQLite file next to it.
+
+    Raises:
+        ValueError: If the backend is unknown.
+    """
+    backend = os.environ.get(OBJECT_DATA_BACKEND_VARIABLE, "json").lower()
+    if backend not in OBJECT_DATA_BACKENDS:
+        raise ValueError(f"Unknown object data backend: {backend}")
+    return backend
+
+
+def get_sqlite_file_path(file_path: str) -> str:
+    """The SQLite file of an object data JSON file, e.g. object_data.json -> object_data.sqlite."""
+    return f"{os.path.splitext(file_path)[0]}.sqlite"
+
+
+def open_object_data_store(file_path: str) -> ObjectDataStore | SQLiteObjectDataStore:
+    """The store the managers add and upsert objects into, committed when its with block ends."""
+    if get_object_data_backend() == "sqlite":
+        return SQLiteObjectDataStore(get_sqlite_file_path(file_path))
+    return ObjectDataStore(file_path)
+
+
+def get_object_data_reader(file_path: str) -> ObjectDataIndex | SQLiteObjectDataStore:
+    """
+    The queries over an object data file: its cached ObjectDataIndex or, with the SQLite backend, a
+    connection to its SQLite file opened once per thread.
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+        ValueError: If the backend is unknown or the JSON file is invalid.
+    """
+    if get_object_data_backend() == "json":
+        return get_object_data_index(file_path)
+
+    database_file_path = get_sqlite_file_path(file_path)
+    if not os.path.exists(database_file_path):
+        raise FileNotFoundError(f"The file '{database_file_path}' was not found.")
+    reader_key = (database_file_path, threading.get_ident())
+    reader = _readers.get(reader_key)
+    if reader is None:
+        reader = SQLiteObjectDataStore(database_file_path)
+        _readers[reader_key] = reader
+    return reader
+
+
+def read_object_data(file_path: str) -> dict:
+    """
+    The whole object data, {"root": [{"environment", "objects"}]}, from the file or its SQLite file.
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+    """
+    if get_object_data_backend() == "json":
+        return read_json_file(file_path)
+    return get_object_data_reader(file_path).get_data()
+
+
+def write_object_data(json_data: dict, file_path: str):
+    """Replaces the object data of the file or its SQLite file; its objects can be model objects."""
+    if get_object_data_backend() == "json":
+        write_json_file(json_data=json_data, output_filename=file_path, default=encode_model)
+        return
+
+    with SQLiteObjectDataStore(get_sqlite_file_path(file_path)) as object_data_store:
+        written = object_data_store.load_data(json_data)
+    logging.info(f"{written} objects written to {get_sqlite_file_path(file_path)}")
@@ -1,23 +1,25 @@
 import json
 import logging
 import os
+from contextlib import nullcontext
 from enum import Enum
 
 from db.database_properties import DatabaseEnvironment, DatabaseObject, TableObject
 from db.datasource.sequence_datasource import fetch_attributes_for_sequences
-from db.datasource.tables_datasource import fetch_table_columns_for_tables_grouped_by_schema_and_table_name, \
-    fetch_table_attributes_for_tables_grouped_by_schema_and_table_name, \
-    fetch_column_comments_for_tables_grouped_by_schema_and_table_name, \
-    fetch_full_indexes_for_tables_grouped_by_schema_and_table_name
-from db.datasource.triggers_datasource import fetch_triggers_elements_from_database, fetch_triggers_for_tables
+from db.datasource.tables_datasource import iterate_table_metadata_facets
+from db.datasource.triggers_datasource import fetch_triggers_elements_from_database
 from db.oracle_database_tools import OracleDBConnectionPool
 from files.b9_dependency_file import get_dependencies_data
 from files.object_addons_file import read_custom_data, GrantType, ObjectAddonType
+from files.object_data_backend import open_object_data_store, get_object_data_reader, read_object_data, \
+    write_object_data
+from files.object_data_sqlite_store import SQLiteObjectDataStore
+from files.object_data_store import ObjectDataStore, ObjectDataIndex
 from files.tables_file import get_tables_by_environment
 from tools.business_rules_tools import is_custom_table
 from tools.common_tools import ObjectOriginType, ObjectTargetType
-from tools.file_tools import read_json_file, write_json_file
 from tools.migration_tools import migrate_b9_table_to_b9, migrate_sequence_to_b9, migrate_trigger_to_b9
+from tools.object_model_tools import MigrationObject, DependencyRef, TableMeta, ColumnMeta
 
 OBJECT_DATA_JSON = "../workfiles/b9_output/object_data.json"
 MIGRATED_OBJECT_DATA_JSON = "../workfiles/b9_output/migrated_object_data.json"
@@ -35,10 +37,11 @@ class ObjectDataTypes(Enum):
 def create_object_base_manager():
     dependencies_data = get_dependencies_data()
     object_data = _convert_dependencies_file_to_json_object(dependencies_data=dependencies_data)
-    write_json_file(json_data=object_data, output_filename=get_object_data_file_path())
+    write_object_data(json_data=object_data, file_path=get_object_data_file_path())
 
 
 def _convert_dependencies_file_to_json_object(dependencies_data: list[dict]) -> dict:
+    """The object data of the dependencies, its objects are MigrationObject until they are written."""
     # Initialize the structure for the JSON output
     json_data = {
         "root": [
@@ -69,173 +72,54 @@ def _convert_dependencies_file_to_json_object(dependencies_data: list[dict]) ->
 
         # Initialize the object if it doesn't exist
         if obj_name not in objects_dict:
-            objects_dict[obj_name] = {
-                "object_status": obj_status,
-                "origin": ObjectOriginType.DEPENDENCY.value,
-                "type": obj_type,
-                "owner": obj_owner,
-                "package": obj_package,
-                "name": obj_name,
-                "dependencies": {
-                    "tables": [],
-                    "functions": [],
-                    "sequences": [],
-                    "procedures": []
-                }
-            }
+            objects_dict[obj_name] = MigrationObject(object_status=obj_status,
+                                                     origin=ObjectOriginType.DEPENDENCY.value,
+                                                     type=obj_type,
+                                                     owner=obj_owner,
+                                                     package=obj_package,
+                                                     name=obj_name)
+        migration_object = objects_dict[obj_name]
 
         # Add the dependency name to the appropriate list
         if dep_type == "TABLE":
-            if is_custom_table(dep_name):
-                objects_dict[obj_name]["dependencies"]["tables"].append(
-                    {"type": "TABLE", "package": None, "name": dep_name, "custom": True, "local": None,
-                     "deployment": None, "object_status": None})
-            else:
-                objects_dict[obj_name]["dependencies"]["tables"].append(
-                    {"type": "TABLE", "package": None, "name": dep_name, "custom": False, "local": None,
-                     "deployment": None, "object_status": None})
+            migration_object.add_dependency("tables", DependencyRef(type="TABLE", name=dep_name,
+                                                                    custom=is_custom_table(dep_name)))
         elif dep_type == "LOCAL_FUNCTION":
-            objects_dict[obj_name]["dependencies"]["functions"].append(
-                {"type": "FUNCTION", "package": None, "name": dep_name, "custom": None, "local": True,
-                 "deployment": None, "object_status": None})
+            migration_object.add_dependency("functions", DependencyRef(type="FUNCTION", name=dep_name, local=True))
         elif dep_type == "FUNCTION":
-            objects_dict[obj_name]["dependencies"]["functions"].append(
-                {"type": "FUNCTION", "package": dep_package, "name": dep_name, "custom": None, "local": False,
-                 "deployment": None, "object_status": obj_status})
+            migration_object.add_dependency("functions", DependencyRef(type="FUNCTION", package=dep_package,
+                                                                       name=dep_name, local=False,
+                                                                       object_status=obj_status))
         elif dep_type == "SEQUENCE":
-            objects_dict[obj_name]["dependencies"]["sequences"].append(
-                {"type": "SEQUENCE", "package": None, "name": dep_name, "custom": None, "local": None,
-                 "deployment": "external", "object_status": None})
+            migration_object.add_dependency("sequences", DependencyRef(type="SEQUENCE", name=dep_name,
+                                                                       deployment="external"))
         elif dep_type == "PROCEDURE":
-            objects_dict[obj_name]["dependencies"]["procedures"].append(
-                {"type": "PROCEDURE", "package": dep_package, "name": dep_name, "custom": None, "local": None,
-                 "deployment": None, "object_status": obj_status})
+            migration_object.add_dependency("procedures", DependencyRef(type="PROCEDURE", package=dep_package,
+                                                                        name=dep_name, object_status=obj_status))
     # Convert the dictionary to a list and add it to json_data
-
     json_data["root"][0]["objects"] = list(objects_dict.values())
 
     return json_data
 
 
-def add_new_object_to_data_file(environment: DatabaseEnvironment, new_json_data: dict):
+def add_new_object_to_data_file(environment: DatabaseEnvironment, new_json_data: dict | list | str):
     """
     Append metadata JSON to the specified environment in the input JSON file.
 
     :param environment: Environment name to append the metadata to
-    :param new_json_data: JSON string to append
+    :param new_json_data: object, list of objects or JSON string to append
     """
-    object_data_file = get_object_data_file_path()
-
-    # Ensure file exists and has valid JSON
-    if os.path.exists(object_data_file) and os.path.getsize(object_data_file) > 0:
-        with open(object_data_file, "r", encoding='utf-8') as file:
-            try:
-                data = json.load(file)
-            except json.JSONDecodeError:
-                data = {"root": []}
-    else:
-        data = {"root": []}
-
-    new_metadata = new_json_data if isinstance(new_json_data, dict) else json.loads(new_json_data)
-
-    # Find or create environment entry
-    for env in data["root"]:
-        if env.get("environment").upper() == environment.name:
-            if "objects" not in env:
-                env["objects"] = []
-            env["objects"].extend(new_metadata if isinstance(new_metadata, list) else [new_metadata])
-            break
-    else:
-        # Environment doesn't exist, add it
-        data["root"].append({
-            "environment": environment.value,
-            "objects": new_metadata if isinstance(new_metadata, list) else [new_metadata]
-        })
-
-    # Write back to the file
-    with open(object_data_file, "w") as file:
-        json.dump(data, file, indent=4)
-
-
-def add_or_update_object_data_file(environment: DatabaseEnvironment, new_json_data: dict):
-    """
-    Add new metadata or update an existing object within the specified environment.
-
-    :param environment: Environment name to append/update metadata
-    :param new_json_data: JSON string to append/update
-    """
-    object_data_file = get_migrated_object_data_file_path()
-
-    # Ensure file exists and has valid JSON
-    if os.path.exists(object_data_file) and os.path.getsize(object_data_file) > 0:
-        with open(object_data_file, "r", encoding='utf-8') as file:
-            try:
-                data = json.load(file)
-            except json.JSONDecodeError:
-                data = {"root": []}
-    else:
-        data = {"root": []}
-
-    new_metadata = new_json_data if isinstance(new_json_data, dict) else json.loads(new_json_data)
-    object_name = new_metadata.get("name")  # Assuming objects have a unique "name" field
-
-    for env in data["root"]:
-        if env.get("environment").upper() == environment.name:
-            if "objects" not in env:
-                env["objects"] = []
-
-            # Check if object already exists, update it
-            for obj in env["objects"]:
-                if obj.get("name") == object_name:
-                    obj.update(new_metadata)
-                    break
-            else:
-                env["objects"].append(new_metadata)  # If not found, add new object
-            break
-    else:
-        # Environment doesn't exist, add it with the new object
-        data["root"].append({
-            "environment": environment.value,
-            "objects": [new_metadata]
-        })
-
-    # Write back to the file
-    with open(object_data_file, "w") as file:
-        json.dump(data, file, indent=4)
+    with open_object_data_store(get_object_data_file_path()) as object_data_store:
+        object_data_store.add(environment=environment, new_json_data=new_json_data)
 
 
 def extract_table_unique_dependencies_types_from_data_file(
         environment: DatabaseEnvironment,
         table_object_type: TableObject
 ) -> [str]:
-    input_file_name = get_object_data_file_path()
-    try:
-        with open(input_file_name, 'r') as file:
-            data = json.load(file)
-
-        # Ensure root exists and is a list
-        if 'root' not in data or not isinstance(data['root'], list):
-            raise ValueError("Invalid JSON structure: 'root' key not found or not a list.")
-
-        dependency_names = set()
-        # Iterate through root objects and filter by environment
-        for item in data['root']:
-            if item.get('environment').upper() == environment.name:
-                objects = item.get('objects', [])
-                for obj in objects:
-                    object_type = obj.get("type")
-                    if object_type in ["TABLE"]:
-                        dependencies = obj.get(table_object_type.value, {})
-                        if dependencies:
-                            for dependency in dependencies:
-                                dependency_names.add(dependency.get('name').upper())
-
-        return sorted(dependency_names)
-
-    except FileNotFoundError:
-        raise FileNotFoundError(f"The file '{input_file_name}' was not found.")
-    except json.JSONDecodeError:
-        raise ValueError(f"The file '{input_file_name}' is not a valid JSON file.")
+    object_data_reader = get_object_data_reader(get_object_data_file_path())
+    return sorted(object_data_reader.get_table_dependency_names(environment=environment,
+                                                               table_object_type=table_object_type))
 
 
 def extract_unique_object_types_from_data_file(
@@ -257,23 +141,9 @@ def extract_unique_object_types_from_data_file(
         :param database_object_type:
     """
 
-    data = get_full_object_data()
-
-    # Ensure root exists and is a list
-    if 'root' not in data or not isinstance(data['root'], list):
-        raise ValueError("Invalid JSON structure: 'root' key not found or not a list.")
-
-    object_names = set()
-    # Iterate through root objects and filter by environment
-    for item in data['root']:
-        if item.get('environment').upper() == environment.name:
-            objects = item.get('objects', [])
-            for obj in objects:
-                object_type = obj.get("type")
-                if object_type == database_object_type.name and obj.get('custom') == is_custom:
-                    object_names.add(obj.get('name').upper())
-
-    return object_names
+    object_data_reader = get_object_data_reader(get_object_data_file_path())
+    return object_data_reader.get_object_names(environment=environment, object_type=database_object_type.name,
+                                              custom=is_custom)
 
 
 def extract_unique_dependencies_types_from_data_file(
@@ -294,31 +164,12 @@ def extract_unique_dependencies_types_from_data_file(
         list: A sorted list of unique dependency names.
     """
 
-    data = get_full_object_data()
-
-    # Ensure root exists and is a list
-    if 'root' not in data or not isinstance(data['root'], list):
-        raise ValueError("Invalid JSON structure: 'root' key not found or not a list.")
-
-    dependency_names = set()
-    # Iterate through root objects and filter by environment
-    for item in data['root']:
-        if item.get('environment').upper() == environment.name:
-            objects = item.get('objects', [])
-            for obj in objects:
-                object_type = obj.get("type")
-                if object_type in ["PROCEDURE", "FUNCTION"]:
-                    dependencies = obj.get('dependencies', {})
-                    dependency_objects = dependencies.get(database_object_type.value, [])
-                    for dependency in dependency_objects:
-                        # Apply custom filter if the object type is TABLE
-                        if database_object_type.name.upper() == DatabaseObject.TABLE.name:
-                            if dependency.get('custom') == is_custom:
-                                dependency_names.add(dependency.get('name').upper())
-                        else:
-                            dependency_names.add(dependency.get('name').upper())
-
-    return dependency_names
+    object_data_reader = get_object_data_reader(get_object_data_file_path())
+    # Apply custom filter if the object type is TABLE
+    is_custom_filter = is_custom if database_object_type == DatabaseObject.TABLE else None
+    return object_data_reader.get_dependency_names(environment=environment,
+                                                  dependency_kind=database_object_type.value,
+                                                  is_custom=is_custom_filter)
 
 
 def extract_triggers_from_database(db_pool: OracleDBConnectionPool,
@@ -419,138 +270,60 @@ def add_new_environment(new_environment: DatabaseEnvironment):
         json.dump(data, f, indent=4)
 
 
-def _get_generic_object_data_mapped_by_names_by_environment_and_type(
-        database_environment: DatabaseEnvironment,
-        data_fetcher: object = None,
-        object_data_type: str = "TABLE"  # Function to fetch the JSON data
-) -> dict:
-    if data_fetcher is None:
-        raise ValueError("A data fetcher function must be provided.")
-
-    object_data_dictionary = {}
-    object_data = data_fetcher  # Fetch JSON data using the provided function
-
-    for one_root in object_data.get("root", []):  # Ensure "root" exists
-        if one_root.get("environment") == database_environment.value:
-            for one_object in one_root.get("objects", []):
-                if one_object.get("type") == object_data_type:
-                    name = one_object.get("name")
-                    if name:
-                        object_data_dictionary[name] = one_object
-
-    return object_data_dictionary
-
-
 def get_object_data_mapped_by_names_by_environment_and_type(
         database_environment: DatabaseEnvironment, object_data_type: str) -> dict:
-    return _get_generic_object_data_mapped_by_names_by_environment_and_type(object_data_type=object_data_type,
-                                                                            database_environment=database_environment,
-                                                                            data_fetcher=get_full_object_data())
+    object_data_reader = get_object_data_reader(get_object_data_file_path())
+    return object_data_reader.get_objects_mapped_by_name(environment=database_environment,
+                                                        object_type=object_data_type)
 
 
 def get_migrated_object_data_mapped_by_names_by_environment_and_type(
         database_environment: DatabaseEnvironment, object_data_type: str) -> dict:
-    return _get_generic_object_data_mapped_by_names_by_environment_and_type(object_data_type=object_data_type,
-                                                                            database_environment=database_environment,
-                                                                            data_fetcher=get_full_migrated_object_data())
+    object_data_reader = get_object_data_reader(get_migrated_object_data_file_path())
+    return object_data_reader.get_objects_mapped_by_name(environment=database_environment,
+                                                        object_type=object_data_type)
 
 
 def get_object_data_mapped_by_names_by_environment(
         database_environment: DatabaseEnvironment = DatabaseEnvironment.BANNER7) -> dict:
-    object_data_dictionary = {}
-    object_data = get_full_object_data()  # Fetch JSON data
-
-    for one_root in object_data.get("root", []):  # Ensure "root" exists
-        if one_root.get("environment") == database_environment.value:
-            for one_object in one_root.get("objects", []):
-                name = one_object.get("name")
-                if name:
-                    object_data_dictionary[name] = one_object
-
-    return object_data_dictionary
+    object_data_reader = get_object_data_reader(get_object_data_file_path())
+    return object_data_reader.get_objects_mapped_by_name(environment=database_environment)
 
 
 def get_object_data_names_by_environment(
         database_environment: DatabaseEnvironment = DatabaseEnvironment.BANNER7
 ) -> list[str]:
-    object_data_names = []
-    object_data = get_full_object_data()  # Fetch JSON data
-
-    for one_root in object_data.get("root", []):  # Ensure "root" exists
-        if one_root.get("environment") == database_environment.value:
-            for one_object in one_root.get("objects", []):  # Ensure "objects" exists
-                object_data_names.append(one_object.get("name", ""))  # Default to empty string if "name" is missing
-
-    return object_data_names
+    object_data_reader = get_object_data_reader(get_object_data_file_path())
+    return object_data_reader.get_names(environment=database_environment)
 
 
 def get_full_object_data() -> dict:
-    config_file = get_object_data_file_path()
-    return read_json_file(config_file)
+    return read_object_data(get_object_data_file_path())
 
 
 def get_only_migrated_objects(database_environment: DatabaseEnvironment) -> list[dict]:
-    config_file = get_migrated_object_data_file_path()
-    object_data = read_json_file(config_file)
-    root_data = object_data.get("root", {})
-    only_objects = []
-    for one_root_data in root_data:
-        if one_root_data.get("environment", "") == database_environment.value:
-            environment_objects = one_root_data.get("objects", {})
-            for one_object in environment_objects:
-                only_objects.append(one_object)
-
-    return only_objects
+    object_data_reader = get_object_data_reader(get_migrated_object_data_file_path())
+    return object_data_reader.get_objects(environment=database_environment)
 
 
 def get_only_objects(database_environment: DatabaseEnvironment) -> list[dict]:
-    config_file = get_object_data_file_path()
-    object_data = read_json_file(config_file)
-    root_data = object_data.get("root", {})
-    only_objects = []
-    for one_root_data in root_data:
-        if one_root_data.get("environment", "") == database_environment.value:
-            environment_objects = one_root_data.get("objects", {})
-            for one_object in environment_objects:
-                only_objects.append(one_object)
-
-    return only_objects
+    object_data_reader = get_object_data_reader(get_object_data_file_path())
+    return object_data_reader.get_objects(environment=database_environment)
 
 
 def get_only_filtered_migrated_objects(database_environment: DatabaseEnvironment, object_type: ObjectDataTypes) -> list[
     dict]:
-    config_file = get_migrated_object_data_file_path()
-    object_data = read_json_file(config_file)
-    root_data = object_data.get("root", {})
-    only_objects = []
-    for one_root_data in root_data:
-        if one_root_data.get("environment", "") == database_environment.value:
-            environment_objects = one_root_data.get("objects", {})
-            for one_object in environment_objects:
-                if one_object.get("type") == object_type.value:
-                    only_objects.append(one_object)
-
-    return only_objects
+    object_data_reader = get_object_data_reader(get_migrated_object_data_file_path())
+    return object_data_reader.get_objects_by_type(environment=database_environment, object_type=object_type.value)
 
 
 def get_only_filtered_objects(database_environment: DatabaseEnvironment, object_type: ObjectDataTypes) -> list[dict]:
-    config_file = get_object_data_file_path()
-    object_data = read_json_file(config_file)
-    root_data = object_data.get("root", {})
-    only_objects = []
-    for one_root_data in root_data:
-        if one_root_data.get("environment", "") == database_environment.value:
-            environment_objects = one_root_data.get("objects", {})
-            for one_object in environment_objects:
-                if one_object.get("type") == object_type.value:
-                    only_objects.append(one_object)
-
-    return only_objects
+    object_data_reader = get_object_data_reader(get_object_data_file_path())
+    return object_data_reader.get_objects_by_type(environment=database_environment, object_type=object_type.value)
 
 
 def get_full_migrated_object_data() -> dict:
-    config_file = get_migrated_object_data_file_path()
-    return read_json_file(config_file)
+    return read_object_data(get_migrated_object_data_file_path())
 
 
 def get_object_data_file_path() -> str:
@@ -588,53 +361,59 @@ def get_trigger_names_and_status(triggers: dict, schema: str, table_name: str):
 
 def extract_table_metadata_from_database(db_pool: OracleDBConnectionPool,
                                          table_names: [str],
-                                         object_origin: ObjectOriginType = ObjectOriginType.DEPENDENCY):
+                                         object_origin: ObjectOriginType = ObjectOriginType.DEPENDENCY,
+                                         max_workers: int | None = None) -> list[TableMeta]:
     """
-    Generate a JSON file containing metadata for given tables across all accessible schemas.
+    Build the metadata of the given tables across all accessible schemas.
 
     :param object_origin:
     :param db_pool:
     :param table_names: List of table names (e.g., ["SZTBLAN", "ANOTHER_TABLE"])
+    :param max_workers: concurrent metadata queries, defaults to the pool size
+    :return: one metadata entry per table and schema
     """
-    # Fetch metadata
-    columns = fetch_table_columns_for_tables_grouped_by_schema_and_table_name(db_pool=db_pool, table_names=table_names)
-    attributes = fetch_table_attributes_for_tables_grouped_by_schema_and_table_name(db_pool=db_pool,
-                                                                                    table_names=table_names)
-    comments = fetch_column_comments_for_tables_grouped_by_schema_and_table_name(db_pool=db_pool,
-                                                                                 table_names=table_names)
-    indexes = fetch_full_indexes_for_tables_grouped_by_schema_and_table_name(db_pool=db_pool, table_names=table_names)
-    triggers = fetch_triggers_for_tables(db_pool=db_pool, table_names=table_names)
+    return list(iterate_table_metadata_from_database(db_pool=db_pool, table_names=table_names,
+                                                     object_origin=object_origin,
+                                                     max_workers=max_workers))
 
-    # Construct JSON structure
-    table_metadata = []
+
+def iterate_table_metadata_from_database(db_pool: OracleDBConnectionPool,
+                                         table_names: [str],
+                                         object_origin: ObjectOriginType = ObjectOriginType.DEPENDENCY,
+                                         max_workers: int | None = None):
+    """
+    Yields the metadata entry of every table as soon as its chunk is fetched (see iterate_table_metadata_facets).
+    """
+    for facets in iterate_table_metadata_facets(db_pool=db_pool, table_names=table_names, max_workers=max_workers):
+        yield from _build_table_metadata_entries(object_origin=object_origin, **facets)
+
+
+def _build_table_metadata_entries(object_origin: ObjectOriginType, columns: dict, attributes: dict, comments: dict,
+                                  indexes: dict, triggers: dict):
     for schema in columns.keys():
         for table_name in columns[schema].keys():
-            raw_comments = comments[schema].get(table_name, {})
+            raw_comments = comments.get(schema, {}).get(table_name, {})
             transformed_comments = [
                 {"name": column_name, "comment": comment}
                 for column_name, comment in raw_comments.items()
             ]
             custom_table = is_custom_table(table_name)
-            table_entry = {
-                "object_status": ObjectTargetType.INSTALL.value if custom_table else ObjectTargetType.SKIP.value,
-                "origin": object_origin.value,
-                "name": table_name,
-                "type": "TABLE",
-                "owner": schema,
-                "custom": custom_table,
-                "columns": columns[schema].get(table_name, []),
-                "attributes": attributes.get(schema, {}).get(table_name, {}),
-                "comments": transformed_comments,
-                "indexes": indexes.get(schema, {}).get(table_name, []),
-                "sequences": [],
-                "triggers": get_trigger_names_and_status(triggers=triggers, schema=schema, table_name=table_name)
-            }
-            table_metadata.append(table_entry)
-
-    return json.dumps(table_metadata, indent=4)
-
-
-def add_base_tables_manager(db_pool: OracleDBConnectionPool, database_environment=DatabaseEnvironment):
+            yield TableMeta(
+                object_status=ObjectTargetType.INSTALL.value if custom_table else ObjectTargetType.SKIP.value,
+                origin=object_origin.value,
+                name=table_name,
+                owner=schema,
+                custom=custom_table,
+                columns=[ColumnMeta.from_dict(column) for column in columns[schema].get(table_name, [])],
+                attributes=attributes.get(schema, {}).get(table_name, {}),
+                comments=transformed_comments,
+                indexes=indexes.get(schema, {}).get(table_name, []),
+                triggers=get_trigger_names_and_status(triggers=triggers, schema=schema, table_name=table_name)
+            )
+
+
+def add_base_tables_manager(db_pool: OracleDBConnectionPool, database_environment=DatabaseEnvironment,
+                            max_workers: int | None = None):
     logging.info("Starting: add base tables to object data")
     unique_tables = extract_unique_dependencies_types_from_data_file(database_object_type=DatabaseObject.TABLE,
                                                                      environment=database_environment,
@@ -642,13 +421,15 @@ def add_base_tables_manager(db_pool: OracleDBConnectionPool, database_environmen
 
     if unique_tables:
         json_attributes_from_tables = extract_table_metadata_from_database(db_pool=db_pool, table_names=unique_tables,
-                                                                           object_origin=ObjectOriginType.DEPENDENCY)
+                                                                           object_origin=ObjectOriginType.DEPENDENCY,
+                                                                           max_workers=max_workers)
         add_new_object_to_data_file(environment=database_environment, new_json_data=
         json_attributes_from_tables)
         logging.info(f"Added {len(unique_tables)} base tables to object data")
 
     else:
         logging.info("No unique base tables found. Skipping db operations.")
+    db_pool.log_metrics(stage="add base tables to object data")
     logging.info("Ending: add base tables to object data")
 
 
@@ -669,32 +450,35 @@ def add_custom_sequences_manager(db_pool: OracleDBConnectionPool, database_envir
         logging.info(f"Added {len(unique_sequences)} custom sequences to object data")
     else:
         logging.info("No unique sequences found. Skipping db operations.")
+    db_pool.log_metrics(stage="add custom sequences to object data")
     logging.info("Ending: add custom sequences to object data")
 
 
 def add_custom_tables_manager(db_pool: OracleDBConnectionPool,
-                              database_environment: DatabaseEnvironment):
+                              database_environment: DatabaseEnvironment,
+                              max_workers: int | None = None):
     logging.info("Starting: add custom tables to object data")
 
     unique_tables = extract_unique_dependencies_types_from_data_file(database_object_type=DatabaseObject.TABLE,
                                                                      environment=database_environment,
                                                                      is_custom=True)
     additional_tables = get_tables_by_environment(database_environment=database_environment)
-    if additional_tables:
-        json_attributes_from_additional_tables = extract_table_metadata_from_database(db_pool=db_pool,
-                                                                                      table_names=additional_tables,
-                                                                                      object_origin=ObjectOriginType.MANUAL)
-        add_new_object_to_data_file(database_environment, new_json_data=
-        json_attributes_from_additional_tables)
-
-    if unique_tables:
-        json_attributes_from_unique_tables = extract_table_metadata_from_database(db_pool=db_pool,
-                                                                                  table_names=unique_tables,
-                                                                                  object_origin=ObjectOriginType.DEPENDENCY)
-        add_new_object_to_data_file(database_environment, new_json_data=
-        json_attributes_from_unique_tables)
-    else:
-        logging.info("No unique custom tables found. Skipping db operations.")
+    with open_object_data_store(get_object_data_file_path()) as object_data_store:
+        if additional_tables:
+            json_attributes_from_additional_tables = extract_table_metadata_from_database(
+                db_pool=db_pool, table_names=additional_tables, object_origin=ObjectOriginType.MANUAL,
+                max_workers=max_workers)
+            object_data_store.add(environment=database_environment,
+                                  new_json_data=json_attributes_from_additional_tables)
+
+        if unique_tables:
+            json_attributes_from_unique_tables = extract_table_metadata_from_database(
+                db_pool=db_pool, table_names=unique_tables, object_origin=ObjectOriginType.DEPENDENCY,
+                max_workers=max_workers)
+            object_data_store.add(environment=database_environment, new_json_data=json_attributes_from_unique_tables)
+        else:
+            logging.info("No unique custom tables found. Skipping db operations.")
+    db_pool.log_metrics(stage="add custom tables to object data")
     logging.info("Ending: add custom tables to object data")
 
 
@@ -713,162 +497,219 @@ def add_custom_triggers_manager(db_pool: OracleDBConnectionPool, database_enviro
         json_attributes_from_triggers)
     else:
         print("No unique triggers found. Skipping db operations.")
+    db_pool.log_metrics(stage="add custom triggers to object data")
     logging.info("Ending: add custom tables to object data")
 
 
-def migrate_sequences_manager(database_environment: DatabaseEnvironment):
-    unique_sequences = extract_unique_dependencies_types_from_data_file(environment=database_environment,
-                                                                        database_object_type=DatabaseObject.SEQUENCE,
-                                                                        is_custom=True)
-
-    sequence_object_data = get_object_data_mapped_by_names_by_environment_and_type(
-        object_data_type=ObjectDataTypes.SEQUENCE.value, database_environment=database_environment)
-
-    for one_sequence in unique_sequences:
-
-        current_sequence = sequence_object_data[one_sequence]
-        sequence_name = current_sequence["name"]
-        grants = read_custom_data(grant_type=GrantType.SEQUENCE, object_addon_type=ObjectAddonType.GRANTS,
-                                  b9_object_name=sequence_name, b9_object_owner="UVM")
-        revokes = read_custom_data(grant_type=GrantType.SEQUENCE, object_addon_type=ObjectAddonType.REVOKES,
-                                   b9_object_name=sequence_name, b9_object_owner="UVM")
-
-        synonyms = read_custom_data(object_addon_type=ObjectAddonType.SYNONYMS, b9_object_name=sequence_name,
-                                    b9_object_owner="UVM")
-        drop_synonyms = read_custom_data(object_addon_type=ObjectAddonType.DROP_SYNONYMS, b9_object_name=sequence_name,
-                                         b9_object_owner="UVM")
-        if current_sequence:
-            new_sequence = {
-                "origin": current_sequence.get("origin", ObjectOriginType.DEPENDENCY.value),
-                "owner": current_sequence["owner"],
-                "name": sequence_name,
-                "type": current_sequence["type"],
-                "deployment": current_sequence["deployment"],
-                "min_value": current_sequence["min_value"],
-                "max_value": current_sequence["max_value"],
-                "increment_by": current_sequence["increment_by"],
-                "cycle_flag": current_sequence["cycle_flag"],
-                "order_flag": current_sequence["order_flag"],
-                "cache_size": current_sequence["cache_size"],
-                "last_number": current_sequence["last_number"],
-                "grants": grants["grants"],
-                "revokes": revokes["revokes"],
-                "synonyms": synonyms,
-                "drop_synonyms": drop_synonyms,
-            }
-
-            add_or_update_object_data_file(environment=database_environment, new_json_data=new_sequence)
-
-
-def migrate_tables_manager(database_environment: DatabaseEnvironment):
-    unique_dependency_tables = extract_unique_dependencies_types_from_data_file(environment=database_environment,
-                                                                                database_object_type=DatabaseObject.TABLE,
-                                                                                is_custom=True)
-    unique_object_tables = extract_unique_object_types_from_data_file(environment=database_environment,
-                                                                      database_object_type=DatabaseObject.TABLE,
-                                                                      is_custom=True)
-
-    object_data = get_full_object_data()
-    unique_tables = unique_dependency_tables.union(unique_object_tables)
-
-    for one_table in unique_tables:
-        b9_nombre = one_table
-        b9_esquema = "UVM"
-        converted_table_data = migrate_b9_table_to_b9(json_data=object_data,
-                                                      b9_table_name=b9_nombre,
-                                                      b9_owner=b9_esquema)
-
-        add_or_update_object_data_file(new_json_data=converted_table_data,
-                                       environment=database_environment)
-
+class MigrationPlan:
+    """
+    Everything the migrate_* managers need from the object data, computed from a single read of the file:
+    the custom tables (listed as dependencies or as objects), the custom sequence dependencies, the sequences
+    and packages by name, and the functions and procedures with INSTALL status.
 
-def migrate_packages_manager(database_environment: DatabaseEnvironment):
-    packages_from_object_data = get_object_data_mapped_by_names_by_environment_and_type(
-        object_data_type=DatabaseObject.PACKAGE.name, database_environment=database_environment)
+    Objects are handed out as they were loaded, a plan is meant to be used by one migration run.
+    """
 
-    for package_name, package_dependencies in packages_from_object_data.items():
-        object_status = package_dependencies.get("object_status", ObjectTargetType.SKIP.value)
-        if object_status == ObjectTargetType.INSTALL.value:
-            grants = read_custom_data(grant_type=GrantType.PACKAGE, object_addon_type=ObjectAddonType.GRANTS,
-                                      b9_object_name=package_name, b9_object_owner="UVM")
-            revokes = read_custom_data(grant_type=GrantType.PACKAGE, object_addon_type=ObjectAddonType.REVOKES,
-                                       b9_object_name=package_name, b9_object_owner="UVM")
-            synonyms = read_custom_data(object_addon_type=ObjectAddonType.SYNONYMS, b9_object_name=package_name,
+    def __init__(self, json_data: dict, database_environment: DatabaseEnvironment):
+        object_data_index = ObjectDataIndex(json_data)
+        self.json_data = json_data
+        self.database_environment = database_environment
+        self.custom_tables = object_data_index.get_dependency_names(
+            environment=database_environment, dependency_kind=DatabaseObject.TABLE.value, is_custom=True).union(
+            object_data_index.get_object_names(environment=database_environment,
+                                               object_type=DatabaseObject.TABLE.name, custom=True))
+        self.custom_sequences = object_data_index.get_dependency_names(
+            environment=database_environment, dependency_kind=DatabaseObject.SEQUENCE.value)
+        self.sequences = object_data_index.get_objects_mapped_by_name(environment=database_environment,
+                                                                      object_type=ObjectDataTypes.SEQUENCE.value)
+        self.packages = object_data_index.get_objects_mapped_by_name(environment=database_environment,
+                                                                     object_type=DatabaseObject.PACKAGE.name)
+        self.functions = self._get_objects_to_install(object_data_index, ObjectDataTypes.FUNCTION)
+        self.procedures = self._get_objects_to_install(object_data_index, ObjectDataTypes.PROCEDURE)
+        self._original_tables = {}  # table name -> first object with that name in banner9
+
+    def _get_objects_to_install(self, object_data_index: ObjectDataIndex, object_type: ObjectDataTypes) -> list[dict]:
+        return [one_object_data
+                for one_object_data in object_data_index.get_objects_by_type(environment=self.database_environment,
+                                                                             object_type=object_type.value)
+                if one_object_data.get("object_status") == ObjectTargetType.INSTALL.value]
+
+    def get_original_table(self, table_name: str) -> dict | None:
+        if not self._original_tables:
+            for env in self.json_data.get("root", []):
+                if env.get("environment") == DatabaseEnvironment.BANNER9.value:
+                    for obj in env.get("objects", []):
+                        self._original_tables.setdefault(obj.get("name"), obj)
+        return self._original_tables.get(table_name)
+
+    @classmethod
+    def from_file(cls, database_environment: DatabaseEnvironment) -> "MigrationPlan":
+        return cls(json_data=get_full_object_data(), database_environment=database_environment)
+
+
+def _open_migrated_object_data_store(object_data_store: ObjectDataStore | SQLiteObjectDataStore | None):
+    """Uses the caller's store, or opens the migrated object data for a single manager run."""
+    if object_data_store is not None:
+        return nullcontext(object_data_store)
+    return open_object_data_store(get_migrated_object_data_file_path())
+
+
+def migrate_sequences_manager(database_environment: DatabaseEnvironment, migration_plan: MigrationPlan | None = None,
+                              object_data_store: ObjectDataStore | SQLiteObjectDataStore | None = None):
+    migration_plan = migration_plan or MigrationPlan.from_file(database_environment=database_environment)
+    sequence_object_data = migration_plan.sequences
+
+    with _open_migrated_object_data_store(object_data_store) as object_data_store:
+        for one_sequence in migration_plan.custom_sequences:
+
+            current_sequence = sequence_object_data[one_sequence]
+            sequence_name = current_sequence["name"]
+            grants = read_custom_data(grant_type=GrantType.SEQUENCE, object_addon_type=ObjectAddonType.GRANTS,
+                                      b9_object_name=sequence_name, b9_object_owner="UVM")
+            revokes = read_custom_data(grant_type=GrantType.SEQUENCE, object_addon_type=ObjectAddonType.REVOKES,
+                                       b9_object_name=sequence_name, b9_object_owner="UVM")
+
+            synonyms = read_custom_data(object_addon_type=ObjectAddonType.SYNONYMS, b9_object_name=sequence_name,
                                         b9_object_owner="UVM")
-
             drop_synonyms = read_custom_data(object_addon_type=ObjectAddonType.DROP_SYNONYMS,
-                                             b9_object_name=package_name,
-                                             b9_object_owner="UVM")
-
-            # Add grants and synonyms to the package data
-            packages_from_object_data[package_name]["grants"] = grants["grants"]
-            packages_from_object_data[package_name]["revokes"] = revokes["revokes"]
-            packages_from_object_data[package_name]["synonyms"] = synonyms
-            packages_from_object_data[package_name]["drop_synonyms"] = drop_synonyms
-
-            add_or_update_object_data_file(new_json_data=packages_from_object_data[package_name],
-                                           environment=database_environment)
-
-
-def migrate_addon_sequences_manager(database_environment: DatabaseEnvironment):
-    unique_dependency_tables = extract_unique_dependencies_types_from_data_file(environment=database_environment,
-                                                                                database_object_type=DatabaseObject.TABLE,
-                                                                                is_custom=True)
-    unique_object_tables = extract_unique_object_types_from_data_file(environment=database_environment,
-                                                                      database_object_type=DatabaseObject.TABLE,
-                                                                      is_custom=True)
-
-    unique_tables = unique_dependency_tables.union(unique_object_tables)
-
-    for one_table in unique_tables:
-        b9_nombre = one_table
-        b9_esquema = "UVM"
-        custom_sequences_addon_data = migrate_sequence_to_b9(b9_table_name=b9_nombre,
-                                                             b9_owner=b9_esquema)
-        for custom_sequence_addon_data in custom_sequences_addon_data:
-            add_or_update_object_data_file(new_json_data=custom_sequence_addon_data,
-                                           environment=database_environment)
-
-
-def migrate_addon_triggers_manager(database_environment: DatabaseEnvironment):
-    unique_dependency_tables = extract_unique_dependencies_types_from_data_file(environment=database_environment,
-                                                                                database_object_type=DatabaseObject.TABLE,
-                                                                                is_custom=True)
-    unique_object_tables = extract_unique_object_types_from_data_file(environment=database_environment,
-                                                                      database_object_type=DatabaseObject.TABLE,
-                                                                      is_custom=True)
-
-    unique_tables = unique_dependency_tables.union(unique_object_tables)
-
-    for one_table in unique_tables:
-        b9_nombre = one_table
-        b9_esquema = "UVM"
-        custom_sequences_addon_data = migrate_trigger_to_b9(b9_table_name=b9_nombre,
-                                                            b9_owner=b9_esquema)
-
-        for custom_sequence_addon_data in custom_sequences_addon_data:
-            add_or_update_object_data_file(new_json_data=custom_sequence_addon_data,
-                                           environment=database_environment)
-
-
-def migrate_functions_manager(database_environment: DatabaseEnvironment):
-    object_data = get_only_filtered_objects(database_environment=database_environment,
-                                            object_type=ObjectDataTypes.FUNCTION)
-
-    for one_object_data in object_data:
-        if one_object_data.get("object_status") == ObjectTargetType.INSTALL.value:
+                                             b9_object_name=sequence_name, b9_object_owner="UVM")
+            if current_sequence:
+                new_sequence = {
+                    "origin": current_sequence.get("origin", ObjectOriginType.DEPENDENCY.value),
+                    "owner": current_sequence["owner"],
+                    "name": sequence_name,
+                    "type": current_sequence["type"],
+                    "deployment": current_sequence["deployment"],
+                    "min_value": current_sequence["min_value"],
+                    "max_value": current_sequence["max_value"],
+                    "increment_by": current_sequence["increment_by"],
+                    "cycle_flag": current_sequence["cycle_flag"],
+                    "order_flag": current_sequence["order_flag"],
+                    "cache_size": current_sequence["cache_size"],
+                    "last_number": current_sequence["last_number"],
+                    "grants": grants["grants"],
+                    "revokes": revokes["revokes"],
+                    "synonyms": synonyms,
+                    "drop_synonyms": drop_synonyms,
+                }
+
+                object_data_store.upsert(environment=database_environment, new_json_data=new_sequence)
+
+
+def migrate_tables_manager(database_environment: DatabaseEnvironment, migration_plan: MigrationPlan | None = None,
+                           object_data_store: ObjectDataStore | SQLiteObjectDataStore | None = None):
+    migration_plan = migration_plan or MigrationPlan.from_file(database_environment=database_environment)
+
+    with _open_migrated_object_data_store(object_data_store) as object_data_store:
+        for one_table in migration_plan.custom_tables:
+            b9_nombre = one_table
+            b9_esquema = "UVM"
+            converted_table_data = migrate_b9_table_to_b9(json_data=migration_plan.json_data,
+                                                          b9_table_name=b9_nombre,
+                                                          b9_owner=b9_esquema,
+                                                          original_table=migration_plan.get_original_table(b9_nombre))
+
+            object_data_store.upsert(new_json_data=converted_table_data,
+                                     environment=database_environment)
+
+
+def migrate_packages_manager(database_environment: DatabaseEnvironment, migration_plan: MigrationPlan | None = None,
+                             object_data_store: ObjectDataStore | SQLiteObjectDataStore | None = None):
+    migration_plan = migration_plan or MigrationPlan.from_file(database_environment=database_environment)
+    packages_from_object_data = migration_plan.packages
+
+    with _open_migrated_object_data_store(object_data_store) as object_data_store:
+        for package_name, package_dependencies in packages_from_object_data.items():
+            object_status = package_dependencies.get("object_status", ObjectTargetType.SKIP.value)
+            if object_status == ObjectTargetType.INSTALL.value:
+                grants = read_custom_data(grant_type=GrantType.PACKAGE, object_addon_type=ObjectAddonType.GRANTS,
+                                          b9_object_name=package_name, b9_object_owner="UVM")
+                revokes = read_custom_data(grant_type=GrantType.PACKAGE, object_addon_type=ObjectAddonType.REVOKES,
+                                           b9_object_name=package_name, b9_object_owner="UVM")
+                synonyms = read_custom_data(object_addon_type=ObjectAddonType.SYNONYMS, b9_object_name=package_name,
+                                            b9_object_owner="UVM")
+
+                drop_synonyms = read_custom_data(object_addon_type=ObjectAddonType.DROP_SYNONYMS,
+                                                 b9_object_name=package_name,
+                                                 b9_object_owner="UVM")
+
+                # Add grants and synonyms to the package data
+                packages_from_object_data[package_name]["grants"] = grants["grants"]
+                packages_from_object_data[package_name]["revokes"] = revokes["revokes"]
+                packages_from_object_data[package_name]["synonyms"] = synonyms
+                packages_from_object_data[package_name]["drop_synonyms"] = drop_synonyms
+
+                object_data_store.upsert(new_json_data=packages_from_object_data[package_name],
+                                         environment=database_environment)
+
+
+def migrate_addon_sequences_manager(database_environment: DatabaseEnvironment,
+                                    migration_plan: MigrationPlan | None = None,
+                                    object_data_store: ObjectDataStore | SQLiteObjectDataStore | None = None):
+    migration_plan = migration_plan or MigrationPlan.from_file(database_environment=database_environment)
+
+    with _open_migrated_object_data_store(object_data_store) as object_data_store:
+        for one_table in migration_plan.custom_tables:
+            b9_nombre = one_table
+            b9_esquema = "UVM"
+            custom_sequences_addon_data = migrate_sequence_to_b9(b9_table_name=b9_nombre,
+                                                                 b9_owner=b9_esquema)
+            for custom_sequence_addon_data in custom_sequences_addon_data:
+                object_data_store.upsert(new_json_data=custom_sequence_addon_data,
+                                         environment=database_environment)
+
+
+def migrate_addon_triggers_manager(database_environment: DatabaseEnvironment,
+                                   migration_plan: MigrationPlan | None = None,
+                                   object_data_store: ObjectDataStore | SQLiteObjectDataStore | None = None):
+    migration_plan = migration_plan or MigrationPlan.from_file(database_environment=database_environment)
+
+    with _open_migrated_object_data_store(object_data_store) as object_data_store:
+        for one_table in migration_plan.custom_tables:
+            b9_nombre = one_table
+            b9_esquema = "UVM"
+            custom_sequences_addon_data = migrate_trigger_to_b9(b9_table_name=b9_nombre,
+                                                                b9_owner=b9_esquema)
+
+            for custom_sequence_addon_data in custom_sequences_addon_data:
+                object_data_store.upsert(new_json_data=custom_sequence_addon_data,
+                                         environment=database_environment)
+
+
+def migrate_functions_manager(database_environment: DatabaseEnvironment, migration_plan: MigrationPlan | None = None,
+                              object_data_store: ObjectDataStore | SQLiteObjectDataStore | None = None):
+    migration_plan = migration_plan or MigrationPlan.from_file(database_environment=database_environment)
+
+    with _open_migrated_object_data_store(object_data_store) as object_data_store:
+        for one_object_data in migration_plan.functions:
             one_object_data = filter_dependencies(one_object_data)
-            add_or_update_object_data_file(environment=database_environment, new_json_data=one_object_data)
+            object_data_store.upsert(environment=database_environment, new_json_data=one_object_data)
 
 
-def migrate_procedures_manager(database_environment: DatabaseEnvironment):
-    object_data = get_only_filtered_objects(database_environment=database_environment,
-                                            object_type=ObjectDataTypes.PROCEDURE)
+def migrate_procedures_manager(database_environment: DatabaseEnvironment, migration_plan: MigrationPlan | None = None,
+                               object_data_store: ObjectDataStore | SQLiteObjectDataStore | None = None):
+    migration_plan = migration_plan or MigrationPlan.from_file(database_environment=database_environment)
 
-    for one_object_data in object_data:
-        if one_object_data.get("object_status") == ObjectTargetType.INSTALL.value:
+    with _open_migrated_object_data_store(object_data_store) as object_data_store:
+        for one_object_data in migration_plan.procedures:
             one_object_data = filter_dependencies(one_object_data)
-            add_or_update_object_data_file(environment=database_environment, new_json_data=one_object_data)
+            object_data_store.upsert(environment=database_environment, new_json_data=one_object_data)
+
+
+def migrate_all_manager(database_environment: DatabaseEnvironment):
+    """
+    Runs every migrate_* manager from one MigrationPlan into one migrated object data store: the object data
+    is read once and the migrated object data is read and written once.
+    """
+    logging.info("Starting: migrate objects")
+    migration_plan = MigrationPlan.from_file(database_environment=database_environment)
+    with open_object_data_store(get_migrated_object_data_file_path()) as object_data_store:
+        for manager in (migrate_tables_manager, migrate_sequences_manager, migrate_packages_manager,
+                        migrate_functions_manager, migrate_procedures_manager, migrate_addon_sequences_manager,
+                        migrate_addon_triggers_manager):
+            manager(database_environment=database_environment, migration_plan=migration_plan,
+                    object_data_store=object_data_store)
+    logging.info("Ending: migrate objects")
 
 
 def filter_dependencies(data):
@@ -0,0 +1,354 @@
+import json
+import logging
+import os
+import sqlite3
+
+from db.database_properties import DatabaseEnvironment, TableObject
+from files.object_data_store import DEPENDENT_OBJECT_TYPES
+from tools.object_model_tools import encode_model
+
+# Lists of an object copied to their own table, so they can be queried without reading the objects
+OBJECT_CHILD_TABLES = {
+    "columns": "object_columns",
+    "indexes": "object_indexes",
+    "grants": "object_grants",
+    TableObject.TRIGGER.value: "object_triggers",
+}
+
+
+def _encode_flag(value) -> str:
+    """Flags such as "custom" are compared as JSON text, so True, False, None and anything else stay distinct."""
+    return json.dumps(value)
+
+
+def _to_object(obj) -> dict:
+    """Model objects (tools.object_model_tools) are stored in the object data layout."""
+    return obj if isinstance(obj, dict) else encode_model(obj)
+
+
+def _get_child_name(child) -> str | None:
+    if isinstance(child, dict):
+        return child.get("name") or child.get("column_name")
+    return str(child) if child is not None else None
+
+
+class SQLiteObjectDataStore:
+    """
+    Object data kept in a SQLite file instead of one JSON document.
+
+    Every object is stored whole in the objects table, one row per environment and position. Its
+    dependencies, columns, indexes, grants and triggers are also copied to their own indexed tables, so
+    names, flags and reverse dependencies are answered by queries and only the objects asked for are
+    parsed. add() and upsert() behave like ObjectDataStore and the queries like ObjectDataIndex, so either
+    store can be used (files.object_data_backend); environments are matched without case, as in the JSON
+    store. Changes are written on commit() and rolled back when a with block ends with an exception.
+    import_json() and export_json() convert from and to the object_data.json layout.
+    """
+
+    def __init__(self, database_file_path: str, check_same_thread: bool = True):
+        self.database_file_path = database_file_path
+        self._connection = sqlite3.connect(database_file_path, check_same_thread=check_same_thread)
+        self._create_tables()
+
+    def _create_tables(self):
+        self._connection.execute("""
+            CREATE TABLE IF NOT EXISTS environments (
+                environment_key TEXT PRIMARY KEY,
+                environment TEXT NOT NULL,
+                position INTEGER NOT NULL
+            )
+        """)
+        self._connection.execute("""
+            CREATE TABLE IF NOT EXISTS objects (
+                object_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                environment TEXT NOT NULL,
+                name TEXT,
+                type TEXT,
+                owner TEXT,
+                package TEXT,
+                custom TEXT NOT NULL,
+                object_status TEXT,
+                document TEXT NOT NULL
+            )
+        """)
+        self._connection.execute("CREATE INDEX IF NOT EXISTS objects_name ON objects (environment, name)")
+        self._connection.execute("CREATE INDEX IF NOT EXISTS objects_type ON objects (environment, type, custom)")
+        self._connection.execute("""
+            CREATE TABLE IF NOT EXISTS dependencies (
+                object_id INTEGER NOT NULL REFERENCES objects (object_id) ON DELETE CASCADE,
+                kind TEXT NOT NULL,
+                position INTEGER NOT NULL,
+                name TEXT,
+                package TEXT,
+                custom TEXT NOT NULL
+            )
+        """)
+        self._connection.execute("CREATE INDEX IF NOT EXISTS dependencies_object ON dependencies (object_id)")
+        self._connection.execute("CREATE INDEX IF NOT EXISTS dependencies_name ON dependencies (kind, name)")
+        for child_table in OBJECT_CHILD_TABLES.values():
+            self._connection.execute(f"""
+                CREATE TABLE IF NOT EXISTS {child_table} (
+                    object_id INTEGER NOT NULL REFERENCES objects (object_id) ON DELETE CASCADE,
+                    position INTEGER NOT NULL,
+                    name TEXT,
+                    document TEXT NOT NULL
+                )
+            """)
+            self._connection.execute(
+                f"CREATE INDEX IF NOT EXISTS {child_table}_object ON {child_table} (object_id)")
+            self._connection.execute(f"CREATE INDEX IF NOT EXISTS {child_table}_name ON {child_table} (name)")
+        self._connection.commit()
+
+    def _ensure_environment(self, environment: str) -> str:
+        """Registers the environment as it is written in the file; objects refer to it by its upper-cased key."""
+        environment_key = environment.upper()
+        self._connection.execute("""
+            INSERT OR IGNORE INTO environments (environment_key, environment, position)
+            SELECT ?, ?, COALESCE(MAX(position), 0) + 1 FROM environments
+        """, (environment_key, environment))
+        return environment_key
+
+    def _write_children(self, object_id: int, obj: dict):
+        self._connection.execute("DELETE FROM dependencies WHERE object_id = ?", (object_id,))
+        dependencies = obj.get("dependencies")
+        if isinstance(dependencies, dict):
+            self._connection.executemany(
+                "INSERT INTO dependencies (object_id, kind, position, name, package, custom) VALUES (?, ?, ?, ?, ?, ?)",
+                [(object_id, kind, position, (dependency.get("name") or "").upper(), dependency.get("package"),
+                  _encode_flag(dependency.get("custom")))
+                 for kind, kind_dependencies in dependencies.items()
+                 for position, dependency in enumerate(kind_dependencies or [])])
+
+        for attribute, child_table in OBJECT_CHILD_TABLES.items():
+            self._connection.execute(f"DELETE FROM {child_table} WHERE object_id = ?", (object_id,))
+            children = obj.get(attribute)
+            if isinstance(children, list):
+                self._connection.executemany(
+                    f"INSERT INTO {child_table} (object_id, position, name, document) VALUES (?, ?, ?, ?)",
+                    [(object_id, position, _get_child_name(child), json.dumps(child))
+                     for position, child in enumerate(children)])
+
+    def _insert_object(self, environment: str, obj: dict):
+        environment_key = self._ensure_environment(environment)
+        cursor = self._connection.execute("""
+            INSERT INTO objects (environment, name, type, owner, package, custom, object_status, document)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """, (environment_key, obj.get("name"), obj.get("type"), obj.get("owner"), obj.get("package"),
+              _encode_flag(obj.get("custom")), obj.get("object_status"), json.dumps(obj)))
+        self._write_children(object_id=cursor.lastrowid, obj=obj)
+
+    def _update_object(self, object_id: int, obj: dict):
+        self._connection.execute("""
+            UPDATE objects SET name = ?, type = ?, owner = ?, package = ?, custom = ?, object_status = ?, document = ?
+            WHERE object_id = ?
+        """, (obj.get("name"), obj.get("type"), obj.get("owner"), obj.get("package"), _encode_flag(obj.get("custom")),
+              obj.get("object_status"), json.dumps(obj), object_id))
+        self._write_children(object_id=object_id, obj=obj)
+
+    def add(self, environment: DatabaseEnvironment, new_json_data):
+        """
+        Appends an object, a model object, a list of them or their JSON string, even if objects with that name
+        exist.
+        """
+        new_metadata = json.loads(new_json_data) if isinstance(new_json_data, str) else new_json_data
+        for obj in new_metadata if isinstance(new_metadata, list) else [new_metadata]:
+            self._insert_object(environment=environment.value, obj=_to_object(obj))
+
+    def upsert(self, environment: DatabaseEnvironment, new_json_data):
+        """Updates the first object with the same name, or appends the object if there is none."""
+        new_metadata = _to_object(json.loads(new_json_data) if isinstance(new_json_data, str) else new_json_data)
+        row = self._connection.execute("""
+            SELECT object_id, document FROM objects WHERE environment = ? AND name IS ? ORDER BY object_id LIMIT 1
+        """, (environment.name, new_metadata.get("name"))).fetchone()
+        if row is None:
+            self._insert_object(environment=environment.value, obj=new_metadata)
+            return
+        object_id, document = row
+        obj = json.loads(document)
+        obj.update(new_metadata)
+        self._update_object(object_id=object_id, obj=obj)
+
+    def get(self, environment: DatabaseEnvironment, object_name: str) -> dict | None:
+        """The first object with the given name."""
+        row = self._connection.execute("""
+            SELECT document FROM objects WHERE environment = ? AND name = ? ORDER BY object_id LIMIT 1
+        """, (environment.name, object_name)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def iterate_objects(self, environment: DatabaseEnvironment, object_type: str | None = None):
+        """Yields the objects of an environment, optionally of one type, in insertion order."""
+        if object_type is None:
+            yield from self._iterate_documents(environment_key=environment.name)
+            return
+        rows = self._connection.execute(
+            "SELECT document FROM objects WHERE environment = ? AND type = ? ORDER BY object_id",
+            (environment.name, object_type))
+        for (document,) in rows:
+            yield json.loads(document)
+
+    def get_objects(self, environment: DatabaseEnvironment) -> list[dict]:
+        return list(self.iterate_objects(environment=environment))
+
+    def get_names(self, environment: DatabaseEnvironment) -> list[str]:
+        rows = self._connection.execute(
+            "SELECT name FROM objects WHERE environment = ? ORDER BY object_id", (environment.name,))
+        return [name or "" for (name,) in rows]
+
+    def get_objects_by_type(self, environment: DatabaseEnvironment, object_type: str) -> list[dict]:
+        return list(self.iterate_objects(environment=environment, object_type=object_type))
+
+    def get_objects_mapped_by_name(self, environment: DatabaseEnvironment, object_type: str | None = None) -> dict:
+        """Objects with a name, keyed by name; the last object wins when a name is repeated."""
+        return {obj["name"]: obj for obj in self.iterate_objects(environment=environment, object_type=object_type)
+                if obj.get("name")}
+
+    def get_object_names(self, environment: DatabaseEnvironment, object_type: str, custom) -> set[str]:
+        """Upper-cased names of the objects of a type whose "custom" flag equals custom."""
+        rows = self._connection.execute("""
+            SELECT DISTINCT UPPER(name) FROM objects
+            WHERE environment = ? AND type = ? AND custom = ? AND name IS NOT NULL AND name <> ''
+        """, (environment.name, object_type, _encode_flag(custom)))
+        return {name for (name,) in rows}
+
+    def get_dependency_names(self, environment: DatabaseEnvironment, dependency_kind: str,
+                             is_custom: bool | None = None) -> set[str]:
+        """
+        Upper-cased names of the dependencies of one kind ("tables", "functions", ...) of the procedures and
+        functions, only those whose "custom" flag equals is_custom unless it is None.
+        """
+        query = f"""
+            SELECT DISTINCT d.name FROM dependencies d JOIN objects o ON o.object_id = d.object_id
+            WHERE o.environment = ? AND o.type IN ({", ".join("?" for _ in DEPENDENT_OBJECT_TYPES)})
+              AND d.kind = ? AND d.name <> ''
+        """
+        params = [environment.name, *DEPENDENT_OBJECT_TYPES, dependency_kind]
+        if is_custom is not None:
+            query += " AND d.custom = ?"
+            params.append(_encode_flag(is_custom))
+        return {name for (name,) in self._connection.execute(query, params)}
+
+    def get_table_dependency_names(self, environment: DatabaseEnvironment, table_object_type: TableObject) -> set[str]:
+        """Upper-cased names listed under a table attribute, e.g. "triggers", of every table."""
+        child_table = OBJECT_CHILD_TABLES[table_object_type.value]
+        rows = self._connection.execute(f"""
+            SELECT DISTINCT UPPER(c.name) FROM {child_table} c JOIN objects o ON o.object_id = c.object_id
+            WHERE o.environment = ? AND o.type = 'TABLE' AND c.name IS NOT NULL
+        """, (environment.name,))
+        return {name for (name,) in rows}
+
+    def get_dependents(self, environment: DatabaseEnvironment, dependency_name: str) -> list[str]:
+        """Names of the objects that list dependency_name among their dependencies."""
+        rows = self._connection.execute("""
+            SELECT o.name FROM dependencies d JOIN objects o ON o.object_id = d.object_id
+            WHERE o.environment = ? AND d.name = ?
+            ORDER BY o.object_id
+        """, (environment.name, dependency_name.upper()))
+        return list(dict.fromkeys(name for (name,) in rows))
+
+    def get_children(self, environment: DatabaseEnvironment, object_name: str, attribute: str) -> list:
+        """One list of an object ("columns", "indexes", "grants" or "triggers") without reading the object."""
+        child_table = OBJECT_CHILD_TABLES[attribute]
+        rows = self._connection.execute(f"""
+            SELECT c.document FROM {child_table} c
+            WHERE c.object_id = (
+                SELECT object_id FROM objects WHERE environment = ? AND name = ? ORDER BY object_id LIMIT 1
+            )
+            ORDER BY c.position
+        """, (environment.name, object_name))
+        return [json.loads(document) for (document,) in rows]
+
+    def import_json(self, json_file_path: str) -> int:
+        """
+        Replaces the contents of the store with an object data JSON file.
+
+        Returns:
+            int: The number of objects imported.
+        """
+        with open(json_file_path, "r", encoding='utf-8') as file:
+            data = json.load(file)
+        imported = self.load_data(data)
+        logging.info(f"Imported {imported} objects from {json_file_path} into {self.database_file_path}")
+        return imported
+
+    def load_data(self, data: dict) -> int:
+        """
+        Replaces the contents of the store with object data ({"root": [{"environment", "objects"}]}), whose
+        objects can be model objects, and commits.
+
+        Returns:
+            int: The number of objects loaded.
+        """
+        self.clear()
+        loaded = 0
+        for item in data.get("root", []):
+            environment = item.get("environment")
+            self._ensure_environment(environment)
+            for obj in item.get("objects", []):
+                self._insert_object(environment=environment, obj=_to_object(obj))
+                loaded += 1
+        self.commit()
+        return loaded
+
+    def get_data(self) -> dict:
+        """The whole store in the object data layout, as read_json_file returns object_data.json."""
+        return {"root": [{"environment": environment, "objects": list(self._iterate_documents(environment_key))}
+                         for environment_key, environment in self._get_environments()]}
+
+    def _get_environments(self) -> list[tuple[str, str]]:
+        return self._connection.execute(
+            "SELECT environment_key, environment FROM environments ORDER BY position").fetchall()
+
+    def _iterate_documents(self, environment_key: str):
+        rows = self._connection.execute(
+            "SELECT document FROM objects WHERE environment = ? ORDER BY object_id", (environment_key,))
+        for (document,) in rows:
+            yield json.loads(document)
+
+    def export_json(self, json_file_path: str):
+        """
+        Writes the store in the object data JSON layout, with the same indentation as json.dump(indent=4).
+        Objects are written one at a time, so memory does not grow with the number of objects.
+        """
+        temporary_file_path = f"{json_file_path}.tmp"
+        environments = self._get_environments()
+        with open(temporary_file_path, "w", encoding='utf-8') as file:
+            file.write('{\n    "root": [')
+            for environment_position, (environment_key, environment) in enumerate(environments):
+                file.write("," if environment_position else "")
+                file.write(f'\n        {{\n            "environment": {json.dumps(environment)},')
+                file.write('\n            "objects": [')
+                written = 0
+                for obj in self._iterate_documents(environment_key):
+                    object_text = json.dumps(obj, indent=4).replace("\n", "\n" + " " * 16)
+                    file.write(("," if written else "") + "\n" + " " * 16 + object_text)
+                    written += 1
+                file.write("\n            ]\n        }" if written else "]\n        }")
+            file.write("\n    ]\n}" if environments else "]\n}")
+        os.replace(temporary_file_path, json_file_path)
+        logging.info(f"Exported {self.database_file_path} to {json_file_path}")
+
+    def clear(self):
+        for child_table in OBJECT_CHILD_TABLES.values():
+            self._connection.execute(f"DELETE FROM {child_table}")
+        self._connection.execute("DELETE FROM dependencies")
+        self._connection.execute("DELETE FROM objects")
+        self._connection.execute("DELETE FROM environments")
+
+    def commit(self):
+        self._connection.commit()
+
+    def rollback(self):
+        self._connection.rollback()
+
+    def close(self):
+        self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.commit()
+        else:
+            self.rollback()
+        self.close()
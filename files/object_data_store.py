@@ -0,0 +1,258 @@
+import copy
+import json
+import logging
+import os
+
+from db.database_properties import DatabaseEnvironment, TableObject
+from tools.file_tools import read_json_file
+from tools.object_model_tools import encode_model
+
+# Object types whose dependencies are listed in the object data
+DEPENDENT_OBJECT_TYPES = ("PROCEDURE", "FUNCTION")
+
+_indexes = {}  # file path -> ((mtime, size), ObjectDataIndex)
+
+
+def _get_object_name(obj) -> str | None:
+    """Name of an object read from the file (a dict) or added as a model object."""
+    return obj.get("name") if isinstance(obj, dict) else obj.name
+
+
+def _get_flag_key(value) -> str:
+    """Flags such as "custom" are indexed as JSON text: they are not always booleans, some are lists."""
+    return json.dumps(value)
+
+
+class ObjectDataStore:
+    """
+    In-memory copy of an object data file ({"root": [{"environment", "objects"}]}).
+
+    The file is read once, objects are added or upserted in memory through a name-keyed index and the
+    whole file is written once on commit, to a temporary file that then replaces the original. Model objects
+    (tools.object_model_tools) are kept as they are and turned into dicts only while the file is written.
+    Used as a context manager, it commits when the block ends without an exception.
+    """
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        self._data = self._read()
+        self._indexes = {}  # environment name -> {object name -> first object with that name}
+        self._dirty = False
+
+    def _read(self) -> dict:
+        # A missing, empty or invalid file starts a new store
+        if os.path.exists(self.file_path) and os.path.getsize(self.file_path) > 0:
+            with open(self.file_path, "r", encoding='utf-8') as file:
+                try:
+                    return json.load(file)
+                except json.JSONDecodeError:
+                    pass
+        return {"root": []}
+
+    def _get_objects(self, environment: DatabaseEnvironment) -> list:
+        for env in self._data["root"]:
+            if env.get("environment").upper() == environment.name:
+                if "objects" not in env:
+                    env["objects"] = []
+                return env["objects"]
+
+        # Environment doesn't exist, add it
+        objects = []
+        self._data["root"].append({"environment": environment.value, "objects": objects})
+        return objects
+
+    def _get_index(self, environment: DatabaseEnvironment) -> dict:
+        index = self._indexes.get(environment.name)
+        if index is None:
+            index = {}
+            for obj in self._get_objects(environment):
+                index.setdefault(_get_object_name(obj), obj)
+            self._indexes[environment.name] = index
+        return index
+
+    def add(self, environment: DatabaseEnvironment, new_json_data):
+        """
+        Appends an object, a model object, a list of them or their JSON string, even if objects with that name
+        exist.
+        """
+        new_metadata = json.loads(new_json_data) if isinstance(new_json_data, str) else new_json_data
+        new_objects = new_metadata if isinstance(new_metadata, list) else [new_metadata]
+        self._get_objects(environment).extend(new_objects)
+        if environment.name in self._indexes:
+            for obj in new_objects:
+                self._indexes[environment.name].setdefault(_get_object_name(obj), obj)
+        self._dirty = True
+
+    def upsert(self, environment: DatabaseEnvironment, new_json_data):
+        """Updates the first object with the same name, or appends the object if there is none."""
+        new_metadata = json.loads(new_json_data) if isinstance(new_json_data, str) else new_json_data
+        object_name = _get_object_name(new_metadata)  # Assuming objects have a unique "name" field
+
+        index = self._get_index(environment)
+        existing_object = index.get(object_name)
+        if existing_object is None:
+            self._get_objects(environment).append(new_metadata)
+            index[object_name] = new_metadata
+        else:
+            new_values = new_metadata if isinstance(new_metadata, dict) else encode_model(new_metadata)
+            if isinstance(existing_object, dict):
+                existing_object.update(new_values)
+            else:
+                # A model object is merged as a dict, in the same position
+                merged_object = existing_object.to_dict()
+                merged_object.update(new_values)
+                objects = self._get_objects(environment)
+                objects[next(i for i, obj in enumerate(objects) if obj is existing_object)] = merged_object
+                index[object_name] = merged_object
+        self._dirty = True
+
+    def get(self, environment: DatabaseEnvironment, object_name: str):
+        """The first object with that name: a dict, or the model object it was added as."""
+        return self._get_index(environment).get(object_name)
+
+    def commit(self):
+        """Writes the file if anything changed since it was read or last committed."""
+        if not self._dirty:
+            return
+        temporary_file_path = f"{self.file_path}.tmp"
+        with open(temporary_file_path, "w", encoding='utf-8') as file:
+            json.dump(self._data, file, indent=4, default=encode_model)
+        os.replace(temporary_file_path, self.file_path)
+        invalidate_object_data_index(self.file_path)
+        self._dirty = False
+        logging.info(f"Object data written to {self.file_path}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.commit()
+
+
+class ObjectDataIndex:
+    """
+    Read-only indexes over the contents of an object data file, built in one pass: objects by environment,
+    type and name, object names by type and custom flag, dependency names of procedures and functions,
+    dependency names of tables (triggers) and the reverse index dependency name -> dependents.
+
+    Objects are returned as copies, so callers can change them without changing the index.
+    """
+
+    def __init__(self, data: dict):
+        # Ensure root exists and is a list
+        if 'root' not in data or not isinstance(data['root'], list):
+            raise ValueError("Invalid JSON structure: 'root' key not found or not a list.")
+
+        self._objects = {}  # ENVIRONMENT -> [object]
+        self._by_type = {}  # ENVIRONMENT -> type -> [object]
+        self._by_name = {}  # ENVIRONMENT -> name -> last object with that name
+        self._by_type_and_name = {}  # ENVIRONMENT -> type -> name -> last object with that name
+        self._object_names = {}  # ENVIRONMENT -> (type, custom) -> {NAME}
+        self._dependency_names = {}  # ENVIRONMENT -> (dependency kind, custom) -> {NAME}
+        self._table_dependency_names = {}  # ENVIRONMENT -> TableObject value -> {NAME}
+        self._dependents = {}  # ENVIRONMENT -> DEPENDENCY NAME -> [dependent object name]
+
+        for item in data['root']:
+            environment = item.get('environment', '').upper()
+            for obj in item.get('objects', []):
+                self._add_object(environment=environment, obj=obj)
+
+    def _add_object(self, environment: str, obj: dict):
+        object_type = obj.get("type")
+        name = obj.get("name")
+        self._objects.setdefault(environment, []).append(obj)
+        self._by_type.setdefault(environment, {}).setdefault(object_type, []).append(obj)
+        if name:
+            self._by_name.setdefault(environment, {})[name] = obj
+            self._by_type_and_name.setdefault(environment, {}).setdefault(object_type, {})[name] = obj
+            self._object_names.setdefault(environment, {}).setdefault(
+                (object_type, _get_flag_key(obj.get('custom'))), set()).add(name.upper())
+
+        if object_type == "TABLE":
+            table_dependency_names = self._table_dependency_names.setdefault(environment, {})
+            for table_object in TableObject:
+                for dependency in obj.get(table_object.value) or []:
+                    table_dependency_names.setdefault(table_object.value, set()).add(dependency.get('name').upper())
+
+        dependencies = obj.get('dependencies', {})
+        if not isinstance(dependencies, dict):
+            return
+        dependents = self._dependents.setdefault(environment, {})
+        dependency_names = self._dependency_names.setdefault(environment, {})
+        for dependency_kind, dependency_objects in dependencies.items():
+            for dependency in dependency_objects or []:
+                dependency_name = (dependency.get('name') or '').upper()
+                if not dependency_name:
+                    continue
+                dependents.setdefault(dependency_name, []).append(name)
+                if object_type in DEPENDENT_OBJECT_TYPES:
+                    dependency_names.setdefault((dependency_kind, _get_flag_key(dependency.get('custom'))),
+                                                set()).add(dependency_name)
+
+    def get_objects(self, environment: DatabaseEnvironment) -> list[dict]:
+        return copy.deepcopy(self._objects.get(environment.name, []))
+
+    def get_names(self, environment: DatabaseEnvironment) -> list[str]:
+        return [obj.get("name", "") for obj in self._objects.get(environment.name, [])]
+
+    def get_objects_by_type(self, environment: DatabaseEnvironment, object_type: str) -> list[dict]:
+        return copy.deepcopy(self._by_type.get(environment.name, {}).get(object_type, []))
+
+    def get_objects_mapped_by_name(self, environment: DatabaseEnvironment, object_type: str | None = None) -> dict:
+        """Objects with a name, keyed by name; the last object wins when a name is repeated."""
+        if object_type is None:
+            return copy.deepcopy(self._by_name.get(environment.name, {}))
+        return copy.deepcopy(self._by_type_and_name.get(environment.name, {}).get(object_type, {}))
+
+    def get_object_names(self, environment: DatabaseEnvironment, object_type: str, custom) -> set[str]:
+        """Upper-cased names of the objects of a type whose "custom" flag equals custom."""
+        return set(self._object_names.get(environment.name, {}).get((object_type, _get_flag_key(custom)), ()))
+
+    def get_dependency_names(self, environment: DatabaseEnvironment, dependency_kind: str,
+                             is_custom: bool | None = None) -> set[str]:
+        """
+        Upper-cased names of the dependencies of one kind ("tables", "functions", ...) of the procedures and
+        functions, only those whose "custom" flag equals is_custom unless it is None.
+        """
+        dependency_names = self._dependency_names.get(environment.name, {})
+        names = set()
+        for (kind, custom), kind_names in dependency_names.items():
+            if kind == dependency_kind and (is_custom is None or custom == _get_flag_key(is_custom)):
+                names.update(kind_names)
+        return names
+
+    def get_table_dependency_names(self, environment: DatabaseEnvironment, table_object_type: TableObject) -> set[str]:
+        """Upper-cased names listed under a table attribute, e.g. "triggers", of every table."""
+        return set(self._table_dependency_names.get(environment.name, {}).get(table_object_type.value, ()))
+
+    def get_dependents(self, environment: DatabaseEnvironment, dependency_name: str) -> list[str]:
+        """Names of the objects that list dependency_name among their dependencies."""
+        return list(dict.fromkeys(self._dependents.get(environment.name, {}).get(dependency_name.upper(), [])))
+
+
+def get_object_data_index(file_path: str) -> ObjectDataIndex:
+    """
+    Returns the indexes of an object data file, built once and rebuilt only when the file changes.
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+        ValueError: If the file is not valid JSON or has no root list.
+    """
+    try:
+        file_stat = os.stat(file_path)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"The file '{file_path}' was not found.")
+    file_stamp = (file_stat.st_mtime_ns, file_stat.st_size)
+
+    cached = _indexes.get(file_path)
+    if cached is not None and cached[0] == file_stamp:
+        return cached[1]
+
+    object_data_index = ObjectDataIndex(read_json_file(file_path))
+    _indexes[file_path] = (file_stamp, object_data_index)
+    return object_data_index
+
+
+def invalidate_object_data_index(file_path: str):
+    _indexes.pop(file_path, None)
@@ -0,0 +1,125 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import time
+
+from tools.pattern_matching_tools import SCANNER_VERSION
+
+SCAN_CACHE_FILE_PATH = "../workfiles/scan_cache.sqlite"
+SCAN_CACHE_MAX_ENTRIES = 50000
+
+
+def get_scan_cache_file_path() -> str:
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    return os.path.join(script_dir, SCAN_CACHE_FILE_PATH)
+
+
+def compute_scan_cache_key(file_path: str) -> str:
+    """
+    Builds the cache key of a source code file: the SHA-256 of its contents plus the scanner version,
+    so a scanner change invalidates every entry.
+    """
+    with open(file_path, mode='rb') as file:
+        content_hash = hashlib.sha256(file.read()).hexdigest()
+    return f"{SCANNER_VERSION}:{content_hash}"
+
+
+class ScanCache:
+    """
+    Persistent cache of source code scan results keyed by file content, stored in a SQLite file.
+
+    The least recently used entries are evicted when the cache grows beyond max_entries.
+    """
+
+    def __init__(self, cache_file_path: str | None = None, max_entries: int = SCAN_CACHE_MAX_ENTRIES):
+        self.cache_file_path = cache_file_path or get_scan_cache_file_path()
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._connection = sqlite3.connect(self.cache_file_path)
+        self._connection.execute("""
+            CREATE TABLE IF NOT EXISTS scan_cache (
+                cache_key TEXT PRIMARY KEY,
+                scan_result TEXT NOT NULL,
+                last_access REAL NOT NULL
+            )
+        """)
+        self._connection.execute("CREATE INDEX IF NOT EXISTS scan_cache_last_access ON scan_cache (last_access)")
+        self._connection.commit()
+
+    def get_many(self, cache_keys: list[str]) -> dict[str, dict]:
+        """
+        Returns the cached scan results found for the given keys and refreshes their last access time.
+        """
+        unique_keys = list(dict.fromkeys(cache_keys))
+        found = {}
+        # SQLite limits the number of host parameters per statement
+        for start in range(0, len(unique_keys), 500):
+            chunk = unique_keys[start:start + 500]
+            placeholders = ", ".join("?" for _ in chunk)
+            rows = self._connection.execute(
+                f"SELECT cache_key, scan_result FROM scan_cache WHERE cache_key IN ({placeholders})", chunk)
+            for cache_key, scan_result in rows:
+                found[cache_key] = json.loads(scan_result)
+
+        now = time.time()
+        self._connection.executemany("UPDATE scan_cache SET last_access = ? WHERE cache_key = ?",
+                                     [(now, cache_key) for cache_key in found])
+        self._connection.commit()
+
+        self.hits += sum(1 for cache_key in cache_keys if cache_key in found)
+        self.misses += sum(1 for cache_key in cache_keys if cache_key not in found)
+        return found
+
+    def put_many(self, scan_results: dict[str, dict]) -> None:
+        """
+        Stores scan results by cache key, then evicts the oldest entries over the size limit.
+        """
+        if not scan_results:
+            return
+        now = time.time()
+        self._connection.executemany(
+            "INSERT OR REPLACE INTO scan_cache (cache_key, scan_result, last_access) VALUES (?, ?, ?)",
+            [(cache_key, json.dumps(scan_result), now) for cache_key, scan_result in scan_results.items()])
+        self._connection.commit()
+        self.evict()
+
+    def evict(self) -> int:
+        """
+        Removes the least recently used entries beyond max_entries.
+
+        Returns:
+            int: The number of evicted entries.
+        """
+        (entries,) = self._connection.execute("SELECT COUNT(*) FROM scan_cache").fetchone()
+        excess = entries - self.max_entries
+        if excess <= 0:
+            return 0
+        self._connection.execute("""
+            DELETE FROM scan_cache WHERE cache_key IN (
+                SELECT cache_key FROM scan_cache ORDER BY last_access LIMIT ?
+            )
+        """, (excess,))
+        self._connection.commit()
+        logging.info(f"Scan cache evicted {excess} entries")
+        return excess
+
+    def clear(self) -> None:
+        self._connection.execute("DELETE FROM scan_cache")
+        self._connection.commit()
+
+    def get_stats(self) -> dict:
+        (entries,) = self._connection.execute("SELECT COUNT(*) FROM scan_cache").fetchone()
+        return {"hits": self.hits, "misses": self.misses, "entries": entries}
+
+    def close(self) -> None:
+        logging.info(f"Scan cache stats: {self.get_stats()}")
+        self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -1,16 +1,23 @@
+import logging
+import os
 import re
+from concurrent.futures import ProcessPoolExecutor
 from typing import Dict, List
 
+from db.catalog_snapshot import get_catalog_snapshot
 from db.database_properties import DatabaseEnvironment
-from db.datasource.packages_datasource import find_if_packages_exist
-from db.oracle_database_tools import is_oracle_built_in_object, OracleDBConnectionPool
-from tools.pattern_matching_tools import extract_select_tables, extract_insert_tables, extract_update_tables, \
-    extract_delete_tables, extract_type_declarations, extract_functions, extract_local_functions, extract_procedures, \
-    extract_sequences, extract_independent_packages
+from db.oracle_database_tools import is_oracle_built_in_object
+from db.recorded_pool import get_connection_pool
+from files.scan_cache_file import ScanCache, compute_scan_cache_key
+from tools.pattern_matching_tools import scan_dependency_candidates, filter_function_matches, \
+    filter_procedure_matches
 
 B7_SOURCE_CODE_FOLDER = "../workfiles/b7_sources"
 B9_SOURCE_CODE_FOLDER = "../workfiles/b9_sources"
 
+SCAN_MAX_WORKERS = os.cpu_count() or 1
+SCAN_CHUNK_SIZE = 16
+
 
 def get_source_code_folder(database_environment: DatabaseEnvironment = DatabaseEnvironment.BANNER7) -> str:
     if database_environment == DatabaseEnvironment.BANNER7:
@@ -41,68 +48,74 @@ def _remove_single_lines_comments(source_code):
     return re.sub(r"--.*", "", source_code)
 
 
+def find_existing_packages(package_names: set[str]) -> set[str]:
+    """
+    Checks which of the given package names exist in the Banner 9 database, using its catalog snapshot.
+
+    Args:
+        package_names (set[str]): Candidate package names.
+
+    Returns:
+        set[str]: The upper-cased package names that exist.
+    """
+    if not package_names:
+        return set()
+    db_pool_banner9 = get_connection_pool(database_name=DatabaseEnvironment.BANNER9)
+    return get_catalog_snapshot(db_pool=db_pool_banner9).find_existing_packages(package_names)
+
+
+def confirm_package_candidates(package_candidates: List[Dict], existing_packages: set[str]) -> List[str]:
+    """
+    Keeps the package candidates whose package exists, formatted as PACKAGE.OBJECT_NAME.
+    """
+    confirmed_packages = []
+    for candidate in package_candidates:
+        if candidate['package'].upper() in existing_packages:
+            confirmed_package_formatted = f"{candidate['package'].upper()}.{candidate['object_name'].upper()}"
+            confirmed_packages.append(confirmed_package_formatted)
+    return confirmed_packages
+
+
 def filter_independent_packages_candidates(package_candidates: List[Dict]) -> List[str]:
     if not package_candidates:
         return []
     ## package_candidates -> "package", "object_name"
-    db_pool_banner9 = OracleDBConnectionPool(database_name=DatabaseEnvironment.BANNER9)
 
     # Get unique package names
     unique_packages = {p["package"] for p in package_candidates}
 
-    # Find existing packages (returns list of tuples: (owner, package_name))
-    ## unique_packages -> package LIST
-    packages_exist = find_if_packages_exist(
-        db_pool=db_pool_banner9,
-        package_candidates=list(unique_packages)
-    )
-
-    ## package LIST (that exist)
-    ## filter package_candidates using packages_exist -> existing_packages dict
-    ## join package+object_name in a list
-
     # Create a set of existing package names (ignoring owners)
-    existing_packages = {package_name for (package_name,) in packages_exist}
+    existing_packages = find_existing_packages(package_names=unique_packages)
 
     # Return package.object_name for candidates where package exists
-    confirmed_packages = []
-    for candidate in package_candidates:
-        if candidate['package'].upper() in existing_packages:
-            confirmed_package_formatted = f"{candidate['package'].upper()}.{candidate['object_name'].upper()}"
-            confirmed_packages.append(confirmed_package_formatted)
-    return confirmed_packages
+    return confirm_package_candidates(package_candidates=package_candidates, existing_packages=existing_packages)
 
 
-def extract_all_dependencies_from_one_source_code_data(source_code_lines: [str]) -> dict:
+def scan_source_code_dependencies(source_code_lines: [str]) -> dict:
+    """
+    Extracts every dependency that can be found without a database connection.
+
+    Package candidates are returned unconfirmed under "PACKAGE_CANDIDATES" so the caller can
+    check them against the database in one batch.
+    """
     source_code = clean_comments_and_whitespace(source_code_lines)
 
-    # Find all tables
-    select_tables = extract_select_tables(source_code)
-    insert_tables = extract_insert_tables(source_code)
-    update_tables = extract_update_tables(source_code)
-    delete_tables = extract_delete_tables(source_code)
-    type_tables = extract_type_declarations(source_code)
+    # Tokenize once and collect every dependency category
+    candidates = scan_dependency_candidates(source_code)
 
     # Combine all unique table names
-    all_tables = set(select_tables + insert_tables + update_tables + delete_tables + type_tables)
+    all_tables = set(candidates["tables"])
     user_defined_tables = {table.upper() for table in all_tables if not is_oracle_built_in_object(table)}
 
     # Find all global functions
-    all_functions = extract_functions(source_code)
-    local_functions = extract_local_functions(source_code)
+    all_functions = filter_function_matches(candidates["general_matches"])
+    local_functions = candidates["local_functions"]
 
     # Find all procedures
-    procedures = extract_procedures(source_code)
+    procedures = filter_procedure_matches(candidates["general_matches"])
 
     # Find all sequences
-    sequences = extract_sequences(source_code)
-
-    # Find independent packages
-    packages = extract_independent_packages(source_code)
-    independent_packages = []
-    if packages:
-        filtered_independent_packages = filter_independent_packages_candidates(package_candidates=packages)
-        independent_packages.extend(filtered_independent_packages)
+    sequences = candidates["sequences"]
 
     return {
         "TABLE": sorted(user_defined_tables),
@@ -110,5 +123,106 @@ def extract_all_dependencies_from_one_source_code_data(source_code_lines: [str])
         "LOCAL_FUNCTION": sorted(local_functions),
         "SEQUENCE": sorted(sequences),
         "PROCEDURE": sorted(procedures),
-        "PACKAGES": sorted(independent_packages)
+        "PACKAGE_CANDIDATES": candidates["package_candidates"]
+    }
+
+
+def complete_source_code_dependencies(scanned_dependencies: dict, existing_packages: set[str]) -> dict:
+    """
+    Builds the final dependency map of a scanned source, keeping only the packages that exist.
+    """
+    dependencies = {key: value for key, value in scanned_dependencies.items() if key != "PACKAGE_CANDIDATES"}
+    independent_packages = confirm_package_candidates(package_candidates=scanned_dependencies["PACKAGE_CANDIDATES"],
+                                                      existing_packages=existing_packages)
+    dependencies["PACKAGES"] = sorted(independent_packages)
+    return dependencies
+
+
+def extract_all_dependencies_from_one_source_code_data(source_code_lines: [str]) -> dict:
+    scanned_dependencies = scan_source_code_dependencies(source_code_lines)
+
+    # Find independent packages
+    packages = scanned_dependencies["PACKAGE_CANDIDATES"]
+    existing_packages = find_existing_packages(package_names={p["package"] for p in packages})
+
+    return complete_source_code_dependencies(scanned_dependencies=scanned_dependencies,
+                                             existing_packages=existing_packages)
+
+
+def scan_source_code_file(file_path: str) -> dict:
+    """
+    Reads one source code file and scans it. Runs inside the worker processes, so it must not touch the database.
+
+    Returns:
+        dict: "first_line" (upper-cased, None for an empty file) and "dependencies" (see scan_source_code_dependencies).
+    """
+    with open(file_path, mode='r', encoding='utf-8') as file:
+        source_code_lines = file.readlines()
+
+    if not source_code_lines:
+        return {"first_line": None, "dependencies": None}
+
+    return {
+        "first_line": source_code_lines[0].strip().upper(),
+        "dependencies": scan_source_code_dependencies(source_code_lines)
     }
+
+
+def scan_source_code_files(file_paths: list[str], max_workers: int | None = SCAN_MAX_WORKERS,
+                           chunk_size: int = SCAN_CHUNK_SIZE, scan_cache: ScanCache | None = None) -> list[dict]:
+    """
+    Scans many source code files on a process pool.
+
+    Args:
+        file_paths (list[str]): Files to scan.
+        max_workers (int | None): Worker processes, 1 scans in the current process.
+        chunk_size (int): Files sent to a worker at a time.
+        scan_cache (ScanCache | None): When given, files with unchanged contents are taken from the cache
+            and only the rest are scanned.
+
+    Returns:
+        list[dict]: One scan result per file, in the same order as file_paths.
+    """
+    if not file_paths:
+        return []
+    if scan_cache is None:
+        return _scan_source_code_files(file_paths=file_paths, max_workers=max_workers, chunk_size=chunk_size)
+
+    cache_keys = [compute_scan_cache_key(file_path) for file_path in file_paths]
+    cached_results = scan_cache.get_many(cache_keys)
+
+    missing_files = {}
+    for file_path, cache_key in zip(file_paths, cache_keys):
+        if cache_key not in cached_results and cache_key not in missing_files:
+            missing_files[cache_key] = file_path
+
+    new_results = dict(zip(missing_files.keys(),
+                           _scan_source_code_files(file_paths=list(missing_files.values()),
+                                                   max_workers=max_workers,
+                                                   chunk_size=chunk_size)))
+    scan_cache.put_many(new_results)
+    logging.info(f"Scanned {len(new_results)} source code files, {len(file_paths) - len(missing_files)} from cache")
+
+    return [cached_results[cache_key] if cache_key in cached_results else new_results[cache_key]
+            for cache_key in cache_keys]
+
+
+def _scan_source_code_files(file_paths: list[str], max_workers: int | None, chunk_size: int) -> list[dict]:
+    if not file_paths:
+        return []
+    if max_workers == 1 or len(file_paths) == 1:
+        return [scan_source_code_file(file_path) for file_path in file_paths]
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(scan_source_code_file, file_paths, chunksize=max(1, chunk_size)))
+
+
+def resolve_scanned_package_candidates(scan_results: list[dict]) -> set[str]:
+    """
+    Collects the package candidates of every scanned file and checks them against the database in one batch.
+    """
+    package_names = set()
+    for scan_result in scan_results:
+        if scan_result["dependencies"]:
+            package_names.update(p["package"] for p in scan_result["dependencies"]["PACKAGE_CANDIDATES"])
+    return find_existing_packages(package_names=package_names)
@@ -44,7 +44,18 @@ def create_config_json():
                 "port": "***",
                 "service_name": "***",
                 "environment": "dev",
-                "schema": "***"
+                "schema": "***",
+                "pool": {
+                    "min": 1,
+                    "max": 5,
+                    "increment": 1,
+                    "stmtcachesize": 50,
+                    "ping_interval": 60,
+                    "wait_timeout": 0,
+                    "arraysize": 500,
+                    "prefetchrows": 500,
+                    "session_init": []
+                }
             }
         },
         {
@@ -56,7 +67,18 @@ def create_config_json():
                 "port": "***",
                 "service_name": "***",
                 "environment": "dev",
-                "schema": "***"
+                "schema": "***",
+                "pool": {
+                    "min": 1,
+                    "max": 5,
+                    "increment": 1,
+                    "stmtcachesize": 50,
+                    "ping_interval": 60,
+                    "wait_timeout": 0,
+                    "arraysize": 500,
+                    "prefetchrows": 500,
+                    "session_init": []
+                }
             }
         }
     ]
@@ -0,0 +1,46 @@
+import gc
+import tracemalloc
+
+from files.object_data_file import _convert_dependencies_file_to_json_object
+
+SIZES = [1000, 3000]
+DEPENDENCIES_PER_OBJECT = 12
+
+
+def build_dependencies_data(size: int) -> list[dict]:
+    """Procedures with a dozen table, function, sequence and procedure dependencies each."""
+    rows = []
+    kinds = [("TABLE", None), ("FUNCTION", "TZPKUTIL"), ("SEQUENCE", None), ("PROCEDURE", "TZPKLOG")]
+    for i in range(size):
+        for j in range(DEPENDENCIES_PER_OBJECT):
+            dependency_type, dependency_package = kinds[j % len(kinds)]
+            rows.append({"STATUS": "INSTALL", "OBJECT_OWNER": "UVM", "OBJECT_TYPE": "PROCEDURE",
+                         "OBJECT_PACKAGE": None, "OBJECT_NAME": f"TZPR{i:05d}", "DEPENDENCY_TYPE": dependency_type,
+                         "DEPENDENCY_NAME": f"TZ{dependency_type[:2]}{(i * 7 + j) % 500:04d}",
+                         "DEPENDENCY_PACKAGE": dependency_package})
+    return rows
+
+
+def measure(build) -> tuple[int, object]:
+    """Bytes still allocated by what build() returns."""
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size, result
+
+
+def run_benchmark():
+    for size in SIZES:
+        dependencies_data = build_dependencies_data(size)
+        model_size, object_data = measure(lambda: _convert_dependencies_file_to_json_object(dependencies_data))
+        objects = object_data["root"][0]["objects"]
+        dict_size, _ = measure(lambda: [obj.to_dict() for obj in objects])
+        print(f"{size:>6} objects  model objects: {model_size / 1024 / 1024:6.2f} MB  "
+              f"as dicts: {dict_size / 1024 / 1024:6.2f} MB  ratio: {model_size / dict_size:.2f}")
+
+
+if __name__ == "__main__":
+    run_benchmark()
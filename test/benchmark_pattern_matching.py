@@ -0,0 +1,74 @@
+import logging
+import time
+
+from files.source_code_file import clean_comments_and_whitespace
+from tools.pattern_matching_tools import scan_dependency_candidates, match_general_pattern, extract_select_tables
+
+logger = logging.getLogger(__name__)
+
+SIZES = [1000, 2000, 4000, 8000, 16000]
+
+
+def build_long_select_list(size: int) -> list[str]:
+    """SELECT with a huge column list and no FROM."""
+    return ["SELECT col_a,"] + [f"  col_{i}," for i in range(size)] + ["  col_z INTO v_x;"]
+
+
+def build_calls_without_semicolon(size: int) -> list[str]:
+    """Many PACKAGE.OBJECT( calls and no statement end at all."""
+    return [f"  v_{i} := pk_util.f_get({i}) +" for i in range(size)]
+
+
+def build_unbalanced_parentheses(size: int) -> list[str]:
+    """Calls whose parentheses are never closed before the semicolon."""
+    return [f"  pk_util.p_do_it(a, (b, f_x({i});" for i in range(size)]
+
+
+def build_realistic_body(size: int) -> list[str]:
+    lines = []
+    for i in range(size // 4):
+        lines.append(f"  SELECT a, b INTO v_a, v_b FROM sztb_{i} WHERE c = pk_util.f_get({i});")
+        lines.append(f"  pk_log.p_write('step {i}');")
+        lines.append(f"  INSERT INTO tzbt_{i} (a) VALUES (tzseq_{i}.NEXTVAL);")
+        lines.append(f"  v_rec_{i} gb_common.rec_type;")
+    return lines
+
+
+def measure(function, source_code: str) -> float:
+    start = time.perf_counter()
+    function(source_code)
+    return time.perf_counter() - start
+
+
+def run_benchmark():
+    cases = {
+        "long select list": build_long_select_list,
+        "calls without semicolon": build_calls_without_semicolon,
+        "unbalanced parentheses": build_unbalanced_parentheses,
+        "realistic body": build_realistic_body,
+    }
+    matchers = {
+        "scan_dependency_candidates": scan_dependency_candidates,
+        "match_general_pattern": match_general_pattern,
+        "extract_select_tables": extract_select_tables,
+    }
+    for case_name, builder in cases.items():
+        for matcher_name, matcher in matchers.items():
+            timings = []
+            for size in SIZES:
+                source_code = clean_comments_and_whitespace(builder(size))
+                timings.append((len(source_code), measure(matcher, source_code)))
+
+            # time per character should stay flat when the scan is linear
+            first_length, first_time = timings[0]
+            last_length, last_time = timings[-1]
+            growth = (last_time / max(first_time, 1e-9)) / (last_length / first_length)
+            print(f"{case_name:<25} {matcher_name:<28} "
+                  + " ".join(f"{length:>8}:{elapsed * 1000:8.2f}ms" for length, elapsed in timings)
+                  + f"  growth vs linear: {growth:.2f}")
+
+
+if __name__ == "__main__":
+    # the procedure/function filters log every match
+    logging.disable(logging.INFO)
+    run_benchmark()
@@ -0,0 +1,28 @@
+import json
+
+import pytest
+
+
+@pytest.fixture
+def make_procedure():
+    """Builds a procedure of the object data with the given table and function dependencies."""
+
+    def make(name: str, tables: list[dict], functions: list[dict] | None = None) -> dict:
+        return {"object_status": "INSTALL", "origin": "DEPENDENCY", "type": "PROCEDURE", "owner": "UVM",
+                "package": None, "name": name, "dependencies": {"tables": tables, "functions": functions or [],
+                                                                "sequences": [], "procedures": []}}
+
+    return make
+
+
+@pytest.fixture
+def write_object_data_file():
+    """Writes an object data file as json.dump(indent=4) does; a list of objects is written as banner9's."""
+
+    def write(file_path, data: dict | list[dict]):
+        if isinstance(data, list):
+            data = {"root": [{"environment": "banner9", "objects": data}]}
+        with open(file_path, "w", encoding='utf-8') as file:
+            json.dump(data, file, indent=4)
+
+    return write
@@ -0,0 +1,41 @@
+import pytest
+
+from files.object_addons_file import ObjectAddonRegistry, ObjectAddonType, GrantType
+
+ADDONS_DATA = {"root": {
+    "synonym": {"create": "CREATE PUBLIC SYNONYM {object} FOR UVM.{object};",
+                "drop": "DROP PUBLIC SYNONYM {object}"},
+    "grants": {"table": {"scripts": "GRANT SELECT ON {owner}.{prefix}TB{base} TO {schema};",
+                         "schema": ["BANINST1", "SATURN"]}},
+    "setup_grants": {"table": {"schema": ["BANINST1"]}},
+    "revokes": {"table": {"schema": ["BANINST1"]}},
+}}
+
+
+def test_templates_are_rendered_and_returned_as_copies():
+    registry = ObjectAddonRegistry(ADDONS_DATA)
+
+    grants = registry.get(object_addon_type=ObjectAddonType.GRANTS, b9_object_name="TZTBFDOCE",
+                          b9_object_owner="UVM", grant_type=GrantType.TABLE)
+    assert grants == {"grants": ["GRANT SELECT ON UVM.TZTBFDOCE TO BANINST1;",
+                                 "GRANT SELECT ON UVM.TZTBFDOCE TO SATURN;"]}
+
+    grants["grants"].append("GRANT ALL ON UVM.TZTBFDOCE TO PUBLIC;")
+    assert len(registry.get(object_addon_type=ObjectAddonType.GRANTS, b9_object_name="TZTBFDOCE",
+                            b9_object_owner="UVM", grant_type=GrantType.TABLE)["grants"]) == 2
+    assert registry.get(object_addon_type=ObjectAddonType.DROP_SYNONYMS,
+                        b9_object_name="TZTBFDOCE") == "DROP PUBLIC SYNONYM TZTBFDOCE"
+
+
+def test_section_without_scripts_only_fails_its_own_addon():
+    registry = ObjectAddonRegistry(ADDONS_DATA)
+
+    assert registry.get(object_addon_type=ObjectAddonType.SYNONYMS,
+                        b9_object_name="TZTBFDOCE") == "CREATE PUBLIC SYNONYM TZTBFDOCE FOR UVM.TZTBFDOCE;"
+    for object_addon_type in (ObjectAddonType.SETUP_GRANTS, ObjectAddonType.REVOKES):
+        with pytest.raises(ValueError, match="No 'table' script"):
+            registry.get(object_addon_type=object_addon_type, b9_object_name="TZTBFDOCE", b9_object_owner="UVM",
+                         grant_type=GrantType.TABLE)
+    with pytest.raises(ValueError, match="No 'create' script under 'setup_synonym'"):
+        registry.get(object_addon_type=ObjectAddonType.SETUP_SYNONYMS, b9_object_name="TZTBFDOCE",
+                     b9_object_owner="UVM")
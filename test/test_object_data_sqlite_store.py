@@ -0,0 +1,127 @@
+import json
+
+import pytest
+
+from db.database_properties import DatabaseEnvironment, TableObject
+from files import object_data_backend
+from files.object_data_backend import get_object_data_reader, open_object_data_store, read_object_data, \
+    write_object_data
+from files.object_data_sqlite_store import SQLiteObjectDataStore
+from files.object_data_store import ObjectDataIndex
+from tools.object_model_tools import DependencyRef, MigrationObject, TableMeta
+
+
+@pytest.fixture
+def object_data(make_procedure) -> dict:
+    return {"root": [
+        {"environment": "banner9", "objects": [
+            make_procedure("TZPRONE", [{"type": "TABLE", "name": "tztbone", "custom": [True]},
+                                       {"type": "TABLE", "name": "SPRIDEN", "custom": False}],
+                           functions=[{"type": "FUNCTION", "name": "F_GET", "package": "TZPKUTIL", "custom": True}]),
+            make_procedure("TZPRTWO", [{"type": "TABLE", "name": "TZTBONE", "custom": True}]),
+            {"name": "TZTBONE", "type": "TABLE", "owner": "UVM", "custom": [True],
+             "columns": [{"name": "TZTBONE_ID", "type": "NUMBER", "nullable": False}],
+             "triggers": [{"name": "tztrone", "event": "BEFORE INSERT"}]},
+            {"name": "SPRIDEN", "type": "TABLE", "owner": "SATURN", "custom": False, "triggers": []},
+            {"name": "TZSEONE", "type": "SEQUENCE", "owner": "UVM", "custom": True, "comment": "Ñandú"},
+        ]},
+        {"environment": "banner7", "objects": []},
+    ]}
+
+
+def test_export_writes_the_imported_file_unchanged(tmp_path, object_data, write_object_data_file):
+    json_file_path = tmp_path / "object_data.json"
+    exported_file_path = tmp_path / "exported_object_data.json"
+    write_object_data_file(json_file_path, object_data)
+
+    with SQLiteObjectDataStore(str(tmp_path / "object_data.sqlite")) as object_data_store:
+        assert object_data_store.import_json(str(json_file_path)) == 5
+        object_data_store.export_json(str(exported_file_path))
+        assert object_data_store.get_data() == object_data
+
+    assert exported_file_path.read_bytes() == json_file_path.read_bytes()
+
+
+def test_empty_store_is_exported_as_an_empty_root(tmp_path):
+    exported_file_path = tmp_path / "object_data.json"
+    with SQLiteObjectDataStore(str(tmp_path / "object_data.sqlite")) as object_data_store:
+        object_data_store.export_json(str(exported_file_path))
+
+    assert exported_file_path.read_text(encoding='utf-8') == json.dumps({"root": []}, indent=4)
+
+
+def test_queries_answer_like_the_object_data_index(tmp_path, object_data):
+    environment = DatabaseEnvironment.BANNER9
+    object_data_index = ObjectDataIndex(object_data)
+
+    with SQLiteObjectDataStore(str(tmp_path / "object_data.sqlite")) as object_data_store:
+        object_data_store.load_data(object_data)
+
+        for store in (object_data_index, object_data_store):
+            assert store.get_object_names(environment, "TABLE", [True]) == {"TZTBONE"}
+            assert store.get_object_names(environment, "TABLE", (True,)) == {"TZTBONE"}
+            assert store.get_object_names(environment, "TABLE", True) == set()
+            assert store.get_dependency_names(environment, "tables", is_custom=[True]) == {"TZTBONE"}
+            assert store.get_dependency_names(environment, "tables", is_custom=True) == {"TZTBONE"}
+            assert store.get_dependents(environment, "tztbone") == ["TZPRONE", "TZPRTWO"]
+            assert store.get_table_dependency_names(environment, TableObject.TRIGGER) == {"TZTRONE"}
+
+        assert object_data_store.get_objects(environment) == object_data_index.get_objects(environment)
+        assert object_data_store.get_names(environment) == object_data_index.get_names(environment)
+        assert object_data_store.get_objects(DatabaseEnvironment.BANNER7) == []
+        for object_type in ("TABLE", "PROCEDURE", "SEQUENCE"):
+            assert (object_data_store.get_objects_by_type(environment, object_type)
+                    == object_data_index.get_objects_by_type(environment, object_type))
+            assert (object_data_store.get_objects_mapped_by_name(environment, object_type)
+                    == object_data_index.get_objects_mapped_by_name(environment, object_type))
+        assert (object_data_store.get_dependency_names(environment, "functions")
+                == object_data_index.get_dependency_names(environment, "functions") == {"F_GET"})
+        assert object_data_store.get_children(environment, "TZTBONE", "columns") == [
+            {"name": "TZTBONE_ID", "type": "NUMBER", "nullable": False}]
+
+
+def test_model_objects_are_stored_in_the_object_data_layout(tmp_path):
+    procedure = MigrationObject(object_status="INSTALL", origin="DEPENDENCY", type="PROCEDURE", owner="UVM",
+                                package=None, name="TZPRONE")
+    procedure.add_dependency("tables", DependencyRef(type="TABLE", name="TZTBONE", custom=True))
+    table = TableMeta(object_status="INSTALL", origin="DEPENDENCY", name="TZTBONE", owner="UVM", custom=True)
+
+    with SQLiteObjectDataStore(str(tmp_path / "object_data.sqlite")) as object_data_store:
+        object_data_store.add(environment=DatabaseEnvironment.BANNER9, new_json_data=[procedure, table])
+        object_data_store.upsert(environment=DatabaseEnvironment.BANNER9, new_json_data={
+            "name": "TZTBONE", "grants": ["GRANT SELECT ON UVM.TZTBONE TO SATURN;"]})
+
+        assert object_data_store.get(DatabaseEnvironment.BANNER9, "TZPRONE") == procedure.to_dict()
+        assert object_data_store.get(DatabaseEnvironment.BANNER9, "TZTBONE") == dict(
+            table.to_dict(), grants=["GRANT SELECT ON UVM.TZTBONE TO SATURN;"])
+        assert object_data_store.get_dependents(DatabaseEnvironment.BANNER9, "TZTBONE") == ["TZPRONE"]
+
+
+def test_backend_comes_from_the_environment(tmp_path, monkeypatch, object_data):
+    json_file_path = str(tmp_path / "object_data.json")
+    monkeypatch.setattr(object_data_backend, "_readers", {})
+    monkeypatch.setenv(object_data_backend.OBJECT_DATA_BACKEND_VARIABLE, "sqlite")
+
+    with pytest.raises(FileNotFoundError):
+        get_object_data_reader(json_file_path)
+    write_object_data(json_data=object_data, file_path=json_file_path)
+    assert not (tmp_path / "object_data.json").exists()
+    assert read_object_data(json_file_path) == object_data
+
+    object_data_reader = get_object_data_reader(json_file_path)
+    assert isinstance(object_data_reader, SQLiteObjectDataStore)
+    assert get_object_data_reader(json_file_path) is object_data_reader
+    with open_object_data_store(json_file_path) as object_data_store:
+        object_data_store.upsert(environment=DatabaseEnvironment.BANNER9, new_json_data={
+            "name": "TZSEONE", "type": "SEQUENCE", "custom": False})
+    assert object_data_reader.get_object_names(DatabaseEnvironment.BANNER9, "SEQUENCE", False) == {"TZSEONE"}
+    object_data_reader.close()
+
+    monkeypatch.delenv(object_data_backend.OBJECT_DATA_BACKEND_VARIABLE)
+    write_object_data(json_data=object_data, file_path=json_file_path)
+    assert isinstance(get_object_data_reader(json_file_path), ObjectDataIndex)
+    assert read_object_data(json_file_path) == object_data
+
+    monkeypatch.setenv(object_data_backend.OBJECT_DATA_BACKEND_VARIABLE, "unknown")
+    with pytest.raises(ValueError, match="Unknown object data backend"):
+        open_object_data_store(json_file_path)
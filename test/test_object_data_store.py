@@ -0,0 +1,53 @@
+import os
+
+from db.database_properties import DatabaseEnvironment
+from files.object_data_store import ObjectDataIndex, get_object_data_index
+
+
+def test_custom_flag_as_list_is_indexed(tmp_path, write_object_data_file):
+    # migrate_b9_table_to_b9 writes "custom" as a one-element list
+    file_path = tmp_path / "migrated_object_data.json"
+    write_object_data_file(file_path, [
+        {"name": "TZTBLIST", "type": "TABLE", "owner": "UVM", "custom": [True]},
+        {"name": "TZTBBOOL", "type": "TABLE", "owner": "UVM", "custom": True},
+    ])
+
+    object_data_index = get_object_data_index(str(file_path))
+
+    assert object_data_index.get_object_names(DatabaseEnvironment.BANNER9, "TABLE", [True]) == {"TZTBLIST"}
+    assert object_data_index.get_object_names(DatabaseEnvironment.BANNER9, "TABLE", (True,)) == {"TZTBLIST"}
+    assert object_data_index.get_object_names(DatabaseEnvironment.BANNER9, "TABLE", True) == {"TZTBBOOL"}
+    assert set(object_data_index.get_objects_mapped_by_name(DatabaseEnvironment.BANNER9, "TABLE")) == {
+        "TZTBLIST", "TZTBBOOL"}
+
+
+def test_dependency_custom_flag_as_tuple_is_indexed(make_procedure):
+    object_data_index = ObjectDataIndex({"root": [{"environment": "banner9", "objects": [
+        make_procedure("TZPRONE", [{"type": "TABLE", "name": "tztbone", "custom": (True,)},
+                               {"type": "TABLE", "name": "TZTBTWO", "custom": True},
+                               {"type": "TABLE", "name": "SPRIDEN", "custom": False}]),
+    ]}]})
+
+    assert object_data_index.get_dependency_names(DatabaseEnvironment.BANNER9, "tables") == {
+        "TZTBONE", "TZTBTWO", "SPRIDEN"}
+    assert object_data_index.get_dependency_names(DatabaseEnvironment.BANNER9, "tables", is_custom=True) == {
+        "TZTBTWO"}
+    assert object_data_index.get_dependency_names(DatabaseEnvironment.BANNER9, "tables", is_custom=False) == {
+        "SPRIDEN"}
+    assert object_data_index.get_dependents(DatabaseEnvironment.BANNER9, "tztbone") == ["TZPRONE"]
+
+
+def test_index_is_rebuilt_when_the_file_changes(tmp_path, write_object_data_file):
+    file_path = tmp_path / "object_data.json"
+    write_object_data_file(file_path, [{"name": "TZTBONE", "type": "TABLE", "custom": True}])
+    first_index = get_object_data_index(str(file_path))
+    assert get_object_data_index(str(file_path)) is first_index
+
+    write_object_data_file(file_path, [{"name": "TZTBONE", "type": "TABLE", "custom": True},
+                                   {"name": "TZTBTWO", "type": "TABLE", "custom": True}])
+    file_stat = os.stat(file_path)
+    os.utime(file_path, ns=(file_stat.st_atime_ns, file_stat.st_mtime_ns + 1_000_000))
+
+    second_index = get_object_data_index(str(file_path))
+    assert second_index is not first_index
+    assert second_index.get_object_names(DatabaseEnvironment.BANNER9, "TABLE", True) == {"TZTBONE", "TZTBTWO"}
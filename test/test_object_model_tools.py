@@ -0,0 +1,51 @@
+import json
+
+from db.database_properties import DatabaseEnvironment
+from files.object_data_file import _convert_dependencies_file_to_json_object
+from files.object_data_store import ObjectDataStore
+from tools.file_tools import write_json_file
+from tools.object_model_tools import ColumnMeta, MigrationObject, TableMeta, encode_model
+
+
+def _dependency_row(object_name: str, dependency_type: str, dependency_name: str, dependency_package: str = None):
+    return {"STATUS": "INSTALL", "OBJECT_OWNER": "UVM", "OBJECT_TYPE": "PROCEDURE", "OBJECT_PACKAGE": None,
+            "OBJECT_NAME": object_name, "DEPENDENCY_TYPE": dependency_type, "DEPENDENCY_NAME": dependency_name,
+            "DEPENDENCY_PACKAGE": dependency_package}
+
+
+def test_converted_objects_are_written_in_the_object_data_layout(tmp_path):
+    object_data = _convert_dependencies_file_to_json_object(dependencies_data=[
+        _dependency_row("TZPRONE", "TABLE", "TZTBONE"),
+        _dependency_row("TZPRONE", "TABLE", "SPRIDEN"),
+        _dependency_row("TZPRONE", "FUNCTION", "F_GET", "TZPKUTIL"),
+        _dependency_row("TZPRTWO", "SEQUENCE", "TZSEONE"),
+    ])
+    assert all(isinstance(obj, MigrationObject) for obj in object_data["root"][0]["objects"])
+
+    file_path = tmp_path / "object_data.json"
+    write_json_file(json_data=object_data, output_filename=str(file_path), default=encode_model)
+
+    expected = {"root": [{"environment": "banner9", "objects": [
+        obj.to_dict() for obj in object_data["root"][0]["objects"]]}]}
+    assert file_path.read_text(encoding='utf-8') == json.dumps(expected, indent=4)
+    written_object = json.loads(file_path.read_text(encoding='utf-8'))["root"][0]["objects"][0]
+    assert list(written_object) == ["object_status", "origin", "type", "owner", "package", "name", "dependencies"]
+    assert [table["custom"] for table in written_object["dependencies"]["tables"]] == [True, False]
+
+
+def test_store_keeps_model_objects_until_commit(tmp_path):
+    file_path = tmp_path / "object_data.json"
+    table = TableMeta(object_status="INSTALL", origin="DEPENDENCY", name="TZTBONE", owner="UVM", custom=True,
+                      columns=[ColumnMeta(name="TZTBONE_ID", type="NUMBER", length=22, nullable=False)])
+    other_table = TableMeta(object_status="SKIP", origin="DEPENDENCY", name="SPRIDEN", owner="SATURN", custom=False)
+
+    with ObjectDataStore(str(file_path)) as object_data_store:
+        object_data_store.add(environment=DatabaseEnvironment.BANNER9, new_json_data=[table, other_table])
+        assert object_data_store.get(DatabaseEnvironment.BANNER9, "TZTBONE") is table
+        object_data_store.upsert(environment=DatabaseEnvironment.BANNER9, new_json_data={
+            "name": "TZTBONE", "grants": ["GRANT SELECT ON UVM.TZTBONE TO SATURN;"]})
+
+    written_objects = json.loads(file_path.read_text(encoding='utf-8'))["root"][0]["objects"]
+    assert [obj["name"] for obj in written_objects] == ["TZTBONE", "SPRIDEN"]
+    assert written_objects[0] == dict(table.to_dict(), grants=["GRANT SELECT ON UVM.TZTBONE TO SATURN;"])
+    assert written_objects[1] == other_table.to_dict()
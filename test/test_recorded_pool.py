@@ -0,0 +1,173 @@
+import datetime
+import decimal
+from contextlib import contextmanager
+
+import pytest
+
+from db import recorded_pool
+from db.database_properties import DatabaseEnvironment
+from db.datasource.sequence_datasource import fetch_attributes_for_sequences
+from db.oracle_database_tools import PoolMetrics, _MeteredCursor
+from db.recorded_pool import RecordedCatalog, RecordingConnectionPool, ReplayConnectionPool, get_connection_pool
+
+SEQUENCES = {
+    "TZSEONE": ("UVM", "TZSEONE", 1, decimal.Decimal("9999999999999999999999999999"), 1, "N", "N", 20, 41),
+    "TZSETWO": ("UVM", "TZSETWO", 1, 999999, 5, "Y", "N", 0, 1),
+}
+SEQUENCE_NAMES = ["TZSEONE", "TZSETWO", "TZSEMISSING"]
+
+
+class _FakeCursor:
+    """Answers the ALL_SEQUENCES query from SEQUENCES, with the fetch calls of a driver cursor."""
+
+    def __init__(self):
+        self.arraysize = 100
+        self.prefetchrows = 100
+        self.description = None
+        self._statement = None
+        self._rows = []
+
+    def prepare(self, statement: str):
+        self._statement = statement
+
+    def execute(self, statement: str | None, binds: dict):
+        self.description = [(column,) for column in ("SEQUENCE_OWNER", "SEQUENCE_NAME", "MIN_VALUE", "MAX_VALUE",
+                                                     "INCREMENT_BY", "CYCLE_FLAG", "ORDER_FLAG", "CACHE_SIZE",
+                                                     "LAST_NUMBER")]
+        self._rows = [SEQUENCES[value] for value in binds.values() if value in SEQUENCES]
+
+    def fetchmany(self, num_rows: int | None = None):
+        rows, self._rows = self._rows[:num_rows or self.arraysize], self._rows[num_rows or self.arraysize:]
+        return rows
+
+    def fetchall(self):
+        rows, self._rows = self._rows, []
+        return rows
+
+    def __iter__(self):
+        rows, self._rows = self._rows, []
+        return iter(rows)
+
+    def close(self):
+        pass
+
+
+class _FakeConnection:
+    def __init__(self, metrics: PoolMetrics):
+        self._metrics = metrics
+
+    def cursor(self):
+        return _MeteredCursor(cursor=_FakeCursor(), metrics=self._metrics)
+
+
+class _FakePool:
+    """Stands in for OracleDBConnectionPool: one database, metered cursors, no sessions."""
+
+    def __init__(self):
+        self.database_name = DatabaseEnvironment.BANNER9
+        self.metrics = PoolMetrics()
+        self.closed = False
+
+    @contextmanager
+    def get_connection(self):
+        yield _FakeConnection(metrics=self.metrics)
+
+    def close_pool(self):
+        self.closed = True
+
+
+def _record_sequences(file_path: str) -> list[dict]:
+    fake_pool = _FakePool()
+    recording_pool = RecordingConnectionPool(db_pool=fake_pool, file_path=file_path)
+    sequences = fetch_attributes_for_sequences(db_pool=recording_pool, sequence_names=SEQUENCE_NAMES)
+    recording_pool.close_pool()
+    assert fake_pool.closed
+    return sequences
+
+
+def test_recorded_datasource_is_replayed(tmp_path):
+    file_path = str(tmp_path / "banner9_recorded_catalog.json")
+    recorded_sequences = _record_sequences(file_path)
+
+    replay_pool = ReplayConnectionPool(database_name=DatabaseEnvironment.BANNER9, file_path=file_path)
+    replayed_sequences = fetch_attributes_for_sequences(db_pool=replay_pool, sequence_names=SEQUENCE_NAMES)
+
+    assert [sequence["sequence_name"] for sequence in recorded_sequences] == ["TZSEONE", "TZSETWO"]
+    assert replayed_sequences == recorded_sequences
+    assert isinstance(replayed_sequences[0]["max_value"], decimal.Decimal)
+    metrics = replay_pool.get_metrics()
+    assert metrics["acquires"] == 1
+    assert metrics["executions"] == 1
+    assert metrics["fetches"] == 2  # a fetchmany with rows and the empty one that ends the chunk
+
+
+def test_iterated_rows_are_counted_per_round_trip(tmp_path):
+    metrics = PoolMetrics()
+    metered_cursor = _MeteredCursor(cursor=_FakeCursor(), metrics=metrics)
+    metered_cursor.arraysize = 1
+    metered_cursor.execute(None, {"name_0": "TZSEONE", "name_1": "TZSETWO"})
+
+    assert [row[1] for row in metered_cursor] == ["TZSEONE", "TZSETWO"]
+    assert metrics.fetches == 3  # one per row and the empty round trip that ends the iteration
+
+    file_path = str(tmp_path / "catalog.json")
+    catalog = RecordedCatalog(file_path=file_path)
+    catalog.record(statement="SELECT A FROM T", binds=None, description=[("A",)], rows=[(1,), (2,), (3,)])
+    catalog.save()
+    replay_pool = ReplayConnectionPool(database_name=DatabaseEnvironment.BANNER9, file_path=file_path)
+    with replay_pool.get_connection() as connection:
+        cursor = connection.cursor()
+        cursor.arraysize = 2
+        cursor.execute("SELECT A FROM T")
+        assert [row[0] for row in cursor] == [1, 2, 3]
+    assert replay_pool.get_metrics()["fetches"] == 2  # a full round trip and the short one that ends it
+
+
+def test_unrecorded_query_is_rejected(tmp_path):
+    file_path = str(tmp_path / "banner9_recorded_catalog.json")
+    _record_sequences(file_path)
+
+    replay_pool = ReplayConnectionPool(database_name=DatabaseEnvironment.BANNER9, file_path=file_path)
+    with pytest.raises(ValueError, match="No recorded result"):
+        fetch_attributes_for_sequences(db_pool=replay_pool, sequence_names=["TZSEOTHER"])
+
+
+def test_catalog_restores_tagged_values(tmp_path):
+    file_path = str(tmp_path / "catalog.json")
+    row = (datetime.datetime(2024, 5, 1, 10, 30), datetime.date(2024, 5, 2), decimal.Decimal("0.1"), b"\x00\xff",
+           None)
+    catalog = RecordedCatalog(file_path=file_path)
+    catalog.record(statement="SELECT A, B, C, D, E FROM T WHERE X = :x", binds={"x": decimal.Decimal("2")},
+                   description=[("A",), ("B",), ("C",), ("D",), ("E",)], rows=[row])
+    catalog.save()
+
+    columns, rows = RecordedCatalog(file_path=file_path).lookup(
+        statement="SELECT A, B, C, D, E\n  FROM T WHERE X = :x", binds={"x": decimal.Decimal("2")})
+
+    assert columns == ["A", "B", "C", "D", "E"]
+    assert rows == [row]
+
+
+def test_unsupported_value_is_rejected_before_recording(tmp_path):
+    catalog = RecordedCatalog(file_path=str(tmp_path / "catalog.json"))
+    with pytest.raises(TypeError, match="object"):
+        catalog.record(statement="SELECT A FROM T", binds=None, description=[("A",)], rows=[(object(),)])
+    assert len(catalog) == 0
+
+
+def test_connection_pool_mode_comes_from_the_environment(tmp_path, monkeypatch):
+    file_path = str(tmp_path / "banner9_recorded_catalog.json")
+    _record_sequences(file_path)
+    monkeypatch.setattr(recorded_pool, "_pools", {})
+    monkeypatch.setattr(recorded_pool, "get_recorded_catalog_file_path", lambda database_name: file_path)
+    monkeypatch.setenv(recorded_pool.POOL_MODE_VARIABLE, "replay")
+
+    db_pool = get_connection_pool(database_name=DatabaseEnvironment.BANNER9)
+
+    assert isinstance(db_pool, ReplayConnectionPool)
+    assert get_connection_pool(database_name=DatabaseEnvironment.BANNER9) is db_pool
+    assert fetch_attributes_for_sequences(db_pool=db_pool, sequence_names=SEQUENCE_NAMES)
+
+    monkeypatch.setenv(recorded_pool.POOL_MODE_VARIABLE, "unknown")
+    with pytest.raises(ValueError, match="Unknown connection pool mode"):
+        get_connection_pool(database_name=DatabaseEnvironment.BANNER9)
@@ -1,6 +1,6 @@
 from enum import Enum
 
-from db.datasource.owners_datasource import get_all_owners_of_packages
+from db.catalog_snapshot import get_catalog_snapshot
 from db.oracle_database_tools import OracleDBConnectionPool
 
 
@@ -37,8 +37,7 @@ def split_table_name_into_package_and_table_name(obj_name: dict) -> dict:
 
 
 def get_all_current_owners(db_pool: OracleDBConnectionPool) -> list:
-    all_owners_fetchall = get_all_owners_of_packages(db_pool=db_pool)
-    return [row[0] for row in all_owners_fetchall]
+    return get_catalog_snapshot(db_pool=db_pool).get_owners()
 
 
 class MultiCounter:
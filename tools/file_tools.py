@@ -4,16 +4,17 @@ import logging
 import os
 
 
-def write_json_file(json_data: dict, output_filename: str) -> None:
+def write_json_file(json_data: dict, output_filename: str, default=None) -> None:
     """
     Write a JSON object to a file.
 
     Args:
         json_data (dict): The JSON-compatible dictionary to write.
         output_filename (str): The path to the output file.
+        default: json.dump hook for the values that are not JSON types, e.g. model objects.
     """
     with open(output_filename, 'w', encoding='utf-8') as jsonfile:
-        json.dump(json_data, jsonfile, indent=4)
+        json.dump(json_data, jsonfile, indent=4, default=default)
 
     logging.info(f'Successfully wrote JSON data to {output_filename}')
 
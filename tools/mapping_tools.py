@@ -1,11 +1,14 @@
+import logging
 from enum import Enum
 from itertools import chain
 
 from db.database_properties import DatabaseEnvironment
-from db.datasource.mapping_datasource import query_mapping_table, query_mapping_table_by_object_type
+from db.datasource.mapping_datasource import query_mapping_table
 from db.oracle_database_tools import OracleDBConnectionPool
 from files.b7_object_data_file import get_object_data_mapped_by_names_by_environment
 
+_mapping_indexes = {}  # One index per database environment
+
 
 class MappingObjectTypes(Enum):
     TRIGGER = 'TRIGGER'
@@ -18,36 +21,48 @@ class MappingObjectTypes(Enum):
     TABLE = 'TABLE'
 
 
-def get_mapping_data_for_one_type_mapped_by_b7_object_name(mapping_object_type: MappingObjectTypes) -> dict:
-    mapped_data = {}
-    if mapping_object_type:
-        mapping_records = query_mapping_table_by_object_type(mapping_object_type.value)
-        for mapping_record in mapping_records:
+class MappingIndex:
+    """
+    In-memory copy of the mapping table GZTBTMPEO, indexed by B7 name and by B9 name in one pass.
+
+    Every index keeps the last record read for a name, like the dictionaries built record by record before.
+    """
+
+    def __init__(self, mapping_records: list[dict] | None = None):
+        self.mapping_records = mapping_records or []
+        self.by_b7_name = {}
+        self.by_b9_name = {}
+        for mapping_record in self.mapping_records:
             b7_name = mapping_record.get('GZTBTMPEO_B7_NOMBRE', '')
+            b9_name = mapping_record.get('GZTBTMPEO_B9_NOMBRE', '')
             if b7_name:
-                mapped_data[b7_name] = mapping_record
-        return mapped_data
-    return {}
+                self.by_b7_name[b7_name] = mapping_record
+            if b9_name:
+                self.by_b9_name[b9_name] = mapping_record
+
+    @classmethod
+    def from_database(cls, db_pool: OracleDBConnectionPool) -> "MappingIndex":
+        logging.info(f"Starting: load mapping table of {db_pool.database_name.value}")
+        mapping_index = cls(mapping_records=query_mapping_table(db_pool=db_pool))
+        logging.info(f"Ending: load mapping table, {len(mapping_index.mapping_records)} records")
+        return mapping_index
+
+
+def get_mapping_index(db_pool: OracleDBConnectionPool) -> MappingIndex:
+    """Returns the mapping index of the pool's database, loading GZTBTMPEO only once per process."""
+    mapping_index = _mapping_indexes.get(db_pool.database_name)
+    if mapping_index is None:
+        mapping_index = MappingIndex.from_database(db_pool=db_pool)
+        _mapping_indexes[db_pool.database_name] = mapping_index
+    return mapping_index
 
 
 def _get_mapping_data_mapped_by_b7_object_name(db_pool: OracleDBConnectionPool) -> dict:
-    mapped_data = {}
-    mapping_records = query_mapping_table(db_pool=db_pool)
-    for mapping_record in mapping_records:
-        b7_name = mapping_record.get('GZTBTMPEO_B7_NOMBRE', '')
-        if b7_name:
-            mapped_data[b7_name] = mapping_record
-    return mapped_data
+    return get_mapping_index(db_pool=db_pool).by_b7_name
 
 
 def _get_mapping_data_mapped_by_b9_object_name(db_pool: OracleDBConnectionPool) -> dict:
-    mapped_data = {}
-    mapping_records = query_mapping_table(db_pool=db_pool)
-    for mapping_record in mapping_records:
-        b9_name = mapping_record.get('GZTBTMPEO_B9_NOMBRE', '')
-        if b9_name:
-            mapped_data[b9_name] = mapping_record
-    return mapped_data
+    return get_mapping_index(db_pool=db_pool).by_b9_name
 
 
 def _extract_banner7_mapping_data(db_pool: OracleDBConnectionPool):
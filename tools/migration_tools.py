@@ -192,19 +192,21 @@ def migrate_sequence_to_b9(b9_table_name: str,
     return new_sequences
 
 
-def migrate_b9_table_to_b9(json_data: dict, b9_table_name: str,
-                           b9_owner: str = "UVM") -> dict:
-    # Find the original table
-    original_table = None
+def find_original_b9_table(json_data: dict, b9_table_name: str) -> dict | None:
     for env in json_data.get("root", []):
         if env.get("environment") != DatabaseEnvironment.BANNER9.value:
             continue
         for obj in env.get("objects", []):
             if obj.get("name") == b9_table_name:
-                original_table = obj
-                break
-        if original_table:
-            break
+                return obj
+    return None
+
+
+def migrate_b9_table_to_b9(json_data: dict, b9_table_name: str,
+                           b9_owner: str = "UVM", original_table: dict | None = None) -> dict:
+    # Find the original table, unless the caller already looked it up
+    if original_table is None:
+        original_table = find_original_b9_table(json_data=json_data, b9_table_name=b9_table_name)
 
     if not original_table:
         raise ValueError(f"Original table '{b9_table_name}' not found in the JSON data.")
@@ -0,0 +1,150 @@
+import sys
+from dataclasses import dataclass, field
+
+# Dependency lists of every migration object, in the order they are written
+DEPENDENCY_KINDS = ("tables", "functions", "sequences", "procedures")
+
+
+def _intern(value):
+    """Names, types and statuses repeat across thousands of entries, one shared string is kept per value."""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+@dataclass(slots=True)
+class DependencyRef:
+    """One entry of the dependencies of a migration object."""
+    type: str
+    name: str
+    package: str | None = None
+    custom: bool | None = None
+    local: bool | None = None
+    deployment: str | None = None
+    object_status: str | None = None
+
+    def __post_init__(self):
+        self.type = _intern(self.type)
+        self.name = _intern(self.name)
+        self.package = _intern(self.package)
+        self.deployment = _intern(self.deployment)
+        self.object_status = _intern(self.object_status)
+
+    def to_dict(self) -> dict:
+        return {"type": self.type, "package": self.package, "name": self.name, "custom": self.custom,
+                "local": self.local, "deployment": self.deployment, "object_status": self.object_status}
+
+
+@dataclass(slots=True)
+class MigrationObject:
+    """A procedure, function or package of the object data, with its dependencies by kind."""
+    object_status: str | None
+    origin: str | None
+    type: str
+    owner: str | None
+    package: str | None
+    name: str
+    dependencies: dict[str, list[DependencyRef]] = field(
+        default_factory=lambda: {kind: [] for kind in DEPENDENCY_KINDS})
+    extra: dict = field(default_factory=dict)  # Any other key, e.g. grants or synonyms added by the migration
+
+    def __post_init__(self):
+        self.object_status = _intern(self.object_status)
+        self.origin = _intern(self.origin)
+        self.type = _intern(self.type)
+        self.owner = _intern(self.owner)
+        self.package = _intern(self.package)
+        self.name = _intern(self.name)
+
+    def add_dependency(self, kind: str, dependency: DependencyRef):
+        self.dependencies.setdefault(kind, []).append(dependency)
+
+    def to_dict(self) -> dict:
+        data = {
+            "object_status": self.object_status,
+            "origin": self.origin,
+            "type": self.type,
+            "owner": self.owner,
+            "package": self.package,
+            "name": self.name,
+            "dependencies": {kind: [dependency.to_dict() for dependency in dependencies]
+                             for kind, dependencies in self.dependencies.items()}
+        }
+        data.update(self.extra)
+        return data
+
+
+@dataclass(slots=True)
+class ColumnMeta:
+    """One column of a table, as read from ALL_TAB_COLUMNS."""
+    name: str
+    type: str
+    length: int | None = None
+    precision: int | None = None
+    scale: int | None = None
+    nullable: bool = True
+
+    def __post_init__(self):
+        self.name = _intern(self.name)
+        self.type = _intern(self.type)
+
+    def to_dict(self) -> dict:
+        return {"name": self.name, "type": self.type, "length": self.length, "precision": self.precision,
+                "scale": self.scale, "nullable": self.nullable}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ColumnMeta":
+        return cls(name=data.get("name"), type=data.get("type"), length=data.get("length"),
+                   precision=data.get("precision"), scale=data.get("scale"), nullable=data.get("nullable", True))
+
+
+@dataclass(slots=True)
+class TableMeta:
+    """A table of the object data with its columns, storage attributes, comments, indexes and triggers."""
+    object_status: str | None
+    origin: str | None
+    name: str
+    owner: str
+    custom: bool
+    columns: list[ColumnMeta] = field(default_factory=list)
+    attributes: dict = field(default_factory=dict)
+    comments: list[dict] = field(default_factory=list)
+    indexes: list[dict] = field(default_factory=list)
+    sequences: list = field(default_factory=list)
+    triggers: list = field(default_factory=list)
+    type: str = "TABLE"
+    extra: dict = field(default_factory=dict)  # Any other key, e.g. grants or synonyms added by the migration
+
+    def __post_init__(self):
+        self.object_status = _intern(self.object_status)
+        self.origin = _intern(self.origin)
+        self.name = _intern(self.name)
+        self.owner = _intern(self.owner)
+
+    def to_dict(self) -> dict:
+        data = {
+            "object_status": self.object_status,
+            "origin": self.origin,
+            "name": self.name,
+            "type": self.type,
+            "owner": self.owner,
+            "custom": self.custom,
+            "columns": [column.to_dict() for column in self.columns],
+            "attributes": self.attributes,
+            "comments": self.comments,
+            "indexes": self.indexes,
+            "sequences": self.sequences,
+            "triggers": self.triggers
+        }
+        data.update(self.extra)
+        return data
+
+
+def encode_model(value):
+    """
+    default= hook of json.dump: model objects are turned into the object data layout only when they are written.
+
+    Raises:
+        TypeError: If the value is not a model object.
+    """
+    if isinstance(value, (DependencyRef, MigrationObject, ColumnMeta, TableMeta)):
+        return value.to_dict()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
@@ -1,8 +1,9 @@
 import sqlparse
 
 from db.database_properties import DatabaseEnvironment
-from db.datasource.packages_datasource import get_package_records, get_package_record
+from db.datasource.packages_datasource import get_package_record
 from db.oracle_database_tools import OracleDBConnectionPool
+from db.source_mirror import get_package_records as get_mirrored_package_records
 from tools.sql_script_tools import format_sql_by_steps
 
 
@@ -194,9 +195,13 @@ def extract_and_format_objects(lines: list[dict]) -> list[dict]:
 
 
 def get_packages_as_list(package_owner: str, package_names: list[str],
-                         db_pool: OracleDBConnectionPool) -> dict:
-    package_records = get_package_records(package_owner=package_owner, package_names=package_names,
-                                          db_pool=db_pool)
+                         db_pool: OracleDBConnectionPool, max_workers: int | None = None) -> dict:
+    """
+    Fetches the specification and body of the packages from the source mirror, downloading the changed
+    ones up to max_workers queries at a time, grouped by package name.
+    """
+    package_records = get_mirrored_package_records(package_owner=package_owner, package_names=package_names,
+                                                   db_pool=db_pool, max_workers=max_workers)
     package_dictionary = _convert_package_records_to_dictionary(package_rows=package_records)
     grouped_package = _group_package_dictionary_by_name_and_type(package_dictionary=package_dictionary)
     return grouped_package
@@ -8,11 +8,22 @@ VALID_PROCEDURE_PREFIXES = ["P_", "PR_", "TZPR"]
 
 VALID_FUNCTION_PREFIXES = ["F_", "FN_", "TZFN"]
 
+# Bump when the scanner or the source code cleaning changes, it invalidates the scan cache
+SCANNER_VERSION = 1
 
-def extract_select_tables(source_code: str) -> set[str]:
-    # Matches table names in SELECT statements
-    select_pattern = re.compile(r"select.*?from\s+([a-zA-Z0-9_]+)", re.IGNORECASE)
-    return [match.group(1) for match in select_pattern.finditer(source_code)]
+
+def extract_select_tables(source_code: str) -> list[str]:
+    # Table names following the first FROM of each SELECT, found in linear time
+    words, texts, _, _ = tokenize_source_code(source_code)
+    tables = []
+    select_pending = False
+    for index, word in enumerate(words):
+        if word == "SELECT":
+            select_pending = True
+        elif word == "FROM" and select_pending and index + 1 < len(words) and _is_word_token(texts[index + 1]):
+            tables.append(texts[index + 1])
+            select_pending = False
+    return tables
 
 
 def extract_insert_tables(source_code: str) -> list[str]:
@@ -51,7 +62,19 @@ def extract_procedures(source_code: str) -> list[str]:
        """
 
     potential_matches = match_general_pattern(source_code=source_code)
+    return filter_procedure_matches(potential_matches=potential_matches)
+
+
+def filter_procedure_matches(potential_matches: list[tuple]) -> set[str]:
+    """
+       Apply the procedure exclusion rules to (starting_word, package, object) matches.
+
+       Args:
+           potential_matches (list[tuple]): Matches as returned by match_general_pattern.
 
+       Returns:
+           set: A set of valid procedure names.
+       """
     valid_procedures = set()
 
     for match in potential_matches:
@@ -172,7 +195,19 @@ def extract_functions(source_code: str) -> set[str]:
                list: A list of valid procedure names.
            """
     potential_matches = match_general_pattern(source_code)
+    return filter_function_matches(potential_matches=potential_matches)
+
 
+def filter_function_matches(potential_matches: list[tuple]) -> set[str]:
+    """
+           Apply the function exclusion rules to (starting_word, package, object) matches.
+
+           Args:
+               potential_matches (list[tuple]): Matches as returned by match_general_pattern.
+
+           Returns:
+               set: A set of valid function names.
+           """
     valid_functions = set()
 
     for match in potential_matches:
@@ -222,17 +257,13 @@ def extract_functions(source_code: str) -> set[str]:
 
 
 def match_general_pattern(source_code: str):
-    pattern = r"""
-               \b(\w+\s+)?               # WORD (first word, can be rejected later)
-               ([\w$]+)                  # PACKAGE AZaz09_$
-               \.                        # dot
-               (\w+)\b                   # OBJECT AZaz09_
-               \s*\(                     # Opening parenthesis
-               [^;]*?\)                  # Parameters (anything up to the closing parenthesis)
-               \s*;                      # Semicolon
-           """
-    potential_matches = re.findall(pattern, source_code, re.IGNORECASE | re.VERBOSE)
-    return potential_matches
+    """
+    Finds PACKAGE.OBJECT( ... ); calls, optionally preceded by a word, in linear time.
+
+    Returns:
+        list[tuple]: (starting_word, package, object) tuples.
+    """
+    return scan_dependency_candidates(source_code)["general_matches"]
 
 
 def extract_independent_packages(source_code: str) -> List[dict]:
@@ -260,6 +291,159 @@ def extract_independent_packages(source_code: str) -> List[dict]:
     return matched_elements
 
 
+# Leading whitespace is captured so the scanner knows which tokens were separated by spaces,
+# words keep the same characters the extractors above accept (letters, digits, _, $ and #)
+_TOKEN_PATTERN = re.compile(r"(\s*)([\w$#]+|:=|\S)")
+
+
+def tokenize_source_code(source_code: str) -> tuple[list[str], list[str], list[int], list[bool]]:
+    """
+    Splits cleaned PL/SQL source code into tokens in a single regex pass.
+
+    Args:
+        source_code (str): Source code without comments.
+
+    Returns:
+        tuple: Four parallel lists with the upper-cased token, the original token text,
+               the start offset of the token and whether whitespace preceded it.
+    """
+    words = []
+    texts = []
+    starts = []
+    spaced = []
+    for match in _TOKEN_PATTERN.finditer(source_code):
+        text = match.group(2)
+        words.append(text.upper())
+        texts.append(text)
+        starts.append(match.start(2))
+        spaced.append(match.end(1) > match.start(1))
+    return words, texts, starts, spaced
+
+
+def _is_word_token(token: str) -> bool:
+    first_character = token[0]
+    return first_character.isalnum() or first_character in "_$#"
+
+
+def _find_next_semicolons(words: list[str]) -> list[int]:
+    """
+    For every token index, the index of the first ';' at or after it (len(words) when there is none).
+    Computed backwards in one pass so the scanner never searches forward for a statement end.
+    """
+    token_count = len(words)
+    next_semicolon = [token_count] * (token_count + 1)
+    for index in range(token_count - 1, -1, -1):
+        next_semicolon[index] = index if words[index] == ";" else next_semicolon[index + 1]
+    return next_semicolon
+
+
+def scan_dependency_candidates(source_code: str) -> dict:
+    """
+    Tokenizes the source code once and collects every dependency category in a single pass.
+
+    The rules mirror the individual extractors (extract_select_tables, extract_insert_tables,
+    extract_update_tables, extract_delete_tables, extract_type_declarations, match_general_pattern,
+    extract_local_functions, extract_sequences and extract_independent_packages), but keywords are
+    matched as whole words instead of substrings.
+
+    Args:
+        source_code (str): Source code without comments, as returned by clean_comments_and_whitespace.
+
+    Returns:
+        dict: A dictionary containing:
+            - 'tables': Table names found in SELECT/INSERT/UPDATE/DELETE statements and %TYPE declarations.
+            - 'general_matches': (starting_word, package, object) tuples, same shape as match_general_pattern.
+            - 'local_functions': Names of functions declared inside the source code.
+            - 'sequences': Sequence names used with NEXTVAL.
+            - 'package_candidates': {"package", "object_name"} dictionaries for variable declarations.
+    """
+    words, texts, starts, spaced = tokenize_source_code(source_code)
+    token_count = len(words)
+
+    tables = []
+    general_matches = []
+    local_functions = set()
+    sequences = []
+    package_candidates = []
+
+    is_word = [_is_word_token(token) for token in texts]
+    next_semicolon = _find_next_semicolons(words)
+    select_pending = False
+    general_resume_index = 0
+    package_resume_index = 0
+
+    for index in range(token_count):
+        word = words[index]
+
+        if is_word[index]:
+            # SELECT ... FROM <table>
+            if word == "SELECT":
+                select_pending = True
+            elif word == "FROM" and select_pending:
+                if index + 1 < token_count and is_word[index + 1]:
+                    tables.append(texts[index + 1])
+                    select_pending = False
+
+            # INSERT INTO <table>, UPDATE <table>, DELETE FROM <table>
+            if word == "INSERT":
+                if index + 2 < token_count and words[index + 1] == "INTO" and is_word[index + 2]:
+                    tables.append(texts[index + 2])
+            elif word == "UPDATE":
+                if index + 1 < token_count and is_word[index + 1]:
+                    tables.append(texts[index + 1])
+            elif word == "DELETE":
+                if index + 2 < token_count and words[index + 1] == "FROM" and is_word[index + 2]:
+                    tables.append(texts[index + 2])
+
+            # FUNCTION <name> ( that is not the first statement of the source
+            elif word == "FUNCTION":
+                if (index + 2 < token_count and is_word[index + 1] and spaced[index + 1]
+                        and words[index + 2] == "("
+                        and source_code[max(0, starts[index] - 20):starts[index]].strip()):
+                    local_functions.add(texts[index + 1])
+
+            # <sequence>.NEXTVAL
+            elif word == "NEXTVAL":
+                if (index >= 2 and words[index - 1] == "." and is_word[index - 2]
+                        and not spaced[index - 1] and not spaced[index]):
+                    sequences.append(texts[index - 2])
+
+            # <table>.<column>%TYPE
+            elif word == "TYPE":
+                if (index >= 4 and words[index - 1] == "%" and is_word[index - 2] and words[index - 3] == "."
+                        and is_word[index - 4] and not spaced[index] and not spaced[index - 1]
+                        and not spaced[index - 2] and not spaced[index - 3]):
+                    tables.append(texts[index - 4])
+
+            # <package>.<object>( ... );
+            if (index >= general_resume_index and index + 3 < token_count
+                    and words[index + 1] == "." and is_word[index + 2] and words[index + 3] == "("
+                    and not spaced[index + 1] and not spaced[index + 2]):
+                semicolon_index = next_semicolon[index + 4]
+                if semicolon_index < token_count and words[semicolon_index - 1] == ")":
+                    # Keep the trailing separator match_general_pattern captures with the starting word
+                    starting_word = (texts[index - 1] + " "
+                                     if index > 0 and is_word[index - 1] and spaced[index] else "")
+                    general_matches.append((starting_word, texts[index], texts[index + 2]))
+                    general_resume_index = semicolon_index + 1
+
+            # <variable> <package>.<object>;
+            if (index >= 1 and index - 1 >= package_resume_index and is_word[index - 1] and spaced[index]
+                    and index + 3 < token_count and words[index + 1] == "." and is_word[index + 2]
+                    and words[index + 3] == ";"
+                    and not spaced[index + 1] and not spaced[index + 2] and not spaced[index + 3]):
+                package_candidates.append({"package": texts[index], "object_name": texts[index + 2]})
+                package_resume_index = index + 4
+
+    return {
+        "tables": tables,
+        "general_matches": general_matches,
+        "local_functions": local_functions,
+        "sequences": sequences,
+        "package_candidates": package_candidates
+    }
+
+
 if __name__ == "__main__":
     source_code = """
         CREATE OR REPLACE PROCEDURE some_proc IS BEGIN NULL; END;